@@ -8,12 +8,9 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtGui import QPixmap, QFont, QCursor
 from PyQt5.QtCore import Qt
+import warmup
 
-# 🩺 individual prediction pages
-from diabetes_pred       import DiabetesPredictionPage
-from liver_pred          import LiverDiseasePredictionPage
-from heart_disease_pred  import HeartDiseasePredictionPage     # ← NEW
-from bmi_pred            import BMIPredictionPage              # ← NEW
+# 🩺 individual prediction pages are imported when opened (sklearn/joblib)
 
 
 class AIPredictionWindow(QWidget):
@@ -118,18 +115,34 @@ class AIPredictionWindow(QWidget):
     # Slots for tile clicks
     # ───────────────────────────────────────────────────────────
     def open_diabetes_prediction(self, event):
+        warmup.get_scheduler().when_ready("diabetes", self._show_diabetes)
+
+    def _show_diabetes(self):
+        from diabetes_pred import DiabetesPredictionPage
         self.diabetes_window = DiabetesPredictionPage(username=self.username)
         self.diabetes_window.show()
 
     def open_liver_prediction(self, event):
+        warmup.get_scheduler().when_ready("liver", self._show_liver)
+
+    def _show_liver(self):
+        from liver_pred import LiverDiseasePredictionPage
         self.liver_window = LiverDiseasePredictionPage(username=self.username)
         self.liver_window.show()
 
     def open_heart_prediction(self, event):                    # ← NEW
+        warmup.get_scheduler().when_ready("heart", self._show_heart)
+
+    def _show_heart(self):
+        from heart_disease_pred import HeartDiseasePredictionPage
         self.heart_window = HeartDiseasePredictionPage(username=self.username)
         self.heart_window.show()
 
     def open_bmi_prediction(self, event):                      # ← NEW
+        warmup.get_scheduler().when_ready("bmi", self._show_bmi)
+
+    def _show_bmi(self):
+        from bmi_pred import BMIPredictionPage
         self.bmi_window = BMIPredictionPage(username=self.username)
         self.bmi_window.show()
 
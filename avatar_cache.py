@@ -0,0 +1,91 @@
+# avatar_cache.py
+# ------------------------------------------------------------
+# Cached doctor avatars for the Emergency Directory.
+#
+# Lookup order for (name, size):
+#   1. QPixmapCache (in-memory LRU, BAYMAX_AVATAR_CACHE_KB, default 20 MB)
+#   2. a custom picture in AVATAR_DIR (directory listed once, no per-card
+#      os.path.exists probe)
+#   3. the on-disk PNG cache  <BAYMAX_AVATAR_DISK_CACHE>/<name hash>_<size>.png
+#      (set the variable to an empty string to disable it)
+#   4. render the coloured initials circle, then store it in 3 and 1
+
+import hashlib
+import os
+import random
+
+from PyQt5.QtGui import QPixmap, QPixmapCache, QPainter, QColor, QFont
+from PyQt5.QtCore import Qt
+
+BASE_DIR   = os.path.dirname(os.path.abspath(__file__))
+AVATAR_DIR = "avatars"
+
+
+def render_initials(name, size=96, digest=None) -> QPixmap:
+    initials = "".join([p[0] for p in name.split()[:2]]).upper() or "?"
+    digest = digest or hashlib.sha256(name.encode()).hexdigest()
+    # private RNG: same colour per name as before, global `random` untouched
+    rng = random.Random(int(digest, 16))
+    r, g, b = [int(130 + rng.random() * 100) for _ in range(3)]
+
+    pix = QPixmap(size, size); pix.fill(Qt.transparent)
+    painter = QPainter(pix)
+    painter.setRenderHints(QPainter.Antialiasing)
+    painter.setBrush(QColor(r, g, b)); painter.setPen(Qt.NoPen)
+    painter.drawEllipse(0, 0, size, size)
+    painter.setPen(QColor("#ffffff"))
+    painter.setFont(QFont("Segoe UI", int(size / 3), QFont.Bold))
+    painter.drawText(pix.rect(), Qt.AlignCenter, initials)
+    painter.end()
+    return pix
+
+
+class AvatarCache:
+    def __init__(self, custom_dir=AVATAR_DIR, disk_dir=None, memory_kb=None):
+        self.custom_dir = custom_dir
+        if disk_dir is None:
+            disk_dir = os.environ.get("BAYMAX_AVATAR_DISK_CACHE",
+                                      os.path.join(BASE_DIR, ".cache", "avatars"))
+        self.disk_dir = disk_dir or None
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+        memory_kb = memory_kb or int(os.environ.get("BAYMAX_AVATAR_CACHE_KB", 20 * 1024))
+        QPixmapCache.setCacheLimit(max(QPixmapCache.cacheLimit(), memory_kb))
+
+        self.custom_files = (set(os.listdir(custom_dir))
+                             if custom_dir and os.path.isdir(custom_dir) else set())
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "custom": 0, "rendered": 0}
+
+    def get(self, name: str, size=80) -> QPixmap:
+        digest = hashlib.sha256(name.encode()).hexdigest()
+        key = f"baymax-avatar:{digest[:32]}:{size}"
+        pix = QPixmapCache.find(key)
+        if pix is not None and not pix.isNull():
+            self.stats["memory_hits"] += 1
+            return pix
+
+        pix = self._load(name, size, digest)
+        QPixmapCache.insert(key, pix)
+        return pix
+
+    def _load(self, name, size, digest):
+        custom = f"{name.replace(' ', '_').lower()}.png"
+        if custom in self.custom_files:
+            self.stats["custom"] += 1
+            return QPixmap(os.path.join(self.custom_dir, custom)).scaled(
+                size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+        disk_path = (os.path.join(self.disk_dir, f"{digest[:32]}_{size}.png")
+                     if self.disk_dir else None)
+        if disk_path and os.path.exists(disk_path):
+            pix = QPixmap(disk_path)
+            if not pix.isNull():
+                self.stats["disk_hits"] += 1
+                return pix
+
+        pix = render_initials(name, size, digest)      # drawn at the final size, no rescale
+        self.stats["rendered"] += 1
+        if disk_path:
+            pix.save(disk_path, "PNG")
+        return pix
@@ -3,15 +3,15 @@
 # Baymax BMI‑category prediction page
 # Requires: PyQt5, pandas, numpy, joblib
 
-import sys, os, joblib
-import numpy as np
-import pandas as pd
+import sys, os
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QVBoxLayout, QHBoxLayout,
     QPushButton, QRadioButton, QButtonGroup, QFormLayout, QMessageBox
 )
 from PyQt5.QtGui import QFont, QPixmap
 from PyQt5.QtCore import Qt
+import task_runner
+import scoring
 
 
 class BMIPredictionPage(QWidget):
@@ -102,40 +102,55 @@ class BMIPredictionPage(QWidget):
     # ───────────────────────────────────────────────────────────
     def _load_model(self):
         try:
-            bundle = joblib.load(os.path.join(os.path.dirname(__file__), "bmi_model_prediction.joblib"))
-            self.model    = bundle["model"]
-            self.features = bundle["features"]      # ["Gender","Height","Weight"]
+            self.scorer = scoring.get_scorer("bmi")   # shared, loaded once
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load model:\n{e}")
-            self.model = None
+            self.scorer = None
 
     # ───────────────────────────────────────────────────────────
     # Predict
     # ───────────────────────────────────────────────────────────
     def _predict(self):
         try:
-            if self.model is None:
+            if self.scorer is None:
                 raise RuntimeError("Model not loaded.")
 
             gender  = self.gender_grp.checkedId()
             height  = float(self.height_edit.text())
             weight  = float(self.weight_edit.text())
 
-            X = pd.DataFrame([[gender, height, weight]], columns=self.features)
-
-            pred = int(self.model.predict(X)[0])
-            proba = self.model.predict_proba(X)[0, pred]
-
-            label = self.CLASS_LABELS[pred]
-            QMessageBox.information(
-                self, "BMI Prediction",
-                f"Predicted category: <b>{label}</b><br/>Probability: {proba:.2%}"
-            )
-
         except ValueError:
             QMessageBox.warning(self, "Input Error", "Please enter valid numerical values for height and weight.")
+            return
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Something went wrong:\n{e}")
+            return
+
+        # inference runs on the task pool, the result comes back in _show_result
+        task_runner.get_runner().submit(
+            self._run_prediction, self.scorer, {"Gender": gender, "Height": height, "Weight": weight},
+            on_result=self._show_result, on_error=self._show_error,
+            owner=self, name="bmi.predict")
+
+    @staticmethod
+    def _run_prediction(scorer, values):
+        result = scorer.score(values)
+        return result.code, result.confidence
+
+    def _show_result(self, result):
+        pred, proba = result
+        label = self.CLASS_LABELS[pred]
+        QMessageBox.information(
+            self, "BMI Prediction",
+            f"Predicted category: <b>{label}</b><br/>Probability: {proba:.2%}"
+        )
+
+    def _show_error(self, e):
+        QMessageBox.critical(self, "Error", f"Something went wrong:\n{e}")
+
+    def closeEvent(self, event):
+        task_runner.get_runner().cancel_owner(self)
+        super().closeEvent(event)
 
 
 # ─────────────────────────────────────────────────────────────
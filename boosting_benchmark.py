@@ -0,0 +1,126 @@
+"""
+Side-by-side benchmark of the boosting estimators for the liver and
+diabetes models.
+
+USAGE
+=====
+python boosting_benchmark.py                          # diabetes and liver
+python boosting_benchmark.py diabetes --rows 100000 --repeats 300
+python boosting_benchmark.py liver --threads 1 --out benchmark.json
+
+For every model the training CSV is loaded through training_harness.py
+(same features as the pages), split 80/20, and each estimator is fitted
+with its default settings – no grid search, so fit times are comparable:
+
+  gb     StandardScaler + GradientBoostingClassifier (the current models)
+  hgb    HistGradientBoostingClassifier
+  lgbm   LightGBM, when installed
+
+Reported per estimator: fit seconds, test accuracy, single-row
+predict_proba latency (median over --repeats calls, the page's access
+pattern) and batch throughput on --rows rows (the test split tiled, the
+score.py access pattern).  --threads caps BLAS/OpenMP threads so the
+compiled estimators don't win on core count alone.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from training_harness import RECIPES, VARIANTS, _limit_threads, load_training_data, variant_available
+
+MODELS = ("diabetes", "liver")
+
+
+def estimators(name):
+    """[(label, unfitted estimator)] – the model's current one first."""
+    out = [("gb", RECIPES[name]["estimator"]())]
+    for v in VARIANTS:
+        if variant_available(v):
+            out.append((v, VARIANTS[v]["estimator"]()))
+        else:
+            print(f"  ({v}: optional package not installed, skipped)")
+    return out
+
+
+def _take(X, idx):
+    return X.iloc[idx] if hasattr(X, "iloc") else X[idx]
+
+
+def bench_one(model, X_train, y_train, X_test, y_test, rows, repeats):
+    t0 = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_s = time.perf_counter() - t0
+
+    one = _take(X_test, [0])
+    model.predict_proba(one)                                  # warm-up
+    times = np.empty(repeats)
+    for i in range(repeats):
+        t0 = time.perf_counter()
+        model.predict_proba(one)
+        times[i] = time.perf_counter() - t0
+
+    big = _take(X_test, np.arange(rows) % len(y_test))
+    t0 = time.perf_counter()
+    model.predict_proba(big)
+    batch_s = time.perf_counter() - t0
+
+    return {"fit_seconds": fit_s,
+            "test_accuracy": float(model.score(X_test, y_test)),
+            "single_row_ms": float(np.median(times) * 1000),
+            "single_row_p95_ms": float(np.percentile(times, 95) * 1000),
+            "batch_rows": rows, "batch_seconds": batch_s,
+            "rows_per_second": rows / batch_s}
+
+
+def benchmark(names=MODELS, rows=100_000, repeats=200):
+    from sklearn.model_selection import train_test_split
+    from training_harness import RANDOM_SEED, TEST_SIZE
+
+    results = {}
+    for name in names:
+        try:
+            X, y, _ = load_training_data(name)
+        except FileNotFoundError as e:
+            print(f"\n{name}: skipped – {e}")
+            continue
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=TEST_SIZE, stratify=y, random_state=RANDOM_SEED)
+        print(f"\n{name}: {len(y_train)} training rows")
+        results[name] = {}
+        for label, model in estimators(name):
+            r = bench_one(model, X_train, y_train, X_test, y_test, rows, repeats)
+            results[name][label] = r
+            print(f"  {label:<5} fit {r['fit_seconds']:7.2f} s   acc {r['test_accuracy']:.4f}   "
+                  f"1 row {r['single_row_ms']:7.3f} ms   "
+                  f"{rows} rows {r['batch_seconds']:6.2f} s ({r['rows_per_second']:,.0f}/s)")
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark GB vs HistGB vs LightGBM.")
+    ap.add_argument("models", nargs="*", metavar="MODEL", help=f"any of {', '.join(MODELS)}")
+    ap.add_argument("--rows", type=int, default=100_000, help="rows in the batch-throughput run")
+    ap.add_argument("--repeats", type=int, default=200, help="single-row calls to time")
+    ap.add_argument("--threads", type=int, help="cap BLAS/OpenMP threads")
+    ap.add_argument("--out", help="also write the results as JSON")
+    args = ap.parse_args(argv)
+    unknown = sorted(set(args.models) - set(RECIPES))
+    if unknown:
+        ap.error(f"unknown model(s) {unknown}; choose from {list(RECIPES)}")
+
+    if args.threads:
+        _limit_threads(args.threads)
+    results = benchmark(args.models or MODELS, args.rows, args.repeats)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"threads": args.threads or os.cpu_count(), "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
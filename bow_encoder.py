@@ -0,0 +1,103 @@
+# bow_encoder.py
+# ------------------------------------------------------------
+# Bag-of-words encoder for the first-aid chatbot.
+#
+# The vocabulary (words.pkl) is turned into a word → column dictionary once,
+# so encoding a sentence is O(#tokens) dictionary lookups instead of the
+# old O(|vocab| · #tokens) `w in sentence_words` scan.  encode_batch() builds
+# the whole (n, |vocab|) matrix with one fancy-index assignment, dense or
+# as a scipy CSR matrix.
+#
+# Benchmark against the list-comprehension bow():  python bow_encoder.py
+
+import numpy as np
+
+
+class BowEncoder:
+    def __init__(self, words, tokenize=None, dtype=np.float32):
+        self.words      = words if isinstance(words, list) else list(words)
+        self.vocab_size = len(self.words)
+        self.tokenize   = tokenize            # sentence → list of cleaned tokens
+        self.dtype      = dtype
+
+        positions = {}
+        for i, w in enumerate(self.words):    # duplicates in the vocab all light up
+            positions.setdefault(w, []).append(i)
+        self.index = {w: (p[0] if len(p) == 1 else np.array(p)) for w, p in positions.items()}
+
+    # ── single sentence ────────────────────────────────────
+    def columns(self, tokens) -> np.ndarray:
+        index = self.index
+        hits = [index[t] for t in set(tokens) if t in index]
+        if not hits:
+            return np.empty(0, dtype=np.intp)
+        return np.unique(np.hstack(hits)).astype(np.intp)
+
+    def encode_tokens(self, tokens, out=None) -> np.ndarray:
+        if out is None:
+            vec = np.zeros(self.vocab_size, dtype=self.dtype)
+        else:                                 # reuse a caller-owned buffer
+            vec = out
+            vec.fill(0)
+        vec[self.columns(tokens)] = 1
+        return vec
+
+    def encode(self, sentence: str) -> np.ndarray:
+        return self.encode_tokens(self.tokenize(sentence))
+
+    # ── batch ──────────────────────────────────────────────
+    def encode_batch(self, sentences, sparse=False, tokenized=False):
+        token_lists = sentences if tokenized else [self.tokenize(s) for s in sentences]
+        cols = [self.columns(t) for t in token_lists]
+        rows = np.repeat(np.arange(len(cols)), [len(c) for c in cols])
+        cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.intp)
+
+        if sparse:
+            from scipy.sparse import csr_matrix
+            data = np.ones(len(cols), dtype=self.dtype)
+            return csr_matrix((data, (rows, cols)), shape=(len(token_lists), self.vocab_size))
+
+        out = np.zeros((len(token_lists), self.vocab_size), dtype=self.dtype)
+        out[rows, cols] = 1
+        return out
+
+
+# ───────────────────────────────────────────────────────────
+# Micro-benchmark
+# ───────────────────────────────────────────────────────────
+def _legacy_bow(sentence_words, words):
+    bag = [1 if w in sentence_words else 0 for w in words]
+    return np.array(bag)
+
+
+def benchmark(words_path="words.pkl", intents_path="intents.json", repeats=20):
+    import json, pickle, time
+    from first_aid_chatbot import clean_up_sentence
+
+    words = pickle.load(open(words_path, "rb"))
+    intents = json.load(open(intents_path, encoding="utf-8"))
+    sentences = [p for i in intents["intents"] for p in i.get("patterns", [])]
+    tokens = [clean_up_sentence(s) for s in sentences]   # tokenizing excluded from timings
+    enc = BowEncoder(words, clean_up_sentence)
+
+    for t in tokens:                                     # same vectors as before
+        assert np.array_equal(_legacy_bow(t, words), enc.encode_tokens(t))
+
+    def timed(fn):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            fn()
+        return (time.perf_counter() - start) / repeats
+
+    legacy = timed(lambda: [_legacy_bow(t, words) for t in tokens])
+    single = timed(lambda: [enc.encode_tokens(t) for t in tokens])
+    batch  = timed(lambda: enc.encode_batch(tokens, tokenized=True))
+    n = len(tokens)
+    print(f"vocabulary: {len(words)} words, {n} sentences from {intents_path}")
+    print(f"legacy bow()         {legacy / n * 1e6:9.1f} µs/sentence")
+    print(f"BowEncoder.encode    {single / n * 1e6:9.1f} µs/sentence  ({legacy / single:5.1f}×)")
+    print(f"BowEncoder batch     {batch / n * 1e6:9.1f} µs/sentence  ({legacy / batch:5.1f}×)")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,246 @@
+# chatbot_inference.py
+# ------------------------------------------------------------
+# Inference backends for chatbot_model.h5.
+#
+# model.predict() runs Keras' whole predict loop (dataset wrapping,
+# callbacks, step function) for a single bag-of-words row.  The chatbot is a
+# small Dense/Dropout stack, so the weights are pulled out once and the
+# forward pass is evaluated directly:
+#
+#   numpy        pure NumPy matmuls (default)
+#   tf_function  the Keras model traced once as a tf.function with a fixed
+#                (None, |vocab|) float32 signature
+#   keras        plain model.predict, as before
+#   tflite       chatbot_model.<variant>.tflite from tflite_export.py, run by
+#                the TFLite interpreter (falls back to keras if not exported)
+#
+# Select with BAYMAX_CHATBOT_BACKEND.  load_backend() loads only what the
+# choice needs: for tflite just the interpreter, without loading the Keras
+# model (or TensorFlow, when tflite_runtime / ai_edge_litert is installed).
+# A backend that cannot run the model (architectures the NumPy path does not
+# understand, no exported .tflite) raises UnsupportedBackend and the loader
+# falls back to keras with a logged warning.  Set BAYMAX_CHATBOT_VERIFY=1 to
+# compare the chosen backend against Keras on load.
+#
+# Parity check + latency benchmark:  python chatbot_inference.py
+
+import logging
+import os
+
+import numpy as np
+
+DEFAULT_BACKEND = "numpy"
+MODEL_PATH      = "chatbot_model.h5"
+
+log = logging.getLogger(__name__)
+
+
+class UnsupportedBackend(Exception):
+    """The selected backend cannot run this model; make_backend uses keras instead."""
+
+
+def _softmax(x):
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+ACTIVATIONS = {
+    "linear":  lambda x: x,
+    "relu":    lambda x: np.maximum(x, 0),
+    "sigmoid": lambda x: 1.0 / (1.0 + np.exp(-x)),
+    "tanh":    np.tanh,
+    "softmax": _softmax,
+}
+
+
+# ───────────────────────────────────────────────────────────
+# Backends
+# ───────────────────────────────────────────────────────────
+class KerasBackend:
+    name = "keras"
+
+    def __init__(self, model):
+        self.model = model
+
+    def predict(self, X):
+        return self.model.predict(X, verbose=0)
+
+
+class NumpyDenseBackend:
+    name = "numpy"
+
+    def __init__(self, model):
+        self.layers = []                      # [(W, b, activation)]
+        for layer in model.layers:
+            kind = type(layer).__name__
+            if kind in ("InputLayer", "Dropout", "GaussianNoise", "Flatten"):
+                continue                      # identity at inference time
+            if kind == "Dense":
+                W, *rest = layer.get_weights()
+                b = rest[0] if rest else np.zeros(W.shape[1], dtype=W.dtype)
+                self.layers.append((np.ascontiguousarray(W, np.float32),
+                                    b.astype(np.float32), self._activation(layer)))
+            elif kind == "Activation":
+                self.layers.append((None, None, self._activation(layer)))
+            elif kind == "BatchNormalization" and self.layers and self.layers[-1][0] is not None:
+                self._fold_batchnorm(layer)
+            else:
+                raise UnsupportedBackend(f"No NumPy kernel for layer {kind}")
+
+    @staticmethod
+    def _activation(layer):
+        name = getattr(layer.activation, "__name__", str(layer.activation))
+        if name not in ACTIVATIONS:
+            raise UnsupportedBackend(f"No NumPy kernel for activation {name}")
+        return ACTIVATIONS[name]
+
+    def _fold_batchnorm(self, layer):
+        # y = γ (xW + b − μ) / √(σ² + ε) + β  ⇒  x·(W·s) + ((b − μ)·s + β)
+        W, b, act = self.layers[-1]
+        if act is not ACTIVATIONS["linear"]:
+            raise UnsupportedBackend("BatchNormalization after a non-linear Dense")
+        cfg = layer.get_config()
+        weights = layer.get_weights()
+        gamma = weights.pop(0) if cfg.get("scale", True) else 1.0
+        beta  = weights.pop(0) if cfg.get("center", True) else 0.0
+        mean, var = weights
+        s = (gamma / np.sqrt(var + cfg.get("epsilon", 1e-3))).astype(np.float32)
+        self.layers[-1] = (W * s, ((b - mean) * s + beta).astype(np.float32), act)
+
+    def predict(self, X):
+        x = np.asarray(X, dtype=np.float32)
+        for W, b, act in self.layers:
+            if W is not None:
+                x = x @ W
+                x += b
+            x = act(x)
+        return x
+
+
+class TFFunctionBackend:
+    name = "tf_function"
+
+    def __init__(self, model):
+        import tensorflow as tf
+        self.tf = tf
+        n_in = model.inputs[0].shape[-1]
+        self.fn = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec([None, n_in], tf.float32)],
+        )
+        self.fn.get_concrete_function()       # trace now, not on the first message
+
+    def predict(self, X):
+        return self.fn(self.tf.convert_to_tensor(X, self.tf.float32)).numpy()
+
+
+class TFLiteBackend:
+    name = "tflite"
+
+    def __init__(self, model=None, model_path=MODEL_PATH):
+        from tflite_model import TFLiteModel, find_tflite
+        path = find_tflite(model_path, os.environ.get("BAYMAX_TFLITE_VARIANT"))
+        if path is None:
+            raise UnsupportedBackend(f"no exported .tflite next to {model_path}")
+        self.tflite = TFLiteModel(path)
+
+    def predict(self, X):
+        return self.tflite.predict(X)
+
+
+BACKENDS = {b.name: b for b in (NumpyDenseBackend, TFFunctionBackend, TFLiteBackend,
+                                KerasBackend)}
+
+
+def verify_parity(model, backend, n_samples=64, density=0.05, atol=1e-5, seed=0):
+    """Max |backend − Keras| over random bag-of-words rows; raises above *atol*."""
+    rng = np.random.default_rng(seed)
+    n_in = model.inputs[0].shape[-1]
+    X = (rng.random((n_samples, n_in)) < density).astype(np.float32)
+    X[0] = 0                                  # empty sentence
+    diff = float(np.abs(backend.predict(X) - model.predict(X, verbose=0)).max())
+    if diff > atol:
+        raise AssertionError(f"{backend.name} backend differs from Keras by {diff:.2e}")
+    return diff
+
+
+def _backend_kind(kind):
+    kind = kind or os.environ.get("BAYMAX_CHATBOT_BACKEND", DEFAULT_BACKEND)
+    if kind not in BACKENDS:
+        raise ValueError(f"Unknown chatbot backend {kind!r}; choose from {sorted(BACKENDS)}")
+    return kind
+
+
+def _verify():
+    return os.environ.get("BAYMAX_CHATBOT_VERIFY") == "1"
+
+
+def load_keras_model(model_path=MODEL_PATH):
+    from tensorflow.keras.models import load_model
+    return load_model(model_path)
+
+
+def load_backend(model_path=MODEL_PATH, kind=None):
+    """
+    (Keras model, backend) for *model_path*.  With the tflite backend the
+    model is None – Keras is only loaded as the fallback when no .tflite was
+    exported, or for the BAYMAX_CHATBOT_VERIFY comparison.
+    """
+    kind = _backend_kind(kind)
+    if kind == "tflite":
+        try:
+            backend = TFLiteBackend(model_path=model_path)
+        except UnsupportedBackend as e:
+            log.warning("Chatbot backend %r unavailable (%s); using keras", kind, e)
+            kind = "keras"
+        else:
+            if not _verify():
+                return None, backend
+            model = load_keras_model(model_path)
+            verify_parity(model, backend)
+            return model, backend
+    model = load_keras_model(model_path)
+    return model, make_backend(model, kind)
+
+
+def make_backend(model, kind=None):
+    kind = _backend_kind(kind)
+    try:
+        backend = BACKENDS[kind](model)
+    except UnsupportedBackend as e:
+        log.warning("Chatbot backend %r unavailable (%s); using keras", kind, e)
+        backend = KerasBackend(model)
+    if _verify() and backend.name != "keras":
+        verify_parity(model, backend)
+    return backend
+
+
+# ───────────────────────────────────────────────────────────
+# Parity + latency benchmark
+# ───────────────────────────────────────────────────────────
+def benchmark(model_path=MODEL_PATH, repeats=200):
+    import time
+
+    model = load_keras_model(model_path)
+    n_in = model.inputs[0].shape[-1]
+    x = np.zeros((1, n_in), dtype=np.float32)
+    x[0, :: max(1, n_in // 5)] = 1
+
+    print(f"{'backend':<12} {'max |Δ| vs keras':>18} {'ms / message':>14}")
+    for name, cls in BACKENDS.items():
+        try:
+            backend = TFLiteBackend(model, model_path) if cls is TFLiteBackend else cls(model)
+        except UnsupportedBackend as e:
+            print(f"{name:<12} unsupported: {e}")
+            continue
+        diff = verify_parity(model, backend)
+        backend.predict(x)                                  # warm-up
+        start = time.perf_counter()
+        for _ in range(repeats):
+            backend.predict(x)
+        ms = (time.perf_counter() - start) / repeats * 1000
+        print(f"{name:<12} {diff:>18.2e} {ms:>14.3f}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -1,5 +1,6 @@
 import sys
 import mysql.connector
+import db_utils
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QPushButton,
     QVBoxLayout, QHBoxLayout, QMessageBox, QSizePolicy, QSpacerItem, QFrame
@@ -126,12 +127,7 @@ class CreateAccountWindow(QWidget):
             return
 
         try:
-            conn = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password="",
-                database="baymax"
-            )
+            conn = db_utils.get_connection()
             cursor = conn.cursor()
             cursor.execute("INSERT INTO users (username, email, password) VALUES (%s, %s, %s)",
                            (username, email, password))
@@ -4,11 +4,19 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtGui import QPixmap, QFont
 from PyQt5.QtCore import Qt
+import warmup
 
-from ai_powered_prediction import AIPredictionWindow
-from emergency_assistance import EmergencyAssistanceWindow
-from prescription import PrescriptionWindow  
-from user_data_management import UserDataManagement
+# Feature windows are imported inside their slots: the prediction pages pull
+# in sklearn/joblib and the chatbot/prescription windows TensorFlow, none of
+# which should be paid for before the user picks a tile.  Their models are
+# preloaded in the background by the warm-up scheduler started below.
+
+# tile title → models it needs (readiness is shown on the tile)
+TILE_MODELS = {
+    "AI-Powered Predictions":   ("diabetes", "heart", "liver", "bmi"),
+    "Prescription Recognition": ("prescription",),
+    "Emergency Assistance":     ("chatbot",),
+}
 
 class DashboardWindow(QWidget):
     def __init__(self, username="User", user_id=None):  # Accept user_id here
@@ -18,8 +26,14 @@ class DashboardWindow(QWidget):
         self.setWindowTitle("Baymax Dashboard")
         self.setGeometry(100, 100, 1000, 600)
         self.setStyleSheet("background-color: #ecf0f1;")
+        self.tile_status = {}                   # title → status QLabel
         self.setup_ui()
 
+        self.warmup = warmup.get_scheduler()
+        self.warmup.state_changed.connect(self.update_tile_status)
+        self.update_tile_status()
+        self.warmup.start()
+
     def setup_ui(self):
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(40, 30, 40, 30)
@@ -69,21 +83,30 @@ class DashboardWindow(QWidget):
 
     
     def open_ai_prediction(self):
+        from ai_powered_prediction import AIPredictionWindow
         # Pass user_id if your AIPredictionWindow accepts it; else just pass username
         self.ai_window = AIPredictionWindow(username=self.username)
         self.ai_window.show()
 
     
     def open_emergency_assistance(self):
+        from emergency_assistance import EmergencyAssistanceWindow
         self.emergency_window = EmergencyAssistanceWindow(username=self.username)
         self.emergency_window.show()
 
     
     def open_prescription_recognition(self):
+        # waits (without blocking the UI) for the warm-up load if it is in flight
+        self.warmup.when_ready("prescription", self._show_prescription)
+        self.update_tile_status()
+
+    def _show_prescription(self):
+        from prescription import PrescriptionWindow
         self.prescription_window = PrescriptionWindow()
         self.prescription_window.show()
 
     def open_user_data_management(self):                       # ← NEW
+        from user_data_management import UserDataManagement
         self.udm_window = UserDataManagement(username=self.username)
         self.udm_window.show()
 
@@ -119,11 +142,33 @@ class DashboardWindow(QWidget):
         layout.addSpacing(10)
         layout.addWidget(text_label)
 
+        if title in TILE_MODELS:
+            status_label = QLabel()
+            status_label.setAlignment(Qt.AlignCenter)
+            status_label.setFont(QFont("Arial", 9))
+            status_label.setStyleSheet("background-color: transparent; color: #dfe9eb;")
+            layout.addWidget(status_label)
+            self.tile_status[title] = status_label
+
         if click_callback:
             frame.mousePressEvent = lambda event: click_callback()
 
         return frame
 
+    def update_tile_status(self, *_):
+        for title, label in self.tile_status.items():
+            states = [self.warmup.state(n) for n in TILE_MODELS[title]]
+            if all(s == warmup.READY for s in states):
+                text = "✓ Ready"
+            elif warmup.LOADING in states:
+                done = sum(s in (warmup.READY, warmup.FAILED) for s in states)
+                text = f"⏳ Loading models… {done}/{len(states)}"
+            elif warmup.PENDING in states:
+                text = "Waiting to load…"
+            else:
+                text = "⚠ Some models failed to load"
+            label.setText(text)
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     dashboard = DashboardWindow(username="Ragib")
@@ -1,11 +1,6 @@
 # db_connector.py
 
-import mysql.connector
+import db_pool
 
 def get_connection():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="",  # use your actual MySQL password if set
-        database="baymax"
-    )
+    return db_pool.get_connection()
@@ -0,0 +1,256 @@
+# db_pool.py
+# ------------------------------------------------------------
+# Shared, bounded MySQL connection pool for every Baymax window.
+#
+# Configuration (environment or .env):
+#   BAYMAX_DB_HOST / BAYMAX_DB_PORT / BAYMAX_DB_USER /
+#   BAYMAX_DB_PASSWORD / BAYMAX_DB_NAME      connection target
+#   BAYMAX_DB_POOL_SIZE     max open connections        (default 5)
+#   BAYMAX_DB_POOL_TIMEOUT  seconds to wait for a slot  (default 10)
+#   BAYMAX_DB_POOL_IDLE     idle seconds before eviction (default 300)
+#   BAYMAX_DB_POOL_PING     idle seconds before a checkout is pinged (default 30)
+
+import os
+import threading
+import time
+
+import mysql.connector
+from mysql.connector import errors
+
+try:                                   # optional, see README (.env)
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
+
+
+def _env(name, default, cast=str):
+    value = os.environ.get(name)
+    return default if value in (None, "") else cast(value)
+
+
+def db_config() -> dict:
+    return {
+        "host":     _env("BAYMAX_DB_HOST", "localhost"),
+        "port":     _env("BAYMAX_DB_PORT", 3306, int),
+        "user":     _env("BAYMAX_DB_USER", "root"),
+        "password": _env("BAYMAX_DB_PASSWORD", ""),
+        "database": _env("BAYMAX_DB_NAME", "baymax"),
+    }
+
+
+# ───────────────────────────────────────────────────────────
+# Checked-out connection
+# ───────────────────────────────────────────────────────────
+class PooledConnection:
+    """
+    Thin proxy around a mysql.connector connection.  ``close()`` hands the
+    connection back to the pool instead of tearing down the socket, so the
+    existing ``conn.close()`` calls in the windows keep working unchanged.
+    """
+
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw  = raw
+
+    def __getattr__(self, name):
+        raw = self.__dict__.get("_raw")
+        if raw is None:
+            raise errors.InterfaceError("Connection already returned to the pool.")
+        return getattr(raw, name)
+
+    def close(self):
+        raw, self._raw = self._raw, None
+        if raw is not None:
+            self._pool._release(raw)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+# ───────────────────────────────────────────────────────────
+# Pool
+# ───────────────────────────────────────────────────────────
+class ConnectionPool:
+    def __init__(self, size=None, timeout=None, max_idle=None, ping_after=None, **config):
+        self.config     = config or db_config()
+        self.size       = size       if size       is not None else _env("BAYMAX_DB_POOL_SIZE", 5, int)
+        self.timeout    = timeout    if timeout    is not None else _env("BAYMAX_DB_POOL_TIMEOUT", 10.0, float)
+        self.max_idle   = max_idle   if max_idle   is not None else _env("BAYMAX_DB_POOL_IDLE", 300.0, float)
+        self.ping_after = ping_after if ping_after is not None else _env("BAYMAX_DB_POOL_PING", 30.0, float)
+
+        self._cond  = threading.Condition()
+        self._idle  = []           # LIFO stack of (raw_conn, released_at)
+        self._open  = 0            # idle + checked out
+        self._stats = {
+            "hits": 0,             # checkout served by an idle connection
+            "misses": 0,           # checkout had to open a new connection
+            "waits": 0,            # checkout had to wait for a free slot
+            "wait_time": 0.0,      # total seconds spent waiting
+            "max_wait": 0.0,
+            "timeouts": 0,
+            "evicted_idle": 0,
+            "evicted_dead": 0,
+        }
+
+    # ── public API ─────────────────────────────────────────
+    def get_connection(self) -> PooledConnection:
+        deadline = time.monotonic() + self.timeout
+        waited   = None
+
+        with self._cond:
+            while True:
+                self._evict_idle_locked()
+                if self._idle:
+                    raw, released_at = self._idle.pop()
+                    self._open -= 1          # re-added below if still healthy
+                    reuse = True
+                    break
+                if self._open < self.size:
+                    reuse = False
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats["timeouts"] += 1
+                    raise errors.PoolError(
+                        f"No free database connection after {self.timeout:.1f}s "
+                        f"(pool size {self.size})."
+                    )
+                if waited is None:
+                    waited = time.monotonic()
+                    self._stats["waits"] += 1
+                self._cond.wait(remaining)
+
+            if waited is not None:
+                elapsed = time.monotonic() - waited
+                self._stats["wait_time"] += elapsed
+                self._stats["max_wait"] = max(self._stats["max_wait"], elapsed)
+            self._open += 1                  # reserve the slot before any I/O
+
+        try:
+            if reuse and self._is_healthy(raw, released_at):
+                self._count("hits")
+            else:
+                if reuse:
+                    self._count("evicted_dead")
+                    self._discard(raw)
+                raw = mysql.connector.connect(**self.config)
+                self._count("misses")
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+        return PooledConnection(self, raw)
+
+    def stats(self) -> dict:
+        with self._cond:
+            snapshot = dict(self._stats)
+            snapshot.update(size=self.size, open=self._open, idle=len(self._idle))
+        checkouts = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_rate"]  = snapshot["hits"] / checkouts if checkouts else 0.0
+        snapshot["avg_wait"]  = snapshot["wait_time"] / snapshot["waits"] if snapshot["waits"] else 0.0
+        return snapshot
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for raw, _ in idle:
+            self._discard(raw)
+
+    # ── internals ──────────────────────────────────────────
+    def _release(self, raw):
+        try:
+            # drop unread rows and any half-finished transaction so the
+            # next user starts clean (e.g. login only calls fetchone())
+            if raw.is_connected():
+                if raw.unread_result:
+                    raw.consume_results()
+                if raw.in_transaction:
+                    raw.rollback()
+            healthy = raw.is_connected()
+        except Exception:
+            healthy = False
+
+        with self._cond:
+            if healthy:
+                self._idle.append((raw, time.monotonic()))
+            else:
+                self._open -= 1
+                self._stats["evicted_dead"] += 1
+            self._cond.notify()
+        if not healthy:
+            self._discard(raw)
+
+    def _is_healthy(self, raw, released_at) -> bool:
+        # cheap check on hot connections, a round-trip ping on stale ones
+        if time.monotonic() - released_at < self.ping_after:
+            return raw.is_connected()
+        try:
+            raw.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _evict_idle_locked(self):
+        if not self._idle or self.max_idle <= 0:
+            return
+        cutoff = time.monotonic() - self.max_idle
+        keep, stale = [], []
+        for item in self._idle:
+            (stale if item[1] < cutoff else keep).append(item)
+        if stale:
+            self._idle = keep
+            self._open -= len(stale)
+            self._stats["evicted_idle"] += len(stale)
+            for raw, _ in stale:
+                self._discard(raw)
+
+    def _count(self, key):
+        with self._cond:
+            self._stats[key] += 1
+
+    @staticmethod
+    def _discard(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+
+# ───────────────────────────────────────────────────────────
+# Process-wide default pool
+# ───────────────────────────────────────────────────────────
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool()
+    return _pool
+
+
+def get_connection() -> PooledConnection:
+    return get_pool().get_connection()
+
+
+def pool_stats() -> dict:
+    return get_pool().stats()
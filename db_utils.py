@@ -1,30 +1,15 @@
 # db_utils.py
-import mysql.connector
+import db_pool
+import result_writer
 
 def get_connection():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",
-        password="",          # change if you set one
-        database="baymax"     # use your own db name
-    )
+    # pooled connection – conn.close() hands it back to the pool
+    return db_pool.get_connection()
 
 def save_result(table: str, data: dict):
-    conn = get_connection()
-    cur = conn.cursor()
+    # queued for the background writer (batched executemany, spills to disk
+    # while the DB is down) – returns immediately
+    result_writer.get_writer().submit(table, data)
 
-    cols = ", ".join(data.keys())
-    placeholders = []
-    values = []
-    for val in data.values():
-        if isinstance(val, str) and val == "CURRENT_TIMESTAMP()":
-            placeholders.append(val)  # raw SQL, no placeholder
-        else:
-            placeholders.append("%s")
-            values.append(val)
-
-    sql = f"INSERT INTO {table} ({cols}) VALUES ({', '.join(placeholders)})"
-    cur.execute(sql, tuple(values))
-    conn.commit()
-    cur.close()
-    conn.close()
+def flush_results(timeout=None) -> bool:
+    return result_writer.get_writer().flush(timeout)
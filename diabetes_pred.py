@@ -1,14 +1,14 @@
 import sys
 import os
-import numpy as np
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QVBoxLayout, QHBoxLayout,
     QPushButton, QRadioButton, QButtonGroup, QFormLayout, QMessageBox
 )
 from PyQt5.QtGui import QFont, QPixmap
 from PyQt5.QtCore import Qt
-import joblib
 import db_utils
+import task_runner
+import scoring
 
 
 
@@ -142,16 +142,14 @@ class DiabetesPredictionPage(QWidget):
 
     def load_model(self):
         try:
-            folder = os.path.dirname(os.path.abspath(__file__))
-            model_path = os.path.join(folder, "diabetes_model.joblib")
-            self.model = joblib.load(model_path, mmap_mode=None)
+            self.scorer = scoring.get_scorer("diabetes")    # shared, loaded once
         except Exception as e:
             QMessageBox.critical(self, "Error", f"⚠️ Failed to load model:\n{str(e)}")
-            self.model = None
+            self.scorer = None
 
     def predict_diabetes(self):
         try:
-            if self.model is None:
+            if self.scorer is None:
                 raise ValueError("ML Model is not loaded.")
 
             gender        = self.gender_group.checkedId()
@@ -163,40 +161,49 @@ class DiabetesPredictionPage(QWidget):
             hba1c         = float(self.hba1c_input.text())
             glucose       = float(self.glucose_input.text())
 
-            input_data = np.array([[gender, age, hypertension, heart_disease,
-                                    smoking, bmi, hba1c, glucose]])
-
-            prediction = int(self.model.predict(input_data)[0])
-
-            # Optional probability (comment out if model has no predict_proba)
-            conf = float(self.model.predict_proba(input_data)[0, prediction]) * 100
-
-            msg = ("✅ Diabetes Detected" if prediction == 1
-                else "🟢 No Diabetes Detected")
-            QMessageBox.information(self, "Prediction Result", f"{msg} ({conf:.1f}%)")
-
-            # ── Save to DB ───────────────────────────────────────────
-            if self.user_id:
-                print("Saving prediction to DB for user:", self.user_id)
-                db_utils.save_result("diabetes_results", {
-                    "user_id": self.user_id,
-                    "gender": gender,
-                    "age": age,
-                    "hypertension": hypertension,
-                    "heart_disease": heart_disease,
-                    "smoking": smoking,
-                    "bmi": bmi,
-                    "hba1c": hba1c,
-                    "glucose": glucose,
-                    "prediction": int(prediction),
-                    "ts": "CURRENT_TIMESTAMP()"
-                })
-                print("Save function called.")
-
-
+            inputs = dict(gender=gender, age=age, hypertension=hypertension,
+                          heart_disease=heart_disease, smoking=smoking,
+                          bmi=bmi, hba1c=hba1c, glucose=glucose)
         except Exception as e:
             QMessageBox.warning(self, "Input Error",
                                 f"❌ Please check your input:\n{str(e)}")
+            return
+
+        # inference + DB write run on the task pool, the result comes back here
+        task_runner.get_runner().submit(
+            self._run_prediction, self.scorer, self.user_id, inputs,
+            on_result=self._show_result, on_error=self._show_error,
+            owner=self, name="diabetes.predict")
+
+    @staticmethod
+    def _run_prediction(scorer, user_id, inputs):
+        result = scorer.score(inputs)               # one pass: class + probability
+        prediction = result.code
+        conf = result.confidence * 100
+
+        # ── Save to DB ───────────────────────────────────────────
+        if user_id:
+            db_utils.save_result("diabetes_results", {
+                "user_id": user_id,
+                **inputs,
+                "prediction": int(prediction),
+                "ts": "CURRENT_TIMESTAMP()"
+            })
+        return prediction, conf
+
+    def _show_result(self, result):
+        prediction, conf = result
+        msg = ("✅ Diabetes Detected" if prediction == 1
+            else "🟢 No Diabetes Detected")
+        QMessageBox.information(self, "Prediction Result", f"{msg} ({conf:.1f}%)")
+
+    def _show_error(self, e):
+        QMessageBox.warning(self, "Input Error",
+                            f"❌ Please check your input:\n{str(e)}")
+
+    def closeEvent(self, event):
+        task_runner.get_runner().cancel_owner(self)
+        super().closeEvent(event)
 
     
 
@@ -0,0 +1,82 @@
+# directory_index.py
+# ------------------------------------------------------------
+# Precomputed index for the Emergency Directory's cascading filters.
+#
+# Built once when the CSV is loaded:
+#   codes[level]     int32 category code per row (labels sorted, so sorted
+#                    codes ⇒ sorted labels)
+#   postings[level]  label → sorted array of row ids
+#
+# A filter selection (Division → District → Upazila → Department → Address,
+# any level may be left at "All …") is answered by intersecting the posting
+# lists, smallest first; the options for the next combo are the distinct
+# codes among the surviving rows.  Neither touches the DataFrame.
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+LEVELS = ("Division", "District", "Upazila", "Department", "Address")
+
+
+class DirectoryIndex:
+    def __init__(self, df: pd.DataFrame, levels=LEVELS, cache_size=256):
+        self.levels   = tuple(levels)
+        self.n_rows   = len(df)
+        self.all_rows = np.arange(self.n_rows, dtype=np.int64)
+        self.labels   = {}
+        self.codes    = {}
+        self.postings = {}
+
+        for level in self.levels:
+            codes, labels = pd.factorize(df[level], sort=True)
+            codes = codes.astype(np.int32)
+            # one stable argsort splits the rows into per-label runs
+            order  = np.argsort(codes, kind="stable")
+            bounds = np.cumsum(np.bincount(codes, minlength=len(labels)))[:-1]
+            self.codes[level]    = codes
+            self.labels[level]   = np.asarray(labels, dtype=object)
+            self.postings[level] = dict(zip(labels, np.split(order, bounds)))
+
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+
+    # ── queries ────────────────────────────────────────────
+    def rows(self, selection: dict) -> np.ndarray:
+        """Sorted row ids matching every {level: label} in *selection*."""
+        key = tuple((lvl, selection[lvl]) for lvl in self.levels if lvl in selection)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        lists = []
+        for level, label in key:
+            posting = self.postings[level].get(label)
+            if posting is None:
+                lists = [np.empty(0, dtype=np.int64)]
+                break
+            lists.append(posting)
+
+        if not lists:
+            result = self.all_rows
+        else:
+            lists.sort(key=len)
+            result = lists[0]
+            for other in lists[1:]:
+                if not len(result):
+                    break
+                result = np.intersect1d(result, other, assume_unique=True)
+
+        self._cache[key] = result
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def options(self, level: str, selection: dict) -> list:
+        """Sorted distinct *level* labels among the rows matching *selection*."""
+        rows = self.rows(selection)
+        if len(rows) == self.n_rows:
+            return self.labels[level].tolist()
+        present = np.unique(self.codes[level][rows])
+        return self.labels[level][present].tolist()
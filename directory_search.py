@@ -0,0 +1,246 @@
+# directory_search.py
+# ------------------------------------------------------------
+# Provider-name search for the Emergency Directory.
+#
+#   * names are normalized once (accents stripped, lower case, punctuation
+#     dropped); titles stay, so "dr" matches like the old str.contains did
+#   * n-gram postings are built with numpy into CSR arrays:
+#       bigrams  – 1–2 letter queries (1 letter = union of every bigram
+#                  holding it, i.e. still a substring match)
+#       trigrams – substring queries of 3+ letters (intersect, then verify)
+#   * when a substring finds nothing, a fuzzy pass runs over a phonetic key
+#     that folds common Bangla romanization variants (Mohammad/Muhammad/Md,
+#     sh/s, kh/k, ph/f, z/j, v/b, ee/i, oo/u, doubled letters …) and ranks
+#     rows by shared trigrams, so typos and spelling variants still match;
+#     "Dr."/"Prof." titles are left out of that key
+#
+# Benchmark:  python directory_search.py  [sizes …]
+
+import re
+import sys
+import time
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+
+MAX_LEN = 64                                   # longer names are truncated for indexing
+
+# character → small code (0 = padding)
+_K   = 40
+_LUT = np.full(128, _K - 1, dtype=np.int64)
+_LUT[0] = 0
+_LUT[ord(" ")] = 1
+_LUT[ord("a"):ord("z") + 1] = np.arange(2, 28)
+_LUT[ord("0"):ord("9") + 1] = np.arange(28, 38)
+
+_TITLES = re.compile(r"\b(dr|prof|professor|mr|mrs|ms)\b")
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]+")
+_SPACES = re.compile(r"\s+")
+
+_ALIASES = {
+    "mohammad": "md", "mohammed": "md", "muhammad": "md", "muhammed": "md",
+    "mohamed": "md", "mohammod": "md", "mohd": "md", "mohamad": "md", "md": "md",
+    "abdul": "abdul", "abdur": "abdul", "abdus": "abdul", "abdul-": "abdul",
+}
+_FOLDS = [(re.compile(p), r) for p, r in (
+    (r"ph", "f"), (r"sh", "s"), (r"kh", "k"), (r"gh", "g"), (r"bh", "b"),
+    (r"dh", "d"), (r"th", "t"), (r"jh", "j"), (r"ch", "c"), (r"z", "j"),
+    (r"v", "b"), (r"w", "o"), (r"q", "k"), (r"y", "i"), (r"ee|ii", "i"),
+    (r"oo|ou", "u"), (r"(.)\1+", r"\1"),
+)]
+
+
+def normalize(text: str, strip_titles=False) -> str:
+    text = str(text)
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in text if not unicodedata.combining(c))
+    text = text.lower()
+    text = _NON_ALNUM.sub(" ", text)
+    if strip_titles:
+        text = _TITLES.sub(" ", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+@lru_cache(maxsize=1 << 16)
+def _fold_word(word: str) -> str:
+    word = _ALIASES.get(word, word)
+    for pattern, repl in _FOLDS:
+        word = pattern.sub(repl, word)
+    return word
+
+
+def phonetic(normalized: str) -> str:
+    # names share a small vocabulary, so folding is cached per word
+    return " ".join(_fold_word(w) for w in _TITLES.sub(" ", normalized).split())
+
+
+# ───────────────────────────────────────────────────────────
+# n-gram CSR postings
+# ───────────────────────────────────────────────────────────
+def _codes(strings):
+    """(n, MAX_LEN+1) code matrix; every string gets a leading space (word start)."""
+    arr = np.array([" " + s[:MAX_LEN] for s in strings], dtype=f"U{MAX_LEN + 1}")
+    cp  = arr.view(np.uint32).reshape(len(arr), -1).astype(np.int64)
+    return np.where(cp < 128, _LUT[np.minimum(cp, 127)], _K - 1) * (cp > 0)
+
+
+def _gram_ids(codes, n):
+    ids = np.zeros(codes[:, : codes.shape[1] - n + 1].shape, dtype=np.int64)
+    ok  = np.ones_like(ids, dtype=bool)
+    for k in range(n):
+        part = codes[:, k: codes.shape[1] - n + 1 + k]
+        ids  = ids * _K + part
+        ok  &= part > 0
+    return ids, ok
+
+
+class _Postings:
+    def __init__(self, strings, n, chunk=200_000):
+        self.n = n
+        self.n_rows = len(strings)
+        keys, counts = [], np.zeros(self.n_rows, dtype=np.int32)
+        for start in range(0, self.n_rows, chunk):
+            codes   = _codes(strings[start:start + chunk])
+            ids, ok = _gram_ids(codes, n)
+            rows    = np.broadcast_to(np.arange(start, start + len(codes))[:, None], ids.shape)
+            key     = _sorted_unique(ids[ok] * self.n_rows + rows[ok])  # one per (gram, row)
+            keys.append(key)
+            counts[start:start + len(codes)] = np.bincount(
+                key % self.n_rows - start, minlength=len(codes))
+        key = np.concatenate(keys) if keys else np.empty(0, dtype=np.int64)
+        key.sort()
+        grams          = key // self.n_rows
+        self.rows      = (key % self.n_rows).astype(np.int32)   # sorted within each gram
+        self.indptr    = np.searchsorted(grams, np.arange(_K ** n + 1))
+        self.gram_count = counts                                 # distinct grams per row
+
+    def get(self, gram_id):
+        return self.rows[self.indptr[gram_id]: self.indptr[gram_id + 1]]
+
+
+# ───────────────────────────────────────────────────────────
+# Search index
+# ───────────────────────────────────────────────────────────
+class NameSearchIndex:
+    def __init__(self, names, fuzzy_min_overlap=0.6, fuzzy_limit=200):
+        self.names    = [normalize(n) for n in names]
+        self.phonetic = [phonetic(n) for n in self.names]
+        self.fuzzy_min_overlap = fuzzy_min_overlap
+        self.fuzzy_limit       = fuzzy_limit
+
+        self.bigrams  = _Postings(self.names, 2)
+        self.trigrams = _Postings(self.names, 3)
+        self.phon_tri = _Postings(self.phonetic, 3)
+
+    def search(self, query: str, rows=None, fuzzy=True) -> np.ndarray:
+        """
+        Row ids whose name matches *query*, restricted to *rows* (sorted ids)
+        if given.  Substring hits keep directory order; fuzzy hits are ranked.
+        """
+        q = normalize(query)
+        if not q:
+            return np.arange(len(self.names)) if rows is None else np.asarray(rows)
+
+        hits = self._substring(q)
+        if rows is not None:
+            hits = np.intersect1d(hits, rows, assume_unique=True)
+        if len(hits) or not fuzzy or len(q) < 3:
+            return hits
+        return self._fuzzy(q, rows)
+
+    # ── strategies ─────────────────────────────────────────
+    def _substring(self, q):
+        if len(q) == 1:                                   # any bigram holding the letter
+            c = int(_codes([q])[0, 1])
+            other = np.arange(1, _K)
+            ids = np.concatenate((c * _K + other, other * _K + c))
+            return _sorted_unique(np.concatenate([self.bigrams.get(i) for i in ids])).astype(np.int64)
+        if len(q) == 2:                                   # a bigram hit is the substring
+            return self.bigrams.get(_inner(self.bigrams, q)[0]).astype(np.int64)
+        return self._intersect(self.trigrams, _inner(self.trigrams, q), q)
+
+    def _intersect(self, postings, ids, q):
+        lists = sorted((postings.get(i) for i in ids), key=len)
+        if not lists:
+            return np.empty(0, dtype=np.int64)
+        cand = lists[0]
+        for other in lists[1:]:
+            if not len(cand):
+                break
+            cand = np.intersect1d(cand, other, assume_unique=True)
+        # n-gram hits are necessary, not sufficient – confirm the substring
+        names = self.names
+        return np.fromiter((r for r in cand if q in names[r]), dtype=np.int64)
+
+    def _fuzzy(self, q, rows):
+        ids = _inner(self.phon_tri, phonetic(q))
+        if not len(ids):
+            return np.empty(0, dtype=np.int64)
+        postings = [self.phon_tri.get(i) for i in ids]
+        shared = np.bincount(np.concatenate(postings), minlength=len(self.names))
+        if rows is not None:
+            mask = np.zeros(len(self.names), dtype=bool)
+            mask[rows] = True
+            shared = shared * mask
+
+        need = max(1, int(np.ceil(self.fuzzy_min_overlap * len(ids))))
+        cand = np.flatnonzero(shared >= need)
+        if not len(cand):
+            return cand
+        # rank: most shared grams first, then the shorter (closer) names
+        dice  = 2.0 * shared[cand] / (len(ids) + self.phon_tri.gram_count[cand])
+        order = np.lexsort((-dice, -shared[cand]))
+        return cand[order][: self.fuzzy_limit]
+
+
+def _sorted_unique(a):
+    a = np.sort(a)
+    return a[np.concatenate(([True], a[1:] != a[:-1]))] if len(a) else a
+
+
+def _inner(postings, q):
+    """Gram ids of *q* without the leading word-start gram (substring semantics)."""
+    codes = _codes([q])[:, 1:]
+    ids, ok = _gram_ids(codes, postings.n)
+    return _sorted_unique(ids[ok])
+
+
+# ───────────────────────────────────────────────────────────
+# Benchmark
+# ───────────────────────────────────────────────────────────
+def _synthetic_names(n, seed=0):
+    first = ["Mohammad", "Abdur", "Shahidul", "Rezaul", "Farhana", "Nusrat", "Tahmina",
+             "Kamrul", "Sharmin", "Mahbub", "Anisur", "Rokeya", "Jahangir", "Nazmul",
+             "Sabrina", "Tanvir", "Ferdousi", "Habibur", "Mizanur", "Shirin"]
+    last  = ["Rahman", "Hossain", "Islam", "Ahmed", "Siddique", "Mia", "Chowdhury",
+             "Khan", "Begum", "Akter", "Uddin", "Sarker", "Talukder", "Bhuiyan", "Haque"]
+    rng = np.random.default_rng(seed)
+    f = rng.integers(len(first), size=n)
+    m = rng.integers(len(first), size=n)
+    l = rng.integers(len(last), size=n)
+    return [f"Dr. {first[a]} {first[b]} {last[c]}" for a, b, c in zip(f, m, l)]
+
+
+def benchmark(sizes=(10_000, 100_000, 1_000_000), repeats=20):
+    queries = {"1 letter": "r", "prefix": "ra", "substring": "rahm",
+               "full name": "shahidul islam", "typo": "rahmn hosain",
+               "variant": "muhammed kamrul"}
+    print(f"{'providers':>10}  {'build s':>8}  " + "  ".join(f"{k:>11}" for k in queries))
+    for n in sizes:
+        names = _synthetic_names(n)
+        t0 = time.perf_counter()
+        index = NameSearchIndex(names)
+        build = time.perf_counter() - t0
+        cells = []
+        for q in queries.values():
+            t0 = time.perf_counter()
+            for _ in range(repeats):
+                index.search(q)
+            cells.append(f"{(time.perf_counter() - t0) / repeats * 1000:>8.2f} ms")
+        print(f"{n:>10,}  {build:>8.2f}  " + "  ".join(cells))
+
+
+if __name__ == "__main__":
+    benchmark(tuple(int(s) for s in sys.argv[1:]) or (10_000, 100_000, 1_000_000))
@@ -0,0 +1,171 @@
+# directory_view.py
+# ------------------------------------------------------------
+# Virtualized doctor-card grid for the Emergency Directory.
+#
+# Instead of one QFrame (+ labels, buttons, avatar) per matching row, the
+# cards are painted by a delegate inside a QListView in icon mode.  The view
+# only asks the delegate to paint the cards that are on screen, so changing
+# the filter costs one model reset no matter how many doctors match, and
+# scrolling re-uses the same painter for every visible slot.
+
+import numpy as np
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QAbstractItemView
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter, QPen
+from PyQt5.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, pyqtSignal
+)
+
+CARD_W, CARD_H = 340, 340
+CARD_MARGIN    = 10
+CARD_FIELDS    = ("Provider", "Post", "ContactNo", "Department", "Address")
+
+
+# ───────────────────────────────────────────────────────────
+# Model
+# ───────────────────────────────────────────────────────────
+class DoctorListModel(QAbstractListModel):
+    """Exposes the currently filtered row ids of the directory DataFrame."""
+
+    def __init__(self, df, parent=None):
+        super().__init__(parent)
+        # plain column arrays: O(1) lookups, no per-row Series objects
+        self._cols = {f: df[f].to_numpy(dtype=object) for f in CARD_FIELDS}
+        self._rows = np.empty(0, dtype=np.int64)
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = np.asarray(rows, dtype=np.int64)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        r = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            return self._cols["Provider"][r]
+        if role == Qt.UserRole:
+            return {f: self._cols[f][r] for f in CARD_FIELDS}
+        return None
+
+
+# ───────────────────────────────────────────────────────────
+# Card painter
+# ───────────────────────────────────────────────────────────
+class DoctorCardDelegate(QStyledItemDelegate):
+    copy_requested = pyqtSignal(str)     # phone number
+    map_requested  = pyqtSignal(str)     # hospital address
+
+    def __init__(self, avatar_provider, parent=None):
+        super().__init__(parent)
+        self.avatar_provider = avatar_provider          # name → 80×80 QPixmap
+        self.name_font   = QFont("Segoe UI", 13, QFont.Bold)
+        self.text_font   = QFont("Segoe UI", 11)
+        self.button_font = QFont("Segoe UI", 10)
+
+    def sizeHint(self, option, index):
+        return QSize(CARD_W, CARD_H)
+
+    @staticmethod
+    def _card_rect(cell: QRect) -> QRect:
+        return cell.adjusted(CARD_MARGIN, CARD_MARGIN, -CARD_MARGIN, -CARD_MARGIN)
+
+    def _button_rects(self, cell: QRect):
+        card = self._card_rect(cell)
+        w, h, gap = 140, 34, 12
+        top  = card.bottom() - 18 - h
+        left = card.center().x() - w - gap // 2
+        return QRect(left, top, w, h), QRect(left + w + gap, top, w, h)
+
+    def paint(self, painter, option, index):
+        rec  = index.data(Qt.UserRole)
+        card = self._card_rect(option.rect)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # card background
+        painter.setPen(QPen(QColor("#cccccc"), 2))
+        painter.setBrush(QColor("#ffffff"))
+        painter.drawRoundedRect(card, 18, 18)
+
+        # avatar with white circle background
+        avatar = QRect(card.center().x() - 45, card.top() + 18, 90, 90)
+        painter.setPen(QPen(QColor("#1d3557"), 2))
+        painter.drawEllipse(avatar)
+        pix = self.avatar_provider(rec["Provider"])
+        painter.drawPixmap(avatar.center().x() - pix.width() // 2 + 1,
+                           avatar.center().y() - pix.height() // 2 + 1, pix)
+
+        # text fields
+        y = avatar.bottom() + 12
+        for text, font, color in (
+            (rec["Provider"],          self.name_font, "#1d3557"),
+            (rec["Post"],              self.text_font, "#444444"),
+            (f"📞 {rec['ContactNo']}", self.text_font, "#222222"),
+            (f"🏥 {rec['Department']}", self.text_font, "#1d3557"),
+        ):
+            metrics = QFontMetrics(font)
+            line = QRect(card.left() + 12, y, card.width() - 24, metrics.height() + 6)
+            painter.setFont(font)
+            painter.setPen(QColor(color))
+            painter.drawText(line, Qt.AlignCenter,
+                             metrics.elidedText(str(text), Qt.ElideRight, line.width()))
+            y = line.bottom() + 4
+
+        # buttons
+        copy_rect, map_rect = self._button_rects(option.rect)
+        painter.setFont(self.button_font)
+        for rect, label, color in ((copy_rect, "📋 Copy Number", "#e63946"),
+                                   (map_rect,  "📍 View Map",   "#457b9d")):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(color))
+            painter.drawRoundedRect(rect, 10, 10)
+            painter.setPen(QColor("#ffffff"))
+            painter.drawText(rect, Qt.AlignCenter, label)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            rec = index.data(Qt.UserRole)
+            copy_rect, map_rect = self._button_rects(option.rect)
+            if copy_rect.contains(event.pos()):
+                self.copy_requested.emit(rec["ContactNo"])
+                return True
+            if map_rect.contains(event.pos()):
+                self.map_requested.emit(rec["Address"])
+                return True
+        return super().editorEvent(event, model, option, index)
+
+
+# ───────────────────────────────────────────────────────────
+# View
+# ───────────────────────────────────────────────────────────
+class DoctorCardView(QListView):
+    def __init__(self, df, avatar_provider, parent=None):
+        super().__init__(parent)
+        self.card_model    = DoctorListModel(df, self)
+        self.card_delegate = DoctorCardDelegate(avatar_provider, self)
+        self.setModel(self.card_model)
+        self.setItemDelegate(self.card_delegate)
+
+        self.setViewMode(QListView.IconMode)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)             # no per-row size queries
+        self.setGridSize(QSize(CARD_W, CARD_H))
+        self.setSpacing(0)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(24)
+        self.setMouseTracking(True)
+        self.setStyleSheet("QListView { border:none; background: transparent; }")
+
+    def set_rows(self, rows):
+        self.card_model.set_rows(rows)
+        self.scrollToTop()
@@ -4,10 +4,9 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtGui import QPixmap, QFont, QCursor
 from PyQt5.QtCore import Qt
+import warmup
 
 # ✅ Your other pages
-from first_aid_chatbot import ChatbotUI
-from emergency_directory import EmergencyDirectoryPage   # <‑‑ NEW IMPORT
 
 
 class EmergencyAssistanceWindow(QWidget):
@@ -119,7 +118,13 @@ class EmergencyAssistanceWindow(QWidget):
     #  Open auxiliary windows                                            #
     # ------------------------------------------------------------------ #
     def open_chatbot(self):
+        # the chatbot model may still be loading in the background; show the
+        # window once it is there instead of loading it a second time
+        warmup.get_scheduler().when_ready("chatbot", self._show_chatbot)
+
+    def _show_chatbot(self):
         if self.chatbot_window is None:
+            from first_aid_chatbot import ChatbotUI        # loads TensorFlow on first use
             self.chatbot_window = ChatbotUI()
         self.chatbot_window.show()
         self.chatbot_window.raise_()
@@ -127,6 +132,7 @@ class EmergencyAssistanceWindow(QWidget):
 
     def open_directory(self):
         if self.directory_window is None:
+            from emergency_directory import EmergencyDirectoryPage
             self.directory_window = EmergencyDirectoryPage("bangladesh_doctors.csv")
         self.directory_window.show()
         self.directory_window.raise_()
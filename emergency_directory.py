@@ -1,16 +1,21 @@
-import sys, random, hashlib, webbrowser, os
+import sys, webbrowser
 from datetime import datetime, time
 import pandas as pd
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QComboBox, QLineEdit, QPushButton,
-    QVBoxLayout, QHBoxLayout, QGridLayout, QScrollArea, QFrame, QMessageBox
+    QVBoxLayout, QHBoxLayout, QMessageBox
 )
-from PyQt5.QtGui import QFont, QIcon, QPixmap, QPainter, QColor, QClipboard
+from PyQt5.QtGui import QFont, QIcon, QPixmap, QClipboard
 from PyQt5.QtCore import Qt, QTimer
 
+from avatar_cache import AvatarCache
+from directory_index import DirectoryIndex
+from directory_search import NameSearchIndex
+from directory_view import DoctorCardView
+
 ACTIVE_START = time(9, 30)
 ACTIVE_END = time(21, 0)
-AVATAR_DIR = "avatars"
+SEARCH_DEBOUNCE_MS = 250
 
 
 class EmergencyDirectoryPage(QWidget):
@@ -34,6 +39,8 @@ class EmergencyDirectoryPage(QWidget):
         self.df["ContactNo"] = self.df["ContactNo"].apply(
             lambda x: "0" + x.lstrip("0") if not x.startswith("0") else x
         )
+        self.index = DirectoryIndex(self.df)     # row-id postings for the filters
+        self.search_index = NameSearchIndex(self.df["Provider"])
 
         # ----  MAIN LAYOUT  --------------------------------------------------
         root = QVBoxLayout(self)
@@ -44,7 +51,7 @@ class EmergencyDirectoryPage(QWidget):
         self._build_scroll_area(root)
 
         # populate cascading combos
-        self._populate_combo(self.division_cb, sorted(self.df["Division"].unique()))
+        self._populate_combo(self.division_cb, self.index.options("Division", {}))
         self._update_districts()
 
     # --------------------------------------------------------------------- #
@@ -86,7 +93,12 @@ class EmergencyDirectoryPage(QWidget):
         # Search box
         self.search_line = QLineEdit()
         self.search_line.setPlaceholderText("🔍  Search doctor name…")
-        self.search_line.textChanged.connect(self._update_cards)
+        # a burst of keystrokes yields one query once typing pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self._update_cards)
+        self.search_line.textChanged.connect(self.search_timer.start)
         self.search_line.setFixedWidth(350)
         layout.addWidget(self.search_line)
 
@@ -152,15 +164,14 @@ class EmergencyDirectoryPage(QWidget):
         return cb
 
     # --------------------------------------------------------------------- #
-    #  SCROLL AREA (Doctor Cards)   lkkk                                        #
+    #  CARD VIEW (Doctor Cards, virtualized)                                #
     # --------------------------------------------------------------------- #
     def _build_scroll_area(self, parent_layout):
-        self.scroll = QScrollArea(); self.scroll.setWidgetResizable(True)
-        self.scroll.setStyleSheet("border:none;")
-        content = QWidget()
-        self.grid = QGridLayout(content); self.grid.setSpacing(20)
-        self.scroll.setWidget(content)
-        parent_layout.addWidget(self.scroll)
+        self.avatars = AvatarCache()             # memory + on-disk avatar cache
+        self.cards = DoctorCardView(self.df, self.avatars.get)
+        self.cards.card_delegate.copy_requested.connect(self._copy_phone)
+        self.cards.card_delegate.map_requested.connect(self._open_map)
+        parent_layout.addWidget(self.cards)
 
     # --------------------------------------------------------------------- #
     #  CASCADING COMBO HELPERS                                              #
@@ -176,6 +187,7 @@ class EmergencyDirectoryPage(QWidget):
         cb.blockSignals(False)
 
     def _reset_filters(self):
+        self.search_timer.stop()
         self.search_line.blockSignals(True); self.search_line.clear()
         self.search_line.blockSignals(False)
         for cb in [self.division_cb, self.district_cb,
@@ -183,149 +195,58 @@ class EmergencyDirectoryPage(QWidget):
             cb.blockSignals(True); cb.setCurrentIndex(0); cb.blockSignals(False)
         self._update_districts()
 
-    def _cascade_df(self, levels):
-        df = self.df
+    def _selection(self, levels):
         mapping = {"Division": self.division_cb, "District": self.district_cb,
                    "Upazila": self.upazila_cb, "Department": self.dept_cb,
                    "Address": self.hospital_cb}
+        selection = {}
         for lvl in levels:
             val = mapping[lvl].currentText()
             if val.startswith("All ") or val.strip() == "":  # skip placeholder
                 continue
-            df = df[df[lvl] == val]
-        return df
+            selection[lvl] = val
+        return selection
 
     def _update_districts(self):
         self._populate_combo(self.district_cb,
-                             sorted(self._cascade_df(["Division"])["District"].unique()))
+                             self.index.options("District", self._selection(["Division"])))
         self._update_upazilas()
 
     def _update_upazilas(self):
         self._populate_combo(self.upazila_cb,
-                             sorted(self._cascade_df(["Division", "District"])["Upazila"].unique()))
+                             self.index.options("Upazila", self._selection(["Division", "District"])))
         self._update_departments()
 
     def _update_departments(self):
         self._populate_combo(self.dept_cb,
-                             sorted(self._cascade_df(["Division", "District",
-                                                      "Upazila"])["Department"].unique()))
+                             self.index.options("Department", self._selection(["Division", "District",
+                                                                               "Upazila"])))
         self._update_hospitals()
 
     def _update_hospitals(self):
         self._populate_combo(self.hospital_cb,
-                             sorted(self._cascade_df(["Division", "District",
-                                                      "Upazila", "Department"])["Address"].unique()))
+                             self.index.options("Address", self._selection(["Division", "District",
+                                                                            "Upazila", "Department"])))
         self._update_cards()
 
     # --------------------------------------------------------------------- #
     #  CARD GRID UPDATE                                                     #
     # --------------------------------------------------------------------- #
     def _update_cards(self):
-        df = self._cascade_df(
+        rows = self.index.rows(self._selection(
             ["Division", "District", "Upazila", "Department", "Address"]
-        )
+        ))
         # Friday off
         if datetime.today().weekday() == 4:
-            df = df.iloc[0:0]
+            rows = rows[:0]
 
-        term = self.search_line.text().strip().lower()
+        term = self.search_line.text().strip()
         if term:
-            df = df[df["Provider"].str.lower().str.contains(term)]
-
-        df = df.reset_index(drop=True)
-
-        # Clear previous widgets
-        while self.grid.count():
-            child = self.grid.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        cols = 3 if len(df) >= 3 else max(len(df), 1)
-        for idx, row in df.iterrows():
-            card = self._make_card(row)
-            r, c = divmod(idx, cols)
-            self.grid.addWidget(card, r, c)
-
-    # --------------------------------------------------------------------- #
-    #  SINGLE CARD CREATION                                                 #
-    # --------------------------------------------------------------------- #
-    def _make_card(self, row):
-        frame = QFrame(); frame.setObjectName("card")
-        frame.setStyleSheet("""
-            QFrame#card {
-                background: #ffffff;
-                border-radius: 18px;
-                padding: 18px;
-                border: 2px solid #cccccc;
-            }
-        """)
-        v = QVBoxLayout(frame); v.setSpacing(12)
-
-        # -- Avatar with white circle background
-        avatar_container = QLabel()
-        avatar_container.setFixedSize(90, 90)
-        avatar_container.setStyleSheet("""
-            background:#ffffff; border-radius:45px;
-            border:2px solid #1d3557;
-        """)
-        avatar_container.setAlignment(Qt.AlignCenter)
-
-        avatar_path = os.path.join(
-            AVATAR_DIR, f"{row['Provider'].replace(' ', '_').lower()}.png"
-        )
-        if os.path.exists(avatar_path):
-            pix = QPixmap(avatar_path).scaled(
-                80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        else:
-            pix = self._create_avatar(row["Provider"]).scaled(
-                80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        avatar_container.setPixmap(pix)
-        v.addWidget(avatar_container, alignment=Qt.AlignCenter)
-
-        # -- Text fields (each on white background)
-        def make_label(text, bold=False, color="#1d3557"):
-            lab = QLabel(text)
-            lab.setFont(QFont("Segoe UI", 13 if bold else 11,
-                              QFont.Bold if bold else QFont.Normal))
-            lab.setAlignment(Qt.AlignCenter)
-            lab.setStyleSheet(f"""
-                background:#ffffff; color:{color};
-                padding:4px; border-radius:6px;
-            """)
-            return lab
-
-        v.addWidget(make_label(row["Provider"], bold=True))
-        v.addWidget(make_label(row["Post"], color="#444444"))
-        v.addWidget(make_label(f"📞 {row['ContactNo']}", color="#222222"))
-        v.addWidget(make_label(f"🏥 {row['Department']}"))
-
-        # -- Buttons
-        buttons = QHBoxLayout()
-        copy_btn = QPushButton("📋 Copy Number")
-        copy_btn.setStyleSheet("""
-            background:#e63946; color:white;
-            padding:6px 14px; border-radius:10px;
-        """)
-        copy_btn.clicked.connect(
-            lambda _, p=row["ContactNo"]: self._copy_phone(p))
-
-        map_btn = QPushButton("📍 View Map")
-        map_btn.setStyleSheet("""
-            background:#457b9d; color:white;
-            padding:6px 14px; border-radius:10px;
-        """)
-        map_btn.clicked.connect(
-            lambda _, l=row["Address"]:
-            webbrowser.open(f"https://www.google.com/maps/search/{l.replace(' ', '+')}", new=2)
-        )
-
-        buttons.addStretch()
-        buttons.addWidget(copy_btn)
-        buttons.addWidget(map_btn)
-        buttons.addStretch()
-        v.addLayout(buttons)
+            # substring match, falling back to typo/transliteration-tolerant hits
+            rows = self.search_index.search(term, rows)
 
-        return frame
+        # the view only paints the cards that are on screen
+        self.cards.set_rows(rows)
 
     # ------------------------------------------------------------------ #
     #  UTILITIES                                                          #
@@ -334,22 +255,8 @@ class EmergencyDirectoryPage(QWidget):
         QApplication.clipboard().setText(phone, mode=QClipboard.Clipboard)
         QMessageBox.information(self, "Copied", f"{phone} copied to clipboard!")
 
-    def _create_avatar(self, name, size=96):
-        initials = "".join([p[0] for p in name.split()[:2]]).upper() or "?"
-        h = int(hashlib.sha256(name.encode()).hexdigest(), 16)
-        random.seed(h)
-        r, g, b = [int(130 + random.random() * 100) for _ in range(3)]
-
-        pix = QPixmap(size, size); pix.fill(Qt.transparent)
-        painter = QPainter(pix)
-        painter.setRenderHints(QPainter.Antialiasing)
-        painter.setBrush(QColor(r, g, b)); painter.setPen(Qt.NoPen)
-        painter.drawEllipse(0, 0, size, size)
-        painter.setPen(QColor("#ffffff"))
-        painter.setFont(QFont("Segoe UI", int(size/3), QFont.Bold))
-        painter.drawText(pix.rect(), Qt.AlignCenter, initials)
-        painter.end()
-        return pix
+    def _open_map(self, address):
+        webbrowser.open(f"https://www.google.com/maps/search/{address.replace(' ', '+')}", new=2)
 
     # clock helpers
     def _update_clock(self):
@@ -3,51 +3,85 @@ import os
 import json
 import pickle
 import random
-import traceback
+import threading
 import numpy as np
+from types import SimpleNamespace
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLabel, QLineEdit,
     QPushButton, QScrollArea, QFrame, QHBoxLayout, QSpacerItem, QSizePolicy
 )
 from PyQt5.QtGui import QPixmap, QFont, QColor, QPalette, QPainter, QBrush
 from PyQt5.QtCore import Qt
-from tensorflow.keras.models import load_model
-from nltk.stem import WordNetLemmatizer
-from nltk.tokenize import TreebankWordTokenizer
+from bow_encoder import BowEncoder
+import task_runner
 
 # === Load resources ===
-lemmatizer = WordNetLemmatizer()
-tokenizer = TreebankWordTokenizer()
-
-model = load_model("chatbot_model.h5")
-intents = json.load(open("intents.json", encoding="utf-8"))
-words = pickle.load(open("words.pkl", "rb"))
-classes = pickle.load(open("classes.pkl", "rb"))
+# TensorFlow, NLTK and the artifacts are loaded on first use, not at import,
+# so importing this module (e.g. from the dashboard) stays cheap.
+_lock = threading.Lock()
+_text_tools = None
+_resources = None
+
+def text_tools():
+    global _text_tools
+    if _text_tools is None:
+        with _lock:
+            if _text_tools is None:
+                from nltk.stem import WordNetLemmatizer
+                from nltk.tokenize import TreebankWordTokenizer
+                _text_tools = (TreebankWordTokenizer(), WordNetLemmatizer())
+    return _text_tools
+
+def load_resources():
+    """Model, inference backend, intents and vocabulary – loaded once, thread-safe."""
+    global _resources
+    if _resources is None:
+        text_tools()
+        with _lock:
+            if _resources is None:
+                from chatbot_inference import load_backend
+
+                # NumPy forward pass unless BAYMAX_CHATBOT_BACKEND says otherwise;
+                # with tflite only the interpreter is loaded and model is None
+                model, backend = load_backend("chatbot_model.h5")
+                words = pickle.load(open("words.pkl", "rb"))
+                _resources = SimpleNamespace(
+                    model=model,
+                    backend=backend,
+                    intents=json.load(open("intents.json", encoding="utf-8")),
+                    words=words,
+                    classes=pickle.load(open("classes.pkl", "rb")),
+                    # word → column lookup built once for the words.pkl vocabulary
+                    encoder=BowEncoder(words, tokenize=clean_up_sentence),
+                )
+    return _resources
 
 # === Preprocessing ===
 def clean_up_sentence(sentence):
+    tokenizer, lemmatizer = text_tools()
     sentence_words = tokenizer.tokenize(sentence)
     sentence_words = [lemmatizer.lemmatize(w.lower()) for w in sentence_words if w.isalpha()]
     return sentence_words
 
 def bow(sentence, words):
-    sentence_words = clean_up_sentence(sentence)
-    bag = [1 if w in sentence_words else 0 for w in words]
-    return np.array(bag)
+    encoder = load_resources().encoder
+    if words is encoder.words:
+        return encoder.encode(sentence)
+    return BowEncoder(words, tokenize=clean_up_sentence).encode(sentence)
 
 def predict_class(sentence):
-    input_data = bow(sentence, words)
-    input_data = np.array([input_data])
-    res = model.predict(input_data, verbose=0)[0]
+    res = load_resources()
+    input_data = res.encoder.encode(sentence)[np.newaxis, :]
+    probs = res.backend.predict(input_data)[0]
 
     ERROR_THRESHOLD = 0.3
-    results = [(i, r) for i, r in enumerate(res) if r > ERROR_THRESHOLD]
+    results = [(i, r) for i, r in enumerate(probs) if r > ERROR_THRESHOLD]
     results.sort(key=lambda x: x[1], reverse=True)
 
     if not results:
         return []
 
-    predicted = [{"intent": classes[r[0]], "probability": str(r[1])} for r in results]
+    predicted = [{"intent": res.classes[r[0]], "probability": str(r[1])} for r in results]
     return predicted
 
 def get_response(ints, intents_json):
@@ -59,6 +93,9 @@ def get_response(ints, intents_json):
             return random.choice(intent['responses'])
     return "Hmm... I don't have an answer for that."
 
+def reply_to(sentence):
+    return get_response(predict_class(sentence), load_resources().intents)
+
 # === Chat UI ===
 class ChatbotUI(QWidget):
     def __init__(self):
@@ -66,6 +103,7 @@ class ChatbotUI(QWidget):
         self.setWindowTitle("Baymax First Aid Chatbot")
         self.setGeometry(200, 100, 600, 700)
         self.setStyleSheet("background-color: white;")
+        load_resources()
         self.setup_ui()
 
     def setup_ui(self):
@@ -143,20 +181,25 @@ class ChatbotUI(QWidget):
         )
 
     def chat(self):
-        try:
-            user_input = self.input_box.text().strip()
-            self.input_box.clear()
-            if not user_input:
-                return
-
-            self.add_message(user_input, is_user=True)
-            predictions = predict_class(user_input)
-            response = get_response(predictions, intents)
-            self.add_message(response, is_user=False)
-
-        except Exception:
-            self.add_message("Sorry, something went wrong. 😓", is_user=False)
-            print("Chatbot Error:\n", traceback.format_exc())
+        user_input = self.input_box.text().strip()
+        self.input_box.clear()
+        if not user_input:
+            return
+
+        self.add_message(user_input, is_user=True)
+        # tokenizing + inference run on the task pool, the reply comes back here
+        task_runner.get_runner().submit(
+            reply_to, user_input,
+            on_result=lambda response: self.add_message(response, is_user=False),
+            on_error=self._chat_failed, owner=self, name="chatbot.reply")
+
+    def _chat_failed(self, e):
+        self.add_message("Sorry, something went wrong. 😓", is_user=False)
+        print("Chatbot Error:", e)                     # traceback printed by the task runner
+
+    def closeEvent(self, event):
+        task_runner.get_runner().cancel_owner(self)
+        super().closeEvent(event)
 
 # === Main ===
 if __name__ == "__main__":
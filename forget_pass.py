@@ -1,5 +1,6 @@
 import sys
 import mysql.connector
+import db_utils
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QPushButton, QVBoxLayout, QMessageBox, QHBoxLayout, QFrame
 )
@@ -71,12 +72,7 @@ class ForgotPasswordWindow(QWidget):
             return
 
         try:
-            conn = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password="",
-                database="baymax"
-            )
+            conn = db_utils.get_connection()
             cursor = conn.cursor()
 
             # Check if user exists
@@ -4,15 +4,15 @@
 # Author: Your‑Name‑Here
 # Requires: PyQt5, pandas, joblib
 
-import sys, os, joblib
-import numpy as np
-import pandas as pd
+import sys, os
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QVBoxLayout, QHBoxLayout,
     QPushButton, QRadioButton, QButtonGroup, QFormLayout, QMessageBox, QComboBox
 )
 from PyQt5.QtGui import QFont, QPixmap
 from PyQt5.QtCore import Qt
+import task_runner
+import scoring
 
 
 class HeartDiseasePredictionPage(QWidget):
@@ -181,20 +181,17 @@ class HeartDiseasePredictionPage(QWidget):
     # ───────────────────────────────────────────────────────────
     def load_model(self):
         try:
-            folder = os.path.dirname(os.path.abspath(__file__))
-            bundle = joblib.load(os.path.join(folder, "heart_disease_model.joblib"))
-            self.model     = bundle["model"]
-            self.columns   = bundle["features"]        # original column order
+            self.scorer = scoring.get_scorer("heart")   # shared, loaded once
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load model:\n{e}")
-            self.model = None
+            self.scorer = None
 
     # ───────────────────────────────────────────────────────────
     # Prediction
     # ───────────────────────────────────────────────────────────
     def predict(self):
         try:
-            if self.model is None:
+            if self.scorer is None:
                 raise RuntimeError("Model not loaded.")
 
             # Collect inputs
@@ -214,23 +211,40 @@ class HeartDiseasePredictionPage(QWidget):
                 "thal":       self.thal_combo.currentIndex()
             }
 
-            # Build DataFrame in original training column order
-            X = pd.DataFrame([[row[c] for c in self.columns]], columns=self.columns)
-
-            pred = int(self.model.predict(X)[0])
-            prob = self.model.predict_proba(X)[0, 1]
-
-            if pred == 1:
-                msg = f"⚠️ High risk of Heart Disease (probability {prob:.2%})"
-            else:
-                msg = f"✅ Low risk of Heart Disease (probability {prob:.2%})"
-
-            QMessageBox.information(self, "Prediction Result", msg)
-
         except ValueError as ve:
             QMessageBox.warning(self, "Input Error", f"Check your inputs:\n{ve}")
+            return
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Something went wrong:\n{e}")
+            return
+
+        # inference runs on the task pool, the result comes back in _show_result
+        task_runner.get_runner().submit(
+            self._run_prediction, self.scorer, row,
+            on_result=self._show_result, on_error=self._show_error,
+            owner=self, name="heart.predict")
+
+    @staticmethod
+    def _run_prediction(scorer, row):
+        # the scorer writes row into its preallocated array in training column order
+        result = scorer.score(row)
+        return result.code, result.proba[-1]            # P(heart disease)
+
+    def _show_result(self, result):
+        pred, prob = result
+        if pred == 1:
+            msg = f"⚠️ High risk of Heart Disease (probability {prob:.2%})"
+        else:
+            msg = f"✅ Low risk of Heart Disease (probability {prob:.2%})"
+
+        QMessageBox.information(self, "Prediction Result", msg)
+
+    def _show_error(self, e):
+        QMessageBox.critical(self, "Error", f"Something went wrong:\n{e}")
+
+    def closeEvent(self, event):
+        task_runner.get_runner().cancel_owner(self)
+        super().closeEvent(event)
 
 
 # ─────────────────────────────────────────────────────────────
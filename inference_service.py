@@ -0,0 +1,291 @@
+"""
+Local HTTP inference service for the tabular Baymax models.
+
+USAGE
+=====
+python inference_service.py --port 8765 --max-batch 64 --max-wait-ms 5
+
+    POST /predict/<diabetes|heart|liver|bmi>
+         body: one JSON object of features, or a list of them
+         → {"results": [{"prediction", "label", "confidence", "probabilities"}]}
+    GET  /stats      latency p50/p99, batch-size histogram and memo-cache
+                     hit rate per model
+    GET  /health
+
+Feature names and codes are the ones in model_specs.py (identical to the
+PyQt pages).  Concurrent requests for the same model are coalesced into one
+micro-batch and scored with a single predict_proba call; a batch is cut at
+--max-batch rows or --max-wait-ms after its first request, whichever is first.
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from model_specs import SPECS
+import prediction_cache
+from score import score_matrix
+from scoring import decide, threshold
+
+MAX_BODY = 1 << 20
+
+
+# ───────────────────────────────────────────────────────────
+# Metrics
+# ───────────────────────────────────────────────────────────
+class LatencyStats:
+    BATCH_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256]
+
+    def __init__(self, window=10_000):
+        self.latencies = deque(maxlen=window)       # seconds, most recent requests
+        self.batches   = [0] * (len(self.BATCH_BUCKETS) + 1)
+        self.requests  = 0
+        self.rows      = 0
+        self.errors    = 0
+
+    def record_latency(self, seconds):
+        self.latencies.append(seconds)
+        self.requests += 1
+
+    def record_batch(self, size):
+        self.batches[bisect.bisect_left(self.BATCH_BUCKETS, size)] += 1
+        self.rows += size
+
+    def snapshot(self):
+        lat = np.fromiter(self.latencies, dtype=np.float64)
+        pct = (lambda q: round(float(np.percentile(lat, q)) * 1000, 3)) if lat.size else (lambda q: None)
+        labels = [f"<={b}" for b in self.BATCH_BUCKETS] + [f">{self.BATCH_BUCKETS[-1]}"]
+        n_batches = sum(self.batches)
+        return {
+            "requests": self.requests, "rows": self.rows, "errors": self.errors,
+            "latency_ms": {"p50": pct(50), "p90": pct(90), "p99": pct(99),
+                           "mean": round(float(lat.mean()) * 1000, 3) if lat.size else None},
+            "batches": n_batches,
+            "mean_batch_size": round(self.rows / n_batches, 2) if n_batches else None,
+            "batch_size_histogram": dict(zip(labels, self.batches)),
+        }
+
+
+# ───────────────────────────────────────────────────────────
+# Micro-batching
+# ───────────────────────────────────────────────────────────
+class MicroBatcher:
+    def __init__(self, spec, executor, max_batch=64, max_wait=0.005):
+        self.spec      = spec
+        self.executor  = executor
+        self.max_batch = max_batch
+        self.max_wait  = max_wait
+        self.stats     = LatencyStats()
+        self.queue     = asyncio.Queue()
+        self.task      = None
+
+    def start(self):
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, rows):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((rows, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            n_rows, deadline = len(batch[0][0]), loop.time() + self.max_wait
+            while n_rows < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                n_rows += len(item[0])
+
+            rows = [row for item, _ in batch for row in item]
+            try:
+                results = await loop.run_in_executor(self.executor, self._score, rows)
+            except Exception as e:                  # model missing, bad artifact …
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.stats.record_batch(len(rows))
+
+            offset = 0
+            for item, future in batch:
+                if not future.done():
+                    future.set_result(results[offset:offset + len(item)])
+                offset += len(item)
+
+    def _score(self, rows):
+        """Runs in the executor: one matrix + one predict_proba for the whole batch."""
+        version = self.spec.version()               # before load: a newer file never gets an old key
+        model, features = self.spec.load()          # registry hit unless the file changed
+        df = pd.DataFrame(rows)
+        for f in features:                          # absent everywhere → per-row error below
+            if self.spec.source_column(f, df.columns) is None:
+                df[f] = np.nan
+        X, valid = self.spec.frame_to_matrix(df, features)
+
+        results = [{"error": "invalid or missing value(s) for "
+                             f"{[f for f, v in zip(features, x) if np.isnan(v)]}"}
+                   if not ok else None for x, ok in zip(X, valid)]
+        if valid.any():
+            thresh = threshold(self.spec.name)
+            if hasattr(model, "predict_proba"):
+                # repeated rows come from the memo; the rest go through one predict_proba
+                proba = prediction_cache.get_cache().predict_proba(
+                    self.spec.name, version, X[valid],
+                    lambda Xm: model.predict_proba(self.spec.model_input(model, Xm, features)))
+                cols  = decide(proba, thresh)
+                codes = np.asarray(model.classes_)[cols]
+            else:
+                codes, proba = score_matrix(model, self.spec.model_input(model, X[valid], features),
+                                            thresh)
+            classes = [c.item() if hasattr(c, "item") else c for c in model.classes_]
+            for i, k in enumerate(np.flatnonzero(valid)):
+                result = {"prediction": codes[i].item(), "label": self.spec.label(codes[i])}
+                if proba is not None:
+                    result["confidence"] = float(proba[i, cols[i]])
+                    result["probabilities"] = dict(zip(map(str, classes), proba[i].tolist()))
+                results[k] = result
+        return results
+
+
+# ───────────────────────────────────────────────────────────
+# HTTP
+# ───────────────────────────────────────────────────────────
+class InferenceServer:
+    def __init__(self, max_batch=64, max_wait=0.005):
+        self.executor = ThreadPoolExecutor(max_workers=len(SPECS),
+                                           thread_name_prefix="baymax-infer")
+        self.batchers = {name: MicroBatcher(spec, self.executor, max_batch, max_wait)
+                         for name, spec in SPECS.items()}
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        for batcher in self.batchers.values():
+            batcher.start()
+        server = await asyncio.start_server(self._handle, host, port)
+        print(f"Baymax inference service on http://{host}:{port}  "
+              f"(models: {', '.join(sorted(self.batchers))})")
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                status, payload = await self._route(method, path, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                self._respond(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as e:                     # malformed HTTP
+            self._respond(writer, 400, {"error": str(e)}, keep_alive=False)
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_request(reader):
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, path, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise ValueError("Malformed request line") from None
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length") or 0)
+        if length > MAX_BODY:
+            raise ValueError("Request body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), path.split("?", 1)[0], headers, body
+
+    async def _route(self, method, path, body):
+        if method == "GET" and path == "/health":
+            return 200, {"status": "ok"}
+        if method == "GET" and path == "/stats":
+            cache = prediction_cache.stats()
+            return 200, {name: {**b.stats.snapshot(), "cache": cache.get(name)}
+                         for name, b in self.batchers.items()}
+
+        parts = path.strip("/").split("/")
+        if len(parts) != 2 or parts[0] != "predict":
+            return 404, {"error": f"Unknown endpoint {path}"}
+        batcher = self.batchers.get(parts[1])
+        if batcher is None:
+            return 404, {"error": f"Unknown model {parts[1]!r}", "models": sorted(self.batchers)}
+        if method != "POST":
+            return 405, {"error": "Use POST"}
+
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError:
+            return 400, {"error": "Body is not valid JSON"}
+        rows = payload if isinstance(payload, list) else [payload]
+        if not rows or not all(isinstance(r, dict) for r in rows):
+            return 400, {"error": "Expected a JSON object or a list of objects"}
+
+        start = time.perf_counter()
+        try:
+            results = await batcher.submit(rows)
+        except Exception as e:
+            batcher.stats.errors += 1
+            return 500, {"error": str(e)}
+        batcher.stats.record_latency(time.perf_counter() - start)
+        return 200, {"results": results}
+
+    @staticmethod
+    def _respond(writer, status, payload, keep_alive=True):
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found",
+                  405: "Method Not Allowed", 500: "Internal Server Error"}.get(status, "")
+        body = json.dumps(payload).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Baymax tabular models over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-batch", type=int, default=64, help="rows per micro-batch")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0,
+                        help="how long the first request of a batch waits for company")
+    args = parser.parse_args(argv)
+
+    server = InferenceServer(args.max_batch, args.max_wait_ms / 1000.0)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
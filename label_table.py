@@ -0,0 +1,111 @@
+# label_table.py
+# ------------------------------------------------------------
+# Class index → (MEDICINE_NAME, GENERIC_NAME) table for the prescription
+# model, cached as a small JSON file next to the model.
+#
+# The classes are the sorted unique MEDICINE_NAMEs of training_labels.csv
+# after dropna() – exactly what build_label_encoder()'s LabelEncoder
+# produced – so indices line up with the model's outputs.  The artifact
+# records the CSV's size, mtime and sha256:
+#
+#   size + mtime unchanged  → use the artifact as is (no read of the CSV)
+#   stat changed, same hash → use it, refresh the recorded stat
+#   hash changed            → rebuild from the CSV and rewrite the artifact
+#   CSV missing             → use the artifact (deployments may ship only it)
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+FORMAT_VERSION = 1
+
+
+class LabelTable:
+    """Drop-in for the fitted LabelEncoder (classes_, inverse_transform) + generic names."""
+
+    def __init__(self, medicines, generics):
+        self.classes_ = np.asarray(medicines, dtype=object)
+        self.generics = np.asarray(generics, dtype=object)
+
+    def __len__(self):
+        return len(self.classes_)
+
+    def inverse_transform(self, idx):
+        return self.classes_[np.asarray(idx, dtype=np.intp)]
+
+    def generic_names(self, idx):
+        return self.generics[np.asarray(idx, dtype=np.intp)]
+
+
+def artifact_path_for(model_path: str) -> str:
+    return os.path.splitext(model_path)[0] + ".labels.json"
+
+
+def _sha256(path, chunk=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _source_stat(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def build_label_table(csv_path: str) -> LabelTable:
+    import pandas as pd
+    df = pd.read_csv(csv_path)
+    df.dropna(inplace=True)
+    medicines = np.unique(df["MEDICINE_NAME"])          # LabelEncoder's class order
+    # most frequent generic name per medicine (they agree in practice)
+    generic = df.groupby("MEDICINE_NAME")["GENERIC_NAME"].agg(lambda s: s.mode().iat[0])
+    return LabelTable(medicines, generic.reindex(medicines).fillna("").to_numpy())
+
+
+def _write(artifact, table, source):
+    payload = {"format": FORMAT_VERSION, "source": source,
+               "medicine": [str(m) for m in table.classes_],
+               "generic":  [str(g) for g in table.generics]}
+    tmp = artifact + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, artifact)
+
+
+def load_label_table(csv_path: str, artifact: str) -> LabelTable:
+    cached = None
+    try:
+        with open(artifact, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("format") != FORMAT_VERSION:
+            cached = None
+    except (OSError, ValueError):
+        pass
+
+    if not os.path.exists(csv_path):
+        if cached is None:
+            raise FileNotFoundError(f"Neither {csv_path} nor {artifact} exists")
+        return LabelTable(cached["medicine"], cached["generic"])
+
+    stat = _source_stat(csv_path)
+    if cached is not None:
+        source = cached.get("source", {})
+        if all(source.get(k) == v for k, v in stat.items()):
+            return LabelTable(cached["medicine"], cached["generic"])
+        digest = _sha256(csv_path)
+        table  = (LabelTable(cached["medicine"], cached["generic"])
+                  if source.get("sha256") == digest else None)
+    else:
+        digest, table = _sha256(csv_path), None
+
+    if table is None:
+        table = build_label_table(csv_path)
+    try:
+        _write(artifact, table, {**stat, "sha256": digest})
+    except OSError:
+        pass                                  # read-only install: still usable
+    return table
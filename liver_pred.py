@@ -1,13 +1,13 @@
 import sys
 import os
-import numpy as np
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QVBoxLayout, QHBoxLayout,
     QPushButton, QRadioButton, QButtonGroup, QFormLayout, QMessageBox, QComboBox
 )
 from PyQt5.QtGui import QFont, QPixmap
 from PyQt5.QtCore import Qt
-import joblib
+import task_runner
+import scoring
 
 
 class LiverDiseasePredictionPage(QWidget):
@@ -161,19 +161,17 @@ class LiverDiseasePredictionPage(QWidget):
     # ───────────────────────────────────────────────────────────
     def load_model(self):
         try:
-            folder = os.path.dirname(os.path.abspath(__file__))
-            model_path = os.path.join(folder, "liver_disease_model.joblib")
-            self.model = joblib.load(model_path, mmap_mode=None)
+            self.scorer = scoring.get_scorer("liver")       # shared, loaded once
         except Exception as e:
             QMessageBox.critical(self, "Error", f"⚠️ Failed to load model:\n{str(e)}")
-            self.model = None
+            self.scorer = None
 
     # ───────────────────────────────────────────────────────────
     # Prediction
     # ───────────────────────────────────────────────────────────
     def predict_liver_disease(self):
         try:
-            if self.model is None:
+            if self.scorer is None:
                 raise ValueError("ML model not loaded.")
 
             gender = self.gender_group.checkedId()
@@ -187,20 +185,36 @@ class LiverDiseasePredictionPage(QWidget):
             hypertension = self.hypertension_group.checkedId()
             lft = float(self.lft_input.text())
 
-            # Order must exactly match training feature order
-            features = np.array([[
-                age, gender, bmi, alcohol, smoking, genetic_risk,
-                activity, diabetes, hypertension, lft
-            ]])
-
-            pred = self.model.predict(features)[0]
-            msg = "⚠️ Possible Liver Disease Detected" if pred == 1 else "✅ Likely Healthy Liver"
-            QMessageBox.information(self, "Prediction Result", msg)
+            # keyed by model_specs feature name; the scorer puts them in training order
+            values = {
+                "Age": age, "Gender": gender, "BMI": bmi, "Alcohol Consumption": alcohol,
+                "Smoking": smoking, "Genetic Risk": genetic_risk, "Physical Activity": activity,
+                "Diabetes": diabetes, "Hypertension": hypertension, "Liver Function Test": lft,
+            }
 
         except ValueError as ve:
             QMessageBox.warning(self, "Input Error", f"Please enter valid numbers:\n{ve}")
+            return
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Something went wrong:\n{e}")
+            return
+
+        # inference runs on the task pool, the result comes back in _show_result
+        task_runner.get_runner().submit(
+            self.scorer.score, values,
+            on_result=self._show_result, on_error=self._show_error,
+            owner=self, name="liver.predict")
+
+    def _show_result(self, result):
+        msg = "⚠️ Possible Liver Disease Detected" if result.code == 1 else "✅ Likely Healthy Liver"
+        QMessageBox.information(self, "Prediction Result", msg)
+
+    def _show_error(self, e):
+        QMessageBox.critical(self, "Error", f"Something went wrong:\n{e}")
+
+    def closeEvent(self, event):
+        task_runner.get_runner().cancel_owner(self)
+        super().closeEvent(event)
 
 
 # ───────────────────────────────────────────────────────────────
@@ -0,0 +1,311 @@
+"""
+Reusable, resumable training pipeline for the liver-disease model.
+
+USAGE
+=====
+python liver_training.py                       # expects Liver_disease_data.csv
+python liver_training.py --csv data.csv --out liver_disease_model.joblib
+python liver_training.py --fresh --plots       # ignore the checkpoint, draw figures
+
+Stages (each one is timed; the timings land in <out>.training.json):
+
+  load      the CSV is hashed (sha256) and its parsed form cached under
+            .cache/datasets/<name>-<hash>.parquet (feather / pickle when
+            pyarrow is missing) – unchanged data is never re-parsed
+  search    manual successive halving over the hyper-parameter grid: every
+            candidate is cross-validated on a small stratified subsample,
+            the best 1/FACTOR move on to a FACTOR-times larger sample, until
+            one is left or the whole training split is used.  Boosting uses
+            early stopping (n_iter_no_change) so n_estimators is only an
+            upper bound.  Every finished (round, candidate) score is written
+            to <out>.search.json; an interrupted run resumes from there as
+            long as the CSV, grid and settings are unchanged.
+  fit       refit of the winner on the whole training split
+  evaluate  train/test accuracy, report, confusion matrix, ROC-AUC
+  save      joblib.dump(model) – the same bare estimator the page loads
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import math
+import os
+import sys
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.metrics import (
+    accuracy_score,
+    classification_report,
+    confusion_matrix,
+    roc_auc_score,
+)
+from sklearn.model_selection import ParameterGrid, StratifiedKFold, cross_val_score, train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CSV_PATH      = "Liver_disease_data.csv"
+MODEL_OUTFILE = "liver_disease_model.joblib"
+TARGET        = "Diagnosis"
+TEST_SIZE     = 0.20
+RANDOM_SEED   = 42
+CV_FOLDS      = 5
+FACTOR        = 3                       # successive-halving reduction factor
+CACHE_DIR     = os.path.join(BASE_DIR, ".cache", "datasets")
+
+PARAM_GRID = {
+    "clf__n_estimators": [100, 200, 400],
+    "clf__learning_rate": [0.05, 0.1],
+    "clf__max_depth": [2, 3, 4],
+    "clf__subsample": [0.8, 1.0],
+}
+
+
+def build_pipeline(seed=RANDOM_SEED):
+    return Pipeline(steps=[
+        ("scaler", StandardScaler()),
+        ("clf", GradientBoostingClassifier(
+            random_state=seed,
+            n_iter_no_change=10,        # early stopping on a held-out 10 %
+            validation_fraction=0.1,
+        )),
+    ])
+
+
+# ───────────────────────────────────────────────────────────
+# Stage timing
+# ───────────────────────────────────────────────────────────
+class StageTimer:
+    def __init__(self):
+        self.seconds = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        print(f"\n▶ {name} …")
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
+            print(f"  {name}: {self.seconds[name]:.2f} s")
+
+
+# ───────────────────────────────────────────────────────────
+# Dataset cache
+# ───────────────────────────────────────────────────────────
+def file_sha256(path, chunk=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _cache_formats():
+    try:
+        import pyarrow  # noqa: F401
+        return [(".parquet", pd.read_parquet, lambda df, p: df.to_parquet(p, index=False)),
+                (".feather", pd.read_feather, lambda df, p: df.reset_index(drop=True).to_feather(p))]
+    except ImportError:
+        return [(".pkl", pd.read_pickle, lambda df, p: df.to_pickle(p))]
+
+
+def load_dataset(csv_path, cache_dir=CACHE_DIR):
+    """DataFrame for *csv_path*, parsed once per distinct file content. Returns (df, sha256)."""
+    digest = file_sha256(csv_path)
+    stem   = os.path.splitext(os.path.basename(csv_path))[0]
+    fmt    = _cache_formats()[0]
+    cached = os.path.join(cache_dir, f"{stem}-{digest[:16]}{fmt[0]}")
+    if os.path.exists(cached):
+        print(f"  cached dataset {cached}")
+        return fmt[1](cached), digest
+
+    df = pd.read_csv(csv_path)
+    # compact numeric dtypes: smaller cache, faster fits
+    for col in df.columns:
+        if pd.api.types.is_integer_dtype(df[col]):
+            df[col] = pd.to_numeric(df[col], downcast="integer")
+        elif pd.api.types.is_float_dtype(df[col]):
+            df[col] = df[col].astype(np.float64)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = cached + ".tmp"
+        fmt[2](df, tmp)
+        os.replace(tmp, cached)
+    except OSError as e:
+        print(f"  (dataset cache not written: {e})")
+    return df, digest
+
+
+# ───────────────────────────────────────────────────────────
+# Resumable successive halving
+# ───────────────────────────────────────────────────────────
+def _key(params):
+    return json.dumps(params, sort_keys=True)
+
+
+class SearchCheckpoint:
+    """{round: {candidate key: mean CV score}} persisted after every evaluation."""
+
+    def __init__(self, path, fingerprint, fresh=False):
+        self.path, self.fingerprint = path, fingerprint
+        self.scores = {}
+        if not fresh and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    saved = json.load(f)
+                if saved.get("fingerprint") == fingerprint:
+                    self.scores = saved.get("scores", {})
+                    done = sum(len(r) for r in self.scores.values())
+                    print(f"  resuming search: {done} evaluations from {path}")
+            except (OSError, ValueError):
+                pass
+
+    def get(self, rnd, key):
+        return self.scores.get(str(rnd), {}).get(key)
+
+    def put(self, rnd, key, score):
+        self.scores.setdefault(str(rnd), {})[key] = score
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": self.fingerprint, "scores": self.scores}, f, indent=1)
+        os.replace(tmp, self.path)
+
+
+def successive_halving(X, y, param_grid, checkpoint, factor=FACTOR, cv=CV_FOLDS,
+                       seed=RANDOM_SEED, scoring="accuracy"):
+    candidates = list(ParameterGrid(param_grid))
+    n_rounds   = max(1, math.ceil(math.log(len(candidates), factor)) + 1)
+    min_rows   = max(cv * 20, len(X) // factor ** (n_rounds - 1))
+    folds      = StratifiedKFold(n_splits=cv, shuffle=True, random_state=seed)
+
+    for rnd in range(n_rounds):
+        n_rows = min(len(X), min_rows * factor ** rnd)
+        if n_rows < len(X):
+            Xs, _, ys, _ = train_test_split(X, y, train_size=n_rows, stratify=y,
+                                            random_state=seed + rnd)
+        else:
+            Xs, ys = X, y
+        print(f"  round {rnd}: {len(candidates)} candidates × {len(Xs)} rows")
+
+        scored = []
+        for params in candidates:
+            key = _key(params)
+            score = checkpoint.get(rnd, key)
+            if score is None:
+                model = build_pipeline(seed).set_params(**params)
+                score = float(cross_val_score(model, Xs, ys, cv=folds, scoring=scoring,
+                                              n_jobs=-1).mean())
+                checkpoint.put(rnd, key, score)
+            scored.append((score, key, params))
+
+        scored.sort(key=lambda s: (-s[0], s[1]))
+        keep = max(1, math.ceil(len(candidates) / factor))
+        candidates = [p for _, _, p in scored[:keep]]
+        if len(candidates) == 1 or n_rows == len(X):
+            break
+    best_score, _, best = scored[0]
+    return best, best_score
+
+
+# ───────────────────────────────────────────────────────────
+# Evaluation
+# ───────────────────────────────────────────────────────────
+def evaluate(split_name, y_true, y_pred, proba=None):
+    acc = accuracy_score(y_true, y_pred)
+    print(f"\n🎯 {split_name} accuracy: {acc:.4f}")
+    print("\nClassification report:")
+    print(classification_report(y_true, y_pred))
+    print("Confusion matrix:\n", confusion_matrix(y_true, y_pred))
+    result = {"accuracy": acc}
+    if proba is not None:
+        result["roc_auc"] = roc_auc_score(y_true, proba[:, 1])
+        print(f"ROC‑AUC: {result['roc_auc']:.4f}")
+    return result
+
+
+def save_plots(df, model, X_test, y_test):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from sklearn.metrics import RocCurveDisplay
+
+    sns.set(style="ticks", font_scale=0.9)
+    plt.figure(figsize=(10, 7))
+    sns.heatmap(df.corr(numeric_only=True), annot=True, fmt=".2f", cmap="coolwarm")
+    plt.title("Feature correlation matrix")
+    plt.tight_layout()
+    plt.savefig("correlation_heatmap.png")
+    plt.close()
+
+    RocCurveDisplay.from_estimator(model, X_test, y_test)
+    plt.title("ROC curve – Test set")
+    plt.savefig("roc_curve.png")
+    plt.close()
+
+
+# ───────────────────────────────────────────────────────────
+# Pipeline
+# ───────────────────────────────────────────────────────────
+def train(csv_path=CSV_PATH, out=MODEL_OUTFILE, param_grid=None, fresh=False, plots=False):
+    param_grid = param_grid or PARAM_GRID
+    timer = StageTimer()
+
+    with timer.stage("load"):
+        df, digest = load_dataset(csv_path)
+        X = df.drop(TARGET, axis=1)
+        y = df[TARGET]
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=TEST_SIZE, stratify=y, random_state=RANDOM_SEED)
+
+    with timer.stage("search"):
+        fingerprint = hashlib.sha256(json.dumps(
+            {"csv": digest, "grid": param_grid, "cv": CV_FOLDS, "factor": FACTOR,
+             "seed": RANDOM_SEED, "test_size": TEST_SIZE}, sort_keys=True).encode()).hexdigest()
+        checkpoint = SearchCheckpoint(out + ".search.json", fingerprint, fresh)
+        best, cv_score = successive_halving(X_train, y_train, param_grid, checkpoint)
+        print("  best params:", best, f"(CV accuracy {cv_score:.4f})")
+
+    with timer.stage("fit"):
+        model = build_pipeline().set_params(**best).fit(X_train, y_train)
+
+    with timer.stage("evaluate"):
+        metrics = {
+            "train": evaluate("TRAIN", y_train, model.predict(X_train), model.predict_proba(X_train)),
+            "test":  evaluate("TEST", y_test, model.predict(X_test), model.predict_proba(X_test)),
+        }
+        if plots:
+            save_plots(df, model, X_test, y_test)
+
+    with timer.stage("save"):
+        joblib.dump(model, out)
+        print(f"  ✅ Model saved to {out}")
+
+    summary = {"csv": os.path.abspath(csv_path), "csv_sha256": digest, "best_params": best,
+               "cv_score": cv_score, "metrics": metrics, "stage_seconds": timer.seconds}
+    with open(out + ".training.json", "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, default=float)
+    print("\nStage timings: " + ", ".join(f"{k} {v:.2f} s" for k, v in timer.seconds.items()))
+    return model, summary
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Train the Baymax liver-disease model.")
+    ap.add_argument("--csv", default=CSV_PATH)
+    ap.add_argument("--out", default=MODEL_OUTFILE)
+    ap.add_argument("--fresh", action="store_true", help="ignore the search checkpoint")
+    ap.add_argument("--plots", action="store_true",
+                    help="also write correlation_heatmap.png and roc_curve.png")
+    args = ap.parse_args(argv)
+    train(args.csv, args.out, fresh=args.fresh, plots=args.plots)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
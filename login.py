@@ -1,5 +1,6 @@
 import sys
 import mysql.connector
+import db_utils
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QPushButton,
     QVBoxLayout, QHBoxLayout, QMessageBox, QFrame, QCheckBox
@@ -142,12 +143,7 @@ class LoginWindow(QWidget):
             return
 
         try:
-            conn = mysql.connector.connect(
-                host="localhost",
-                user="root",
-                password="",
-                database="baymax"
-            )
+            conn = db_utils.get_connection()
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM users WHERE username = %s AND password = %s", (username, password))
             result = cursor.fetchone()
@@ -0,0 +1,142 @@
+# model_registry.py
+# ------------------------------------------------------------
+# Process-wide cache for the joblib model artifacts.
+#
+# Every prediction page asks the registry instead of calling joblib.load,
+# so reopening a tile reuses the already deserialized model.  Entries are
+# keyed by absolute path + file mtime: replacing the .joblib on disk makes
+# the next get() reload it.  Set BAYMAX_MODEL_MMAP=r to memory-map the
+# numpy arrays of uncompressed artifacts instead of copying them in.
+#
+# stats() reports load wall time per artifact.  The heap footprint of a
+# load is only measured with BAYMAX_MODEL_TRACE_MEMORY=1: tracemalloc slows
+# joblib.load down several times over, so it is meant for profiling runs,
+# not production.
+
+import os
+import threading
+import time
+import tracemalloc
+
+import joblib
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def resolve_path(path: str) -> str:
+    """Artifacts are looked up next to the code, not in the CWD."""
+    return path if os.path.isabs(path) else os.path.join(BASE_DIR, path)
+
+
+class _Entry:
+    __slots__ = ("lock", "value", "mtime_ns", "metrics")
+
+    def __init__(self):
+        self.lock     = threading.Lock()
+        self.value    = None
+        self.mtime_ns = None
+        self.metrics  = {"loads": 0, "hits": 0, "load_seconds": 0.0,
+                         "file_bytes": 0, "memory_bytes": None}
+
+
+_trace_lock = threading.Lock()      # one traced load at a time, process-wide
+
+
+class ModelRegistry:
+    def __init__(self, mmap_mode=None, trace_memory=None):
+        self.mmap_mode = mmap_mode if mmap_mode is not None else (
+            os.environ.get("BAYMAX_MODEL_MMAP") or None)
+        self.trace_memory = trace_memory if trace_memory is not None else (
+            os.environ.get("BAYMAX_MODEL_TRACE_MEMORY") == "1")
+        self._lock    = threading.Lock()
+        self._entries = {}
+
+    # ── public API ─────────────────────────────────────────
+    def get(self, path: str, mmap_mode=None):
+        """Return the deserialized artifact, loading it at most once per mtime."""
+        path  = resolve_path(path)
+        mmap_mode = mmap_mode or self.mmap_mode
+        entry = self._entry((path, mmap_mode))
+
+        mtime_ns = os.stat(path).st_mtime_ns       # FileNotFoundError → caller
+        with entry.lock:                           # concurrent first calls load once
+            if entry.value is not None and entry.mtime_ns == mtime_ns:
+                entry.metrics["hits"] += 1
+                return entry.value
+
+            if self.trace_memory:
+                value, seconds, memory = self._traced_load(path, mmap_mode)
+            else:
+                value, seconds, memory = self._timed_load(path, mmap_mode)
+            entry.value, entry.mtime_ns = value, mtime_ns
+            entry.metrics["loads"]        += 1
+            entry.metrics["load_seconds"]  = seconds
+            entry.metrics["memory_bytes"]  = memory
+            entry.metrics["file_bytes"]    = os.path.getsize(path)
+            return value
+
+    def version(self, path: str):
+        """Identity of the artifact currently on disk: (abs path, mtime_ns)."""
+        path = resolve_path(path)
+        return path, os.stat(path).st_mtime_ns
+
+    def stats(self) -> dict:
+        with self._lock:
+            items = list(self._entries.items())
+        return {
+            (os.path.relpath(path, BASE_DIR) + (f" [mmap={mode}]" if mode else "")): dict(e.metrics)
+            for (path, mode), e in items
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    # ── internals ──────────────────────────────────────────
+    def _entry(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+            return entry
+
+    @staticmethod
+    def _timed_load(path, mmap_mode):
+        start = time.perf_counter()
+        value = joblib.load(path, mmap_mode=mmap_mode)
+        return value, time.perf_counter() - start, None
+
+    @staticmethod
+    def _traced_load(path, mmap_mode):
+        # heap growth during the load is the in-memory footprint; memory-mapped
+        # arrays live in the page cache and are (correctly) not counted.
+        # Traced loads are serialized so one thread's stop() can't reset
+        # another's numbers; allocations by unrelated threads still count.
+        with _trace_lock:
+            tracing = tracemalloc.is_tracing()
+            if not tracing:
+                tracemalloc.start()
+            before = tracemalloc.get_traced_memory()[0]
+            start  = time.perf_counter()
+            try:
+                value = joblib.load(path, mmap_mode=mmap_mode)
+            finally:
+                seconds = time.perf_counter() - start
+                memory  = max(0, tracemalloc.get_traced_memory()[0] - before)
+                if not tracing:
+                    tracemalloc.stop()
+        return value, seconds, memory
+
+
+# ───────────────────────────────────────────────────────────
+# Process-wide default registry
+# ───────────────────────────────────────────────────────────
+registry = ModelRegistry()
+
+
+def load(path: str, mmap_mode=None):
+    return registry.get(path, mmap_mode)
+
+
+def stats() -> dict:
+    return registry.stats()
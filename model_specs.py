@@ -0,0 +1,169 @@
+# model_specs.py
+# ------------------------------------------------------------
+# Single source of truth for how each tabular model is fed.
+#
+# The feature order here is exactly what the PyQt pages build:
+#   diabetes – the fixed 8-column array in DiabetesPredictionPage.predict_diabetes
+#   liver    – the 10-column array in LiverDiseasePredictionPage.predict_liver_disease
+#   heart    – bundle["features"]   (HeartDiseasePredictionPage.columns)
+#   bmi      – bundle["features"]   (BMIPredictionPage.features)
+# plus the mapping from the raw CSV datasets (text categories such as
+# "Female" or "never") onto the codes the form widgets produce.
+#
+# Alternative estimators trained by training_harness.py --variant are saved
+# as <stem>.<variant>.joblib; BAYMAX_<NAME>_VARIANT (or BAYMAX_MODEL_VARIANT
+# for every model), e.g. BAYMAX_LIVER_VARIANT=hgb, makes the pages and
+# score.py load that file instead when it exists.
+
+import os
+
+import numpy as np
+import pandas as pd
+
+import model_registry
+
+
+def variant_filename(filename: str, variant: str) -> str:
+    root, ext = os.path.splitext(filename)
+    return f"{root}.{variant}{ext}"
+
+
+class ModelSpec:
+    def __init__(self, name, filename, features, labels, csv_columns=None, encoders=None):
+        self.name        = name
+        self.filename    = filename
+        self.features    = list(features)      # fallback when the artifact has no bundle
+        self.labels      = labels              # class code → display text
+        self.csv_columns = csv_columns or {}   # feature → column name in the dataset CSV
+        self.encoders    = {f: {str(k).lower(): v for k, v in m.items()}
+                            for f, m in (encoders or {}).items()}
+
+    # ── artifact ───────────────────────────────────────────
+    def artifact(self):
+        """Filename to load: the configured variant if it exists, else the default."""
+        variant = (os.environ.get(f"BAYMAX_{self.name.upper()}_VARIANT")
+                   or os.environ.get("BAYMAX_MODEL_VARIANT"))
+        if variant:
+            path = variant_filename(self.filename, variant)
+            if os.path.exists(model_registry.resolve_path(path)):
+                return path
+        return self.filename
+
+    def load(self):
+        """Return (estimator, feature order) from the shared model registry."""
+        obj = model_registry.load(self.artifact())
+        if isinstance(obj, dict):                           # {"model", "features"} bundle
+            return obj["model"], list(obj.get("features") or self.features)
+        return obj, self.features
+
+    def version(self):
+        return model_registry.registry.version(self.artifact())
+
+    # ── feature construction ───────────────────────────────
+    def source_column(self, feature, columns):
+        """Find the CSV column holding *feature* (exact, alias, then case-insensitive)."""
+        for candidate in (feature, self.csv_columns.get(feature)):
+            if candidate in columns:
+                return candidate
+        lowered = {str(c).lower(): c for c in columns}
+        for candidate in (feature, self.csv_columns.get(feature)):
+            if candidate and candidate.lower() in lowered:
+                return lowered[candidate.lower()]
+        return None
+
+    def encode(self, feature, values: pd.Series) -> np.ndarray:
+        mapping = self.encoders.get(feature)
+        if mapping and not pd.api.types.is_numeric_dtype(values):   # object or pandas "str" dtype
+            coded  = values.astype(str).str.strip().str.lower().map(mapping)
+            values = coded.fillna(pd.to_numeric(values, errors="coerce"))
+        return pd.to_numeric(values, errors="coerce").to_numpy(np.float64)
+
+    def frame_to_matrix(self, df: pd.DataFrame, features):
+        """
+        Vectorized feature construction for a whole chunk.
+
+        Returns (X, valid) where X is a C-contiguous float64 (n, k) matrix in
+        *features* order and *valid* flags rows without missing/unmappable values.
+        """
+        missing = [f for f in features if self.source_column(f, df.columns) is None]
+        if missing:
+            raise KeyError(f"{self.name}: input is missing column(s) {missing}")
+
+        X = np.empty((len(df), len(features)), dtype=np.float64)
+        for j, feature in enumerate(features):
+            X[:, j] = self.encode(feature, df[self.source_column(feature, df.columns)])
+        valid = ~np.isnan(X).any(axis=1)
+        return X, valid
+
+    def row_to_matrix(self, values: dict, features):
+        """One request/form row → (1, k) matrix in *features* order."""
+        X, valid = self.frame_to_matrix(pd.DataFrame([values]), features)
+        if not valid[0]:
+            bad = [f for f, v in zip(features, X[0]) if np.isnan(v)]
+            raise ValueError(f"{self.name}: invalid value(s) for {bad}")
+        return X
+
+    @staticmethod
+    def model_input(model, X, features):
+        # estimators fitted on a DataFrame warn when given a bare array
+        if hasattr(model, "feature_names_in_"):
+            return pd.DataFrame(X, columns=features, copy=False)
+        return X
+
+    def label(self, code):
+        return self.labels.get(int(code), str(code))
+
+
+_YES_NO = {"yes": 1, "no": 0, "true": 1, "false": 0}
+
+SPECS = {
+    "diabetes": ModelSpec(
+        "diabetes", "diabetes_model.joblib",
+        features=["gender", "age", "hypertension", "heart_disease",
+                  "smoking", "bmi", "hba1c", "glucose"],
+        labels={0: "No Diabetes", 1: "Diabetes"},
+        csv_columns={"smoking": "smoking_history", "hba1c": "HbA1c_level",
+                     "glucose": "blood_glucose_level"},
+        encoders={
+            "gender": {"male": 1, "female": 0},
+            # form offers Yes/No; dataset has a smoking *history* category
+            "smoking": {"never": 0, "no info": 0, "current": 1, "former": 1,
+                        "ever": 1, "not current": 1, **_YES_NO},
+            "hypertension": _YES_NO,
+            "heart_disease": _YES_NO,
+        },
+    ),
+    "liver": ModelSpec(
+        "liver", "liver_disease_model.joblib",
+        features=["Age", "Gender", "BMI", "Alcohol Consumption", "Smoking",
+                  "Genetic Risk", "Physical Activity", "Diabetes",
+                  "Hypertension", "Liver Function Test"],
+        labels={0: "Likely Healthy Liver", 1: "Possible Liver Disease"},
+        encoders={
+            "Gender": {"male": 0, "female": 1},
+            "Genetic Risk": {"low": 0, "medium": 1, "high": 2},
+            "Smoking": _YES_NO, "Diabetes": _YES_NO, "Hypertension": _YES_NO,
+        },
+    ),
+    "heart": ModelSpec(
+        "heart", "heart_disease_model.joblib",
+        features=["age", "sex", "cp", "trestbps", "chol", "fbs", "restecg",
+                  "thalach", "exang", "oldpeak", "slope", "ca", "thal"],
+        labels={0: "Low risk of Heart Disease", 1: "High risk of Heart Disease"},
+        encoders={"sex": {"male": 1, "female": 0}},
+    ),
+    "bmi": ModelSpec(
+        "bmi", "bmi_model_prediction.joblib",
+        features=["Gender", "Height", "Weight"],
+        labels=dict(enumerate(["Extremely Weak", "Weak", "Normal",
+                               "Overweight", "Obesity", "Extreme Obesity"])),
+        encoders={"Gender": {"male": 1, "female": 0}},
+    ),
+}
+
+
+def get_spec(name: str) -> ModelSpec:
+    try:
+        return SPECS[name]
+    except KeyError:
+        raise KeyError(f"Unknown model {name!r}; choose from {sorted(SPECS)}") from None
@@ -0,0 +1,158 @@
+# prediction_cache.py
+# ------------------------------------------------------------
+# Process-wide memo of tabular-model probabilities.
+#
+# Staff often re-submit the same form (tweak a field, put it back) and the
+# inference service sees the same patient rows again, so every probability
+# row is remembered under
+#
+#   (model name, artifact version, canonical feature vector)
+#
+# where the version is model_registry's (path, mtime_ns) – replacing the
+# .joblib gives new keys, and scoring.get_scorer() drops the old entries
+# when it notices.  The feature vector is the float64 row in training column
+# order (1 and 1.0 are the same input, -0.0 folds into 0.0).  Probabilities
+# are cached rather than classes, so changing a decision threshold never
+# needs a flush.
+#
+# Entries are evicted least-recently-used beyond BAYMAX_PREDICTION_CACHE_SIZE
+# (default 4096, 0 disables the cache) and expire after
+# BAYMAX_PREDICTION_CACHE_TTL seconds (default 3600, 0 = never).
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+
+class _Counters:
+    __slots__ = ("hits", "misses", "evictions", "expired", "invalidated")
+
+    def __init__(self):
+        self.hits = self.misses = self.evictions = self.expired = self.invalidated = 0
+
+    def snapshot(self):
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions, "expired": self.expired,
+                "invalidated": self.invalidated}
+
+
+class PredictionCache:
+    def __init__(self, maxsize=None, ttl=None):
+        self.maxsize = maxsize if maxsize is not None else int(
+            os.environ.get("BAYMAX_PREDICTION_CACHE_SIZE", 4096))
+        self.ttl = ttl if ttl is not None else float(
+            os.environ.get("BAYMAX_PREDICTION_CACHE_TTL", 3600))
+        self._lock     = threading.Lock()
+        self._entries  = OrderedDict()          # key → (expires_at, proba row)
+        self._counters = {}
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0
+
+    @staticmethod
+    def key(name, version, row):
+        row = np.ascontiguousarray(row, dtype=np.float64).reshape(-1) + 0.0   # -0.0 → 0.0
+        return name, version, row.tobytes()
+
+    # ── lookups ────────────────────────────────────────────
+    def get(self, key):
+        """Cached probability row for *key*, or None."""
+        with self._lock:
+            counters = self._counter(key[0])
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and entry[0] < time.monotonic():
+                del self._entries[key]
+                counters.expired += 1
+                entry = None
+            if entry is None:
+                counters.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            counters.hits += 1
+            return entry[1]
+
+    def put(self, key, proba):
+        if not self.enabled:
+            return
+        proba = np.array(proba, dtype=np.float64)
+        proba.setflags(write=False)             # shared between callers
+        expires = time.monotonic() + self.ttl if self.ttl else float("inf")
+        with self._lock:
+            self._entries[key] = (expires, proba)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                old, _ = self._entries.popitem(last=False)
+                self._counter(old[0]).evictions += 1
+
+    def predict_proba(self, name, version, X, compute):
+        """
+        Probability matrix for the rows of X; only the distinct rows not
+        cached are passed (as one matrix) to compute(X_missing).
+        """
+        if not self.enabled:
+            return compute(X)
+        keys = [self.key(name, version, row) for row in X]
+        rows = [self.get(k) for k in keys]
+        missing = {}                                # key → row indices, duplicates scored once
+        for i, (k, r) in enumerate(zip(keys, rows)):
+            if r is None:
+                missing.setdefault(k, []).append(i)
+        if missing:
+            first = [idx[0] for idx in missing.values()]
+            for (k, idx), p in zip(missing.items(), compute(X[first])):
+                self.put(k, p)
+                for i in idx:
+                    rows[i] = p
+        return np.vstack(rows)
+
+    # ── maintenance ────────────────────────────────────────
+    def invalidate(self, name, keep_version=None):
+        """Drop *name*'s entries (all, or all but those of keep_version)."""
+        with self._lock:
+            stale = [k for k in self._entries if k[0] == name and k[1] != keep_version]
+            for k in stale:
+                del self._entries[k]
+            self._counter(name).invalidated += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            sizes = {}
+            for name, *_ in self._entries:
+                sizes[name] = sizes.get(name, 0) + 1
+            return {name: {"entries": sizes.get(name, 0), **c.snapshot()}
+                    for name, c in self._counters.items()}
+
+    def _counter(self, name):
+        counters = self._counters.get(name)
+        if counters is None:
+            counters = self._counters[name] = _Counters()
+        return counters
+
+
+# ───────────────────────────────────────────────────────────
+# Process-wide default cache
+# ───────────────────────────────────────────────────────────
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> PredictionCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PredictionCache()
+        return _cache
+
+
+def stats() -> dict:
+    return get_cache().stats()
@@ -1,16 +1,18 @@
-import sys, os, numpy as np, pandas as pd
+import sys, os, threading, numpy as np, pandas as pd
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QFileDialog,
     QGraphicsView, QGraphicsScene, QGraphicsPixmapItem, QRubberBand,
-    QHBoxLayout, QMessageBox
+    QHBoxLayout, QMessageBox, QCheckBox
 )
 from PyQt5.QtGui import QPixmap, QFont, QImage
 from PyQt5.QtCore import Qt, QPoint, QRect, QRectF, QSize, pyqtSignal
 
-import tensorflow as tf  # primary loader for legacy models
-import keras              # secondary loader for Keras‑3 models
-from sklearn.preprocessing import LabelEncoder
-from PIL import Image
+import task_runner
+import prescription_tta
+from label_table import artifact_path_for, load_label_table
+from prescription_batch import qimage_rgb_view, scale_rgb
+# tensorflow / keras / sklearn are imported where they are used, so importing
+# this module (e.g. from the dashboard) does not start TensorFlow.
 
 # ────────────────────────────────
 #  CONFIG
@@ -18,12 +20,17 @@ from PIL import Image
 IMG_SIZE       = 224
 MODEL_PATH     = "prescription_model.keras"   # ensure this matches your file name
 TRAIN_CSV_PATH = "training_labels.csv"        # adjust if needed
+# "keras" (default) or "tflite" – the exported model from tflite_export.py;
+# BAYMAX_TFLITE_VARIANT picks int8 / float16 / dynamic (default: first found)
+MODEL_LOADER   = os.environ.get("BAYMAX_PRESCRIPTION_LOADER", "keras")
+LABELS_PATH    = artifact_path_for(MODEL_PATH) # cached class table, rebuilt when the CSV changes
 
 # ────────────────────────────────
 #  UTILITIES
 # ────────────────────────────────
 
-def build_label_encoder(csv_path: str) -> LabelEncoder:
+def build_label_encoder(csv_path: str):
+    from sklearn.preprocessing import LabelEncoder
     df = pd.read_csv(csv_path)
     df.dropna(inplace=True)
     le = LabelEncoder()
@@ -31,24 +38,71 @@ def build_label_encoder(csv_path: str) -> LabelEncoder:
     return le
 
 
-def qpixmap_to_model_input(pixmap: QPixmap) -> np.ndarray:
-    """Convert QPixmap → (1, 224, 224, 3) float32 tensor in [0, 1] range."""
+def qpixmap_to_model_input(pixmap: QPixmap, out: np.ndarray = None) -> np.ndarray:
+    """
+    Convert QPixmap → (1, 224, 224, 3) float32 tensor in [0, 1] range.
+
+    Resized by prescription_batch.scale_rgb – the same Qt smooth scale the
+    batch run uses – and written into *out* (a reusable (1, IMG_SIZE,
+    IMG_SIZE, 3) float32 array, allocated when not given).
+    """
+    if out is None:
+        out = np.empty((1, IMG_SIZE, IMG_SIZE, 3), dtype=np.float32)
+    np.multiply(scale_rgb(pixmap.toImage(), IMG_SIZE), np.float32(1.0 / 255.0), out=out[0])
+    return out
+
+
+def _pil_qpixmap_to_model_input(pixmap: QPixmap) -> np.ndarray:
+    """Previous QImage → NumPy → PIL → resize path, kept for the benchmark."""
+    from PIL import Image
     qimage = pixmap.toImage().convertToFormat(QImage.Format_RGB888)
-    w, h   = qimage.width(), qimage.height()
-    ptr    = qimage.bits()
-    ptr.setsize(h * w * 3)
-    arr    = np.frombuffer(ptr, np.uint8).reshape((h, w, 3))
-    img    = Image.fromarray(arr).resize((IMG_SIZE, IMG_SIZE))
+    img    = Image.fromarray(np.array(qimage_rgb_view(qimage))).resize((IMG_SIZE, IMG_SIZE))
     return np.expand_dims(np.asarray(img, dtype=np.float32) / 255.0, axis=0)
 
 
+def benchmark_conversion(width=4000, height=3000, repeats=10):
+    """Time both conversion paths on a synthetic scan (needs a QApplication)."""
+    import time
+    rng  = np.random.default_rng(0)
+    scan = np.ascontiguousarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8))
+    pixmap = QPixmap.fromImage(
+        QImage(scan.tobytes(), width, height, width * 3, QImage.Format_RGB888).copy())
+    out = np.empty((1, IMG_SIZE, IMG_SIZE, 3), dtype=np.float32)
+
+    def timed(fn):
+        fn()                                               # warm-up
+        start = time.perf_counter()
+        for _ in range(repeats):
+            fn()
+        return (time.perf_counter() - start) / repeats * 1000
+
+    legacy = timed(lambda: _pil_qpixmap_to_model_input(pixmap))
+    fast   = timed(lambda: qpixmap_to_model_input(pixmap, out))
+    diff   = float(np.abs(_pil_qpixmap_to_model_input(pixmap) - out).mean())
+    print(f"{width}×{height} scan → {IMG_SIZE}×{IMG_SIZE}")
+    print(f"PIL path      {legacy:8.1f} ms")
+    print(f"Qt scale path {fast:8.1f} ms  ({legacy / fast:4.1f}×), mean |Δ| {diff:.4f}")
+
+
 # ────────────────────────────────
 #  ROBUST MODEL LOADER
 # ────────────────────────────────
 
-def robust_load_model(path: str):
+def robust_load_model(path: str, loader: str = None):
     """Load both legacy (TF‑keras ≤ 2.x) and modern (.keras) models without errors."""
+    loader = loader or ("tflite" if path.endswith(".tflite") else MODEL_LOADER)
+    if loader == "tflite":
+        from tflite_model import TFLiteModel, find_tflite
+        tflite_path = find_tflite(path, os.environ.get("BAYMAX_TFLITE_VARIANT"))
+        if tflite_path is None:
+            raise RuntimeError(f"No exported .tflite model for {path} "
+                               "(run: python tflite_export.py prescription)")
+        return TFLiteModel(tflite_path)
+    if loader != "keras":
+        raise ValueError(f"Unknown model loader {loader!r}; use 'keras' or 'tflite'")
+
     try:
+        import tensorflow as tf  # primary loader for legacy models
         from tensorflow.keras.layers import InputLayer
 
         class LegacyInputLayer(InputLayer):
@@ -64,6 +118,7 @@ def robust_load_model(path: str):
 
     except Exception as e1:
         try:
+            import keras              # secondary loader for Keras‑3 models
             return keras.models.load_model(path, compile=False, safe_mode=False)
         except Exception as e2:
             raise RuntimeError(
@@ -72,6 +127,19 @@ def robust_load_model(path: str):
                 f"keras (v3) loader error:\n{e2}"
             ) from None
 
+_load_lock = threading.Lock()
+_model = None
+_label_encoder = None
+
+def load_model_and_labels():
+    """Prescription model + label table, loaded once and shared (thread-safe)."""
+    global _model, _label_encoder
+    with _load_lock:                     # a second caller waits for the in-flight load
+        if _model is None:
+            _model = robust_load_model(MODEL_PATH)
+        if _label_encoder is None:
+            _label_encoder = load_label_table(TRAIN_CSV_PATH, LABELS_PATH)
+    return _model, _label_encoder
 
 
 # ────────────────────────────────
@@ -116,22 +184,19 @@ class PrescriptionWindow(QWidget):
 
         # ── Load model and labels ───────────────────────────
         try:
-            self.model = robust_load_model(MODEL_PATH)
-        except Exception as e:
-            QMessageBox.critical(self, "Model Load Error",
-                                 f"Failed to load model:\n\n{e}")
-            sys.exit(1)
-
-        try:
-            self.label_encoder = build_label_encoder(TRAIN_CSV_PATH)
+            self.model, self.label_encoder = load_model_and_labels()
         except Exception as e:
-            QMessageBox.critical(self, "Label Error",
-                                 f"Failed to load labels:\n\n{e}")
+            title = "Model Load Error" if _model is None else "Label Error"
+            what  = "model" if _model is None else "labels"
+            QMessageBox.critical(self, title, f"Failed to load {what}:\n\n{e}")
             sys.exit(1)
 
         self.original_pixmap = None
         self.cropped_pixmap  = None
         self.pixmap_item     = None
+        # model input for the crop, reused by every prediction – the upload
+        # button stays disabled while a worker is reading it
+        self.input_batch     = np.empty((1, IMG_SIZE, IMG_SIZE, 3), dtype=np.float32)
 
         self.setup_ui()
 
@@ -171,8 +236,19 @@ class PrescriptionWindow(QWidget):
         self.upload_cropped_btn.setStyleSheet("background-color:#2ecc71;color:white;font-weight:bold;padding:10px;")
         self.upload_cropped_btn.clicked.connect(self.upload_cropped_image)
 
+        self.batch_btn = QPushButton("Batch Folder…")
+        self.batch_btn.setStyleSheet("background-color:#9b59b6;color:white;font-weight:bold;padding:10px;")
+        self.batch_btn.clicked.connect(self.run_batch_folder)
+
+        # test-time augmentation: several variants of the crop in one batch, top-k shown
+        self.tta_check = QCheckBox(f"Robust (top {prescription_tta.TOP_K})")
+        self.tta_check.setToolTip("Classify shifted/zoomed/contrast variants of the crop "
+                                  "in one pass and average them")
+
         button_layout.addWidget(self.upload_btn)
         button_layout.addWidget(self.upload_cropped_btn)
+        button_layout.addWidget(self.tta_check)
+        button_layout.addWidget(self.batch_btn)
 
         # Cropped preview
         self.cropped_label = QLabel("Cropped image will appear here.")
@@ -221,14 +297,99 @@ class PrescriptionWindow(QWidget):
             QMessageBox.information(self, "No Crop", "Please crop a region first.")
             return
         try:
-            img_batch = qpixmap_to_model_input(self.cropped_pixmap)
-            preds     = self.model.predict(img_batch, verbose=0)
-            idx       = int(np.argmax(preds, axis=1)[0])
-            label     = self.label_encoder.inverse_transform([idx])[0]
-            conf      = float(np.max(preds)) * 100.0
-            self.result_label.setText(f"Predicted: {label}  ({conf:.2f}%)")
+            img_batch = qpixmap_to_model_input(self.cropped_pixmap,   # QPixmap: GUI thread only
+                                               out=self.input_batch)
         except Exception as e:
-            QMessageBox.critical(self, "Prediction Error", f"Could not process image:\n\n{e}")
+            self._show_error(e)
+            return
+
+        self.upload_cropped_btn.setEnabled(False)
+        self.result_label.setText("Recognizing…")
+        if self.tta_check.isChecked():
+            task_runner.get_runner().submit(
+                self._run_tta_prediction, self.model, self.label_encoder, img_batch,
+                on_result=self._show_top_k, on_error=self._prediction_failed,
+                owner=self, name="prescription.predict_tta")
+            return
+        task_runner.get_runner().submit(
+            self._run_prediction, self.model, self.label_encoder, img_batch,
+            on_result=self._show_result, on_error=self._prediction_failed,
+            owner=self, name="prescription.predict")
+
+    @staticmethod
+    def _run_prediction(model, label_encoder, img_batch):
+        preds = model.predict(img_batch, verbose=0)
+        idx   = int(np.argmax(preds, axis=1)[0])
+        label   = label_encoder.inverse_transform([idx])[0]
+        generic = label_encoder.generic_names([idx])[0]
+        conf    = float(np.max(preds)) * 100.0
+        return label, generic, conf
+
+    @staticmethod
+    def _run_tta_prediction(model, label_encoder, img_batch):
+        idx, probs = prescription_tta.predict_tta(model, img_batch)
+        return list(zip(label_encoder.inverse_transform(idx),
+                        label_encoder.generic_names(idx), probs * 100.0))
+
+    def _show_top_k(self, ranked):
+        self.upload_cropped_btn.setEnabled(True)
+        lines = [f"{i}. {label}{f' – {generic}' if generic else ''}  ({conf:.2f}%)"
+                 for i, (label, generic, conf) in enumerate(ranked, 1)]
+        self.result_label.setText("\n".join(lines))
+
+    def _show_result(self, result):
+        self.upload_cropped_btn.setEnabled(True)
+        label, generic, conf = result
+        generic = f" – {generic}" if generic else ""
+        self.result_label.setText(f"Predicted: {label}{generic}  ({conf:.2f}%)")
+
+    def _prediction_failed(self, e):
+        self.upload_cropped_btn.setEnabled(True)
+        self._show_error(e)
+
+    def _show_error(self, e):
+        self.result_label.setText("")
+        QMessageBox.critical(self, "Prediction Error", f"Could not process image:\n\n{e}")
+
+    # ─────────────────────── BATCH MODE ───────────────────────
+    def run_batch_folder(self):
+        import prescription_batch
+
+        folder = QFileDialog.getExistingDirectory(self, "Folder of Prescriptions")
+        if not folder:
+            return
+        paths = prescription_batch.find_images(folder)
+        if not paths:
+            QMessageBox.information(self, "No Images", "No images found in that folder.")
+            return
+        out_csv, _ = QFileDialog.getSaveFileName(
+            self, "Save Predictions", os.path.join(folder, "predictions.csv"), "CSV (*.csv)")
+        if not out_csv:
+            return
+
+        self.batch_btn.setEnabled(False)
+        self.result_label.setText(f"Batch: 0/{len(paths)}")
+        task_runner.get_runner().submit(
+            prescription_batch.run_batch, self.model, self.label_encoder, paths, out_csv,
+            IMG_SIZE,
+            on_progress=lambda p: self.result_label.setText(f"Batch: {p[0]}/{p[1]}"),
+            on_result=self._batch_done, on_error=self._batch_failed,
+            owner=self, name="prescription.batch")
+
+    def _batch_done(self, summary):
+        self.batch_btn.setEnabled(True)
+        self.result_label.setText(
+            f"Batch: {summary['images']} images in {summary['seconds']:.1f} s"
+            f" ({summary['failed']} unreadable)")
+        QMessageBox.information(self, "Batch Complete", f"Predictions written to:\n{summary['out']}")
+
+    def _batch_failed(self, e):
+        self.batch_btn.setEnabled(True)
+        self._show_error(e)
+
+    def closeEvent(self, event):
+        task_runner.get_runner().cancel_owner(self)
+        super().closeEvent(event)
 
 
 # ────────────────────────────────
@@ -236,6 +397,9 @@ class PrescriptionWindow(QWidget):
 # ────────────────────────────────
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    if "--benchmark" in sys.argv:          # python prescription.py --benchmark
+        benchmark_conversion()
+        sys.exit(0)
     window = PrescriptionWindow()
     window.show()
     sys.exit(app.exec_())
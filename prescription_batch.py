@@ -0,0 +1,198 @@
+"""
+Batch prescription recognition over a folder of scanned images.
+
+USAGE
+=====
+python prescription_batch.py --dir scans/ --out predictions.csv
+python prescription_batch.py --dir scans/ --out predictions.csv --batch-size 64 --workers 8
+
+Images (.png .jpg .jpeg .bmp .tif .tiff, sub-folders included unless
+--no-recursive) are decoded and resized to IMG_SIZE by a thread pool – Qt
+releases the GIL while decoding and scaling – a few batches ahead of the
+model.  scale_rgb() is the one resize every prescription path uses (UI crop,
+this batch run, the TFLite calibration set), so they all feed the model the
+same pixels.  The model is fed fixed-size float32 batches (the last one is padded,
+so the graph is never retraced), which keeps decoding and inference
+overlapped.  One CSV row per file: file, label, generic, confidence, error.
+
+The same run_batch() backs the "Batch Folder…" button in PrescriptionWindow.
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+DEFAULT_BATCH    = 32
+
+
+# ───────────────────────────────────────────────────────────
+# Input
+# ───────────────────────────────────────────────────────────
+def find_images(root, recursive=True):
+    if not recursive:
+        names = (os.path.join(root, n) for n in os.listdir(root))
+        return sorted(p for p in names
+                      if os.path.isfile(p) and p.lower().endswith(IMAGE_EXTENSIONS))
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        found.extend(os.path.join(dirpath, n) for n in sorted(filenames)
+                     if n.lower().endswith(IMAGE_EXTENSIONS))
+    return found
+
+
+def qimage_rgb_view(qimage: QImage) -> np.ndarray:
+    """(h, w, 3) uint8 view of an RGB888 QImage – no copy, honours bytesPerLine."""
+    h, w = qimage.height(), qimage.width()
+    ptr  = qimage.constBits()
+    ptr.setsize(qimage.bytesPerLine() * h)
+    return np.ndarray((h, w, 3), dtype=np.uint8, buffer=ptr,
+                      strides=(qimage.bytesPerLine(), 3, 1))
+
+
+def scale_rgb(qimage: QImage, size) -> np.ndarray:
+    """
+    QImage → (size, size, 3) uint8, scaled by Qt (area-averaging smooth
+    scale) before the RGB conversion, so only the small image is converted.
+    """
+    small = qimage.scaled(size, size, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+    small = small.convertToFormat(QImage.Format_RGB888)
+    return np.array(qimage_rgb_view(small))     # copy: the view dies with *small*
+
+
+def decode(path, size):
+    """File → (size, size, 3) uint8, resized by scale_rgb like the UI crop."""
+    qimage = QImage(path)
+    if qimage.isNull():
+        raise ValueError(f"cannot decode {os.path.basename(path)}")
+    return scale_rgb(qimage, size)
+
+
+def _decode_or_error(path, size):
+    try:
+        return decode(path, size), ""
+    except Exception as e:                 # unreadable file: reported in the CSV
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _predict(model, X):
+    if hasattr(model, "predict_on_batch"):     # skips Keras' predict() loop per batch
+        return np.asarray(model.predict_on_batch(X))
+    return np.asarray(model.predict(X, verbose=0))
+
+
+# ───────────────────────────────────────────────────────────
+# Batch run
+# ───────────────────────────────────────────────────────────
+def run_batch(model, label_encoder, paths, out_csv, img_size, batch_size=DEFAULT_BATCH,
+              workers=None, prefetch_batches=2, progress=None):
+    """
+    Classify *paths* and write <out_csv>.  progress((done, total)) is called
+    after every batch.  Returns a summary dict.
+    """
+    workers = workers or os.cpu_count() or 4
+    total   = len(paths)
+    batch   = np.zeros((batch_size, img_size, img_size, 3), dtype=np.float32)
+    window  = batch_size * (prefetch_batches + 1)       # decoded images in flight
+    start   = time.perf_counter()
+    failed  = 0
+    infer_seconds = 0.0
+
+    with ThreadPoolExecutor(max_workers=workers) as pool, \
+         open(out_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["file", "label", "generic", "confidence", "error"])
+
+        pending = deque()
+        todo    = iter(paths)
+
+        def fill():
+            while len(pending) < window:
+                path = next(todo, None)
+                if path is None:
+                    return
+                pending.append((path, pool.submit(_decode_or_error, path, img_size)))
+
+        fill()
+        done = 0
+        while pending:
+            names, errors = [], []
+            while pending and len(names) < batch_size:
+                path, future = pending.popleft()
+                pixels, error = future.result()
+                if pixels is None:
+                    errors.append((path, error))
+                    continue
+                np.multiply(pixels, 1.0 / 255.0, out=batch[len(names)])
+                names.append(path)
+            fill()                                     # decoding continues during predict
+
+            if names:
+                batch[len(names):] = 0                 # padding rows of the last batch
+                t0 = time.perf_counter()
+                preds = _predict(model, batch)[: len(names)]
+                infer_seconds += time.perf_counter() - t0
+                idx     = preds.argmax(axis=1)
+                labels  = label_encoder.inverse_transform(idx)
+                generic = label_encoder.generic_names(idx)
+                confs   = preds.max(axis=1) * 100.0
+                for path, label, gen, conf in zip(names, labels, generic, confs):
+                    writer.writerow([path, label, gen, f"{conf:.2f}", ""])
+            for path, error in errors:
+                writer.writerow([path, "", "", "", error])
+            failed += len(errors)
+            done   += len(names) + len(errors)
+            if progress is not None:
+                progress((done, total))
+
+    seconds = time.perf_counter() - start
+    return {"images": total, "failed": failed, "seconds": seconds,
+            "inference_seconds": infer_seconds,
+            "images_per_second": total / seconds if seconds else 0.0,
+            "out": out_csv}
+
+
+# ───────────────────────────────────────────────────────────
+# CLI
+# ───────────────────────────────────────────────────────────
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Classify every prescription image in a folder.")
+    ap.add_argument("--dir", required=True, help="folder of scanned prescriptions")
+    ap.add_argument("--out", required=True, help="CSV to write")
+    ap.add_argument("--batch-size", type=int, default=DEFAULT_BATCH)
+    ap.add_argument("--workers", type=int, default=None,
+                    help="decode threads (default: CPU count)")
+    ap.add_argument("--no-recursive", action="store_true", help="skip sub-folders")
+    args = ap.parse_args(argv)
+
+    from prescription import IMG_SIZE, load_model_and_labels
+
+    paths = find_images(args.dir, recursive=not args.no_recursive)
+    if not paths:
+        print(f"No images found in {args.dir}")
+        return 1
+    model, label_encoder = load_model_and_labels()
+
+    def report(p):
+        done, total = p
+        print(f"\r{done}/{total} images", end="", flush=True)
+
+    summary = run_batch(model, label_encoder, paths, args.out, IMG_SIZE,
+                        batch_size=args.batch_size, workers=args.workers, progress=report)
+    print(f"\n{summary['images']} images ({summary['failed']} unreadable) in "
+          f"{summary['seconds']:.1f} s – {summary['images_per_second']:.1f} images/s, "
+          f"{summary['inference_seconds']:.1f} s in the model → {summary['out']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
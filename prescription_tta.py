@@ -0,0 +1,90 @@
+# prescription_tta.py
+# ------------------------------------------------------------
+# Test-time augmentation for the prescription model.
+#
+# A handwritten crop is turned into a handful of slightly shifted, zoomed and
+# contrast-adjusted variants, written into one preallocated float32 batch and
+# classified with a single forward pass.  The class probabilities are
+# averaged and the top-k medicines returned – about the cost of one batched
+# call, instead of the user re-cropping and resubmitting.
+#
+# Everything here is NumPy only, so it runs on the task-runner threads.
+
+import numpy as np
+
+TOP_K = 3
+
+# (dx, dy, zoom, contrast) – identity first
+VARIANTS = (
+    (0, 0, 1.00, 1.00),
+    (-6, 0, 1.00, 1.00),
+    (6, 0, 1.00, 1.00),
+    (0, -6, 1.00, 1.00),
+    (0, 6, 1.00, 1.00),
+    (0, 0, 1.08, 1.00),
+    (0, 0, 0.92, 1.00),
+    (0, 0, 1.00, 1.25),
+)
+
+
+def _zoom(img, factor, out):
+    """Bilinear zoom about the centre (factor > 1 zooms in), edge pixels extend."""
+    h, w = img.shape[:2]
+    ys = (np.arange(h) - (h - 1) / 2) / factor + (h - 1) / 2
+    xs = (np.arange(w) - (w - 1) / 2) / factor + (w - 1) / 2
+    ys = np.clip(ys, 0, h - 1)
+    xs = np.clip(xs, 0, w - 1)
+    y0 = np.floor(ys).astype(np.intp); y1 = np.minimum(y0 + 1, h - 1)
+    x0 = np.floor(xs).astype(np.intp); x1 = np.minimum(x0 + 1, w - 1)
+    wy = (ys - y0).astype(np.float32)[:, None, None]
+    wx = (xs - x0).astype(np.float32)[None, :, None]
+    top    = img[y0][:, x0] * (1 - wx) + img[y0][:, x1] * wx
+    bottom = img[y1][:, x0] * (1 - wx) + img[y1][:, x1] * wx
+    np.add(top * (1 - wy), bottom * wy, out=out)
+
+
+def _shift(img, dx, dy, out):
+    """Translate by (dx, dy) pixels, filling with the nearest edge pixels."""
+    h, w = img.shape[:2]
+    ys = np.clip(np.arange(h) - dy, 0, h - 1)
+    xs = np.clip(np.arange(w) - dx, 0, w - 1)
+    out[...] = img[ys][:, xs]
+
+
+def augment(x, variants=VARIANTS, out=None):
+    """
+    x: (H, W, 3) or (1, H, W, 3) float32 in [0, 1].
+    Returns the (len(variants), H, W, 3) batch, written into *out* if given.
+    """
+    img = x[0] if x.ndim == 4 else x
+    if out is None:
+        out = np.empty((len(variants),) + img.shape, dtype=np.float32)
+    for slot, (dx, dy, zoom, contrast) in zip(out, variants):
+        if zoom != 1.0:
+            _zoom(img, zoom, slot)
+        elif dx or dy:
+            _shift(img, dx, dy, slot)
+        else:
+            slot[...] = img
+        if contrast != 1.0:
+            mean = slot.mean()
+            slot -= mean
+            slot *= contrast
+            slot += mean
+            np.clip(slot, 0.0, 1.0, out=slot)
+    return out
+
+
+def top_k(probs, k=TOP_K):
+    """Indices and probabilities of the k best classes, best first."""
+    k = min(k, len(probs))
+    idx = np.argpartition(probs, -k)[-k:]
+    idx = idx[np.argsort(probs[idx])[::-1]]
+    return idx, probs[idx]
+
+
+def predict_tta(model, x, k=TOP_K, variants=VARIANTS):
+    """Average the class probabilities over all variants in one batch → (idx, probs)."""
+    batch = augment(x, variants)
+    preds = np.asarray(model.predict(batch, verbose=0))
+    return top_k(preds.mean(axis=0), k)
@@ -0,0 +1,345 @@
+# result_writer.py
+# ------------------------------------------------------------
+# Buffered, batched writer behind db_utils.save_result.
+#
+# Rows are queued from the UI thread and written by a background thread:
+#   * grouped per (table, columns) into one executemany() per group,
+#     committed as a single transaction per flush
+#   * flushed when BAYMAX_RESULT_BATCH rows are pending, when the oldest
+#     row is BAYMAX_RESULT_MAX_AGE seconds old, on flush() and at exit
+#   * if the database is unreachable (OperationalError / InterfaceError /
+#     pool timeout) the batch is appended to a local JSON-lines spill file
+#     (BAYMAX_RESULT_SPILL) and replayed once the database answers again
+#   * any other error (bad column, duplicate key, …) is permanent: the batch
+#     is bisected until the failing rows are isolated, the rest is written
+#     and the failing rows go to a dead-letter file (BAYMAX_RESULT_DEAD_LETTER)
+#     with their error, logged – they are never retried
+
+import atexit
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+from mysql.connector import errors
+
+import db_pool
+
+log = logging.getLogger(__name__)
+
+CURRENT_TIMESTAMP = "CURRENT_TIMESTAMP()"
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _env(name, default, cast):
+    value = os.environ.get(name)
+    return default if value in (None, "") else cast(value)
+
+
+# errors meaning "the database is not reachable right now" – retry later
+OUTAGE_ERRORS = (errors.OperationalError, errors.InterfaceError, errors.PoolError,
+                 ConnectionError, TimeoutError)
+
+
+def is_outage(err) -> bool:
+    return isinstance(err, OUTAGE_ERRORS)
+
+
+class _Outage(Exception):
+    """Raised by _insert_isolating: the DB went away; *unwritten* rows still need a home."""
+
+    def __init__(self, error, unwritten, written, failed):
+        super().__init__(str(error))
+        self.error, self.unwritten, self.written, self.failed = error, unwritten, written, failed
+
+
+class ResultWriter:
+    def __init__(self, connect=None, batch_size=None, max_age=None,
+                 spill_path=None, retry_interval=None, dead_letter_path=None):
+        self.connect        = connect or db_pool.get_connection
+        self.batch_size     = batch_size     or _env("BAYMAX_RESULT_BATCH", 50, int)
+        self.max_age        = max_age        or _env("BAYMAX_RESULT_MAX_AGE", 2.0, float)
+        self.retry_interval = retry_interval or _env("BAYMAX_RESULT_RETRY", 30.0, float)
+        self.spill_path     = spill_path     or _env(
+            "BAYMAX_RESULT_SPILL",
+            os.path.join(os.path.dirname(os.path.abspath(__file__)), "pending_results.jsonl"),
+            str,
+        )
+        self.dead_letter_path = dead_letter_path or _env(
+            "BAYMAX_RESULT_DEAD_LETTER",
+            os.path.join(os.path.dirname(os.path.abspath(self.spill_path)), "failed_results.jsonl"),
+            str,
+        )
+
+        self._cond       = threading.Condition()
+        self._rows       = []          # [(table, row_dict)]
+        self._oldest     = None        # monotonic time of the oldest pending row
+        self._flush_seq  = 0           # bumped by flush() requests
+        self._done_seq   = 0           # last request the worker has completed
+        self._closing    = False
+        self._retry_at   = 0.0         # DB considered down until this time
+        self._spill_pending = (os.path.exists(self.spill_path)
+                               or os.path.exists(self.spill_path + ".replaying"))
+        self._stats = {
+            "submitted": 0, "written": 0, "batches": 0,
+            "spilled": 0, "replayed": 0, "failures": 0,
+            "dead_lettered": 0, "dropped": 0, "last_error": None,
+        }
+
+        self._thread = threading.Thread(target=self._run, name="baymax-result-writer",
+                                        daemon=True)
+        self._thread.start()
+
+    # ── public API ─────────────────────────────────────────
+    def submit(self, table: str, data: dict):
+        """Queue one row; never touches the database on the caller's thread."""
+        if not _IDENTIFIER.match(table) or not all(_IDENTIFIER.match(c) for c in data):
+            raise ValueError(f"Invalid table/column name in insert into {table!r}")
+
+        # resolve the timestamp now – the row may be written seconds later
+        now = datetime.now()
+        row = {k: (now if isinstance(v, str) and v == CURRENT_TIMESTAMP else v)
+               for k, v in data.items()}
+        with self._cond:
+            if self._closing:
+                raise RuntimeError("Result writer is closed.")
+            self._rows.append((table, row))
+            self._stats["submitted"] += 1
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            if len(self._rows) >= self.batch_size:
+                self._cond.notify()
+
+    def flush(self, timeout=None) -> bool:
+        """Write everything queued so far; returns False on timeout."""
+        with self._cond:
+            self._flush_seq += 1
+            target = self._flush_seq
+            self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._done_seq >= target, timeout)
+
+    def close(self, timeout=10.0):
+        with self._cond:
+            if self._closing:
+                return
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        with self._cond:
+            snapshot = dict(self._stats)
+            snapshot["pending"] = len(self._rows)
+        snapshot["spill_pending"] = self._spill_pending
+        return snapshot
+
+    # ── worker ─────────────────────────────────────────────
+    def _due(self):
+        if self._closing or self._flush_seq > self._done_seq:
+            return True
+        if len(self._rows) >= self.batch_size:
+            return True
+        if self._spill_pending and time.monotonic() >= self._retry_at:
+            return True
+        return self._oldest is not None and time.monotonic() - self._oldest >= self.max_age
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._due():
+                    waits = []
+                    if self._oldest is not None:
+                        waits.append(self.max_age - (time.monotonic() - self._oldest))
+                    if self._spill_pending:
+                        waits.append(self._retry_at - time.monotonic())
+                    self._cond.wait(max(0.0, min(waits)) if waits else None)
+                rows, self._rows, self._oldest = self._rows, [], None
+                target, closing = self._flush_seq, self._closing
+
+            # nothing may escape: a dead worker would make flush() wait forever
+            try:
+                if rows:
+                    self._write_or_spill(rows)
+            except Exception as e:
+                self._drop(rows, e)
+            try:
+                if self._spill_pending:
+                    self._replay_spill()
+            except Exception as e:
+                log.exception("Replaying %s failed", self.spill_path)
+                self._mark_down(e)
+
+            with self._cond:
+                self._done_seq = max(self._done_seq, target)
+                self._cond.notify_all()
+                if closing and not self._rows:
+                    return
+
+    def _write_or_spill(self, rows):
+        if time.monotonic() < self._retry_at:
+            self._spill(rows)
+            return
+        try:
+            written, failed = self._insert_isolating(rows)
+        except _Outage as o:
+            self._mark_down(o.error)
+            self._spill(o.unwritten)
+            written, failed = o.written, o.failed
+        self._count_written(written)
+        self._dead_letter(failed)
+
+    def _insert_isolating(self, rows):
+        """
+        Insert *rows*, bisecting any chunk that fails with a permanent error
+        until the bad rows are alone.  Returns (rows written, [(row, error)]);
+        an outage raises _Outage with the rows not yet written.
+        """
+        written, failed, stack = 0, [], [rows]
+        while stack:
+            chunk = stack.pop()
+            try:
+                self._insert(chunk)
+                written += len(chunk)
+            except Exception as e:
+                if is_outage(e):
+                    raise _Outage(e, chunk + [r for c in reversed(stack) for r in c],
+                                  written, failed) from e
+                if len(chunk) == 1:
+                    failed.append((chunk[0], e))
+                else:
+                    mid = len(chunk) // 2
+                    stack += [chunk[mid:], chunk[:mid]]       # first half next
+        return written, failed
+
+    def _insert(self, rows):
+        groups = {}
+        for table, row in rows:
+            cols = tuple(row)
+            groups.setdefault((table, cols), []).append(tuple(row[c] for c in cols))
+
+        conn = self.connect()
+        try:
+            cur = conn.cursor()
+            for (table, cols), values in groups.items():
+                sql = (f"INSERT INTO {table} ({', '.join(cols)}) "
+                       f"VALUES ({', '.join(['%s'] * len(cols))})")
+                cur.executemany(sql, values)   # rewritten into one multi-row INSERT
+            conn.commit()
+            cur.close()
+        except Exception:
+            try:
+                conn.rollback()
+            except Exception:
+                pass
+            raise
+        finally:
+            conn.close()
+
+    def _mark_down(self, err):
+        with self._cond:
+            self._retry_at = time.monotonic() + self.retry_interval
+            self._stats["failures"] += 1
+            self._stats["last_error"] = str(err)
+
+    def _count_written(self, n):
+        if n:
+            with self._cond:
+                self._stats["written"] += n
+                self._stats["batches"] += 1
+
+    def _drop(self, rows, err):
+        log.exception("Result writer lost %d row(s)", len(rows))
+        with self._cond:
+            self._stats["dropped"] += len(rows)
+            self._stats["last_error"] = str(err)
+
+    # ── spill / dead-letter files ──────────────────────────
+    @staticmethod
+    def _append(path, items):
+        with open(path, "a", encoding="utf-8") as fh:
+            for item in items:
+                fh.write(json.dumps(item, default=str) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def _spill(self, rows):
+        if not rows:
+            return
+        self._append(self.spill_path, ({"table": t, "row": r} for t, r in rows))
+        with self._cond:
+            self._stats["spilled"] += len(rows)
+            self._spill_pending = True
+
+    def _dead_letter(self, failed):
+        if not failed:
+            return
+        for (table, _), err in failed:
+            log.error("Insert into %s rejected, row kept in %s: %s",
+                      table, self.dead_letter_path, err)
+        self._append(self.dead_letter_path,
+                     ({"table": t, "row": r, "error": f"{type(e).__name__}: {e}"}
+                      for (t, r), e in failed))
+        with self._cond:
+            self._stats["dead_lettered"] += len(failed)
+            self._stats["last_error"] = str(failed[-1][1])
+
+    def _replay_spill(self):
+        if time.monotonic() < self._retry_at:
+            return
+        replaying = self.spill_path + ".replaying"
+        # a previous replay that failed half-way is retried first
+        if not os.path.exists(replaying):
+            if not os.path.exists(self.spill_path):
+                self._spill_pending = False
+                return
+            os.replace(self.spill_path, replaying)   # new spills go to a fresh file
+
+        rows = []
+        with open(replaying, encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    item = json.loads(line)
+                    rows.append((item["table"], item["row"]))
+                except (ValueError, KeyError):
+                    continue                         # torn write from a crash
+        try:
+            written, failed = self._insert_isolating(rows)
+        except _Outage as o:
+            self._mark_down(o.error)
+            # keep only what is still unwritten, so nothing is inserted twice
+            tmp = replaying + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                for table, row in o.unwritten:
+                    fh.write(json.dumps({"table": table, "row": row}, default=str) + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp, replaying)
+            self._dead_letter(o.failed)
+            with self._cond:
+                self._stats["replayed"] += o.written
+            return
+        self._dead_letter(failed)
+        os.remove(replaying)
+        with self._cond:
+            self._stats["replayed"] += written
+            self._spill_pending = os.path.exists(self.spill_path)
+
+
+# ───────────────────────────────────────────────────────────
+# Process-wide default writer
+# ───────────────────────────────────────────────────────────
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer() -> ResultWriter:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = ResultWriter()
+                atexit.register(_writer.close)
+    return _writer
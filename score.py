@@ -0,0 +1,154 @@
+"""
+Headless batch scoring for the tabular Baymax models.
+
+USAGE
+=====
+python -m score --model heart --in patients.csv --out scored.parquet
+python score.py --model diabetes --in diabetes_prediction_dataset.csv --out scored.csv
+
+The input CSV is streamed in chunks; each chunk is turned into one feature
+matrix (same column order and codes as the PyQt pages, see model_specs.py)
+and scored with a single predict_proba call; binary models are cut at
+BAYMAX_<MODEL>_THRESHOLD like the pages (scoring.py).  Rows with missing or
+unmappable values are kept in the output with an empty prediction.
+Output format follows the extension: .parquet (needs pyarrow) or .csv.
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from model_specs import SPECS, get_spec
+from scoring import DEFAULT_THRESHOLD, decide, threshold
+
+
+# ───────────────────────────────────────────────────────────
+# Scoring
+# ───────────────────────────────────────────────────────────
+def score_matrix(model, X, thresh=DEFAULT_THRESHOLD):
+    """
+    Return (class codes, probability matrix) from one predict_proba pass;
+    binary models are cut at *thresh* (see scoring.decide).
+    """
+    if hasattr(model, "predict_proba"):
+        proba = model.predict_proba(X)
+        codes = np.asarray(model.classes_)[decide(proba, thresh)]
+        return codes, proba
+    codes = np.asarray(model.predict(X))
+    return codes, None
+
+
+def score_chunk(spec, model, features, chunk: pd.DataFrame) -> pd.DataFrame:
+    X, valid = spec.frame_to_matrix(chunk, features)
+    out = chunk.copy()
+
+    prediction = pd.Series(pd.NA, index=chunk.index, dtype=object)
+    confidence = np.full(len(chunk), np.nan)
+    proba_cols = {}
+    if valid.any():
+        thresh = threshold(spec.name)
+        codes, proba = score_matrix(model, spec.model_input(model, X[valid], features), thresh)
+        prediction[valid] = codes
+        if proba is not None:
+            confidence[valid] = proba[np.arange(len(proba)), decide(proba, thresh)]
+            for j, cls in enumerate(model.classes_):
+                col = np.full(len(chunk), np.nan)
+                col[valid] = proba[:, j]
+                proba_cols[f"proba_{cls}"] = col
+
+    out["prediction"] = prediction.convert_dtypes()        # nullable Int64
+    out["label"]      = prediction.map(lambda c: spec.label(c) if c is not pd.NA else "")
+    out["confidence"] = confidence
+    for name, col in proba_cols.items():
+        out[name] = col
+    return out
+
+
+# ───────────────────────────────────────────────────────────
+# Output sinks
+# ───────────────────────────────────────────────────────────
+class _CsvSink:
+    def __init__(self, path):
+        self.path, self.first = path, True
+
+    def write(self, df):
+        df.to_csv(self.path, mode="w" if self.first else "a", header=self.first, index=False)
+        self.first = False
+
+    def close(self):
+        pass
+
+
+class _ParquetSink:
+    def __init__(self, path):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        self.pa, self.pq, self.path, self.writer = pa, pq, path, None
+
+    def write(self, df):
+        table = self.pa.Table.from_pandas(df, preserve_index=False)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = table.cast(self.writer.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+
+
+def open_sink(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in PARQUET_EXTENSIONS:
+        return _ParquetSink(path)
+    if ext == ".csv":
+        return _CsvSink(path)
+    raise ValueError(f"Unsupported output format {ext!r} (use .parquet or .csv)")
+
+
+# ───────────────────────────────────────────────────────────
+# Driver
+# ───────────────────────────────────────────────────────────
+def score_file(model_name, in_path, out_path, chunksize=50_000, log=sys.stderr):
+    spec = get_spec(model_name)
+    model, features = spec.load()
+    sink = open_sink(out_path)
+
+    total, start = 0, time.perf_counter()
+    try:
+        for chunk in pd.read_csv(in_path, chunksize=chunksize, low_memory=False):
+            sink.write(score_chunk(spec, model, features, chunk))
+            total += len(chunk)
+            elapsed = time.perf_counter() - start
+            print(f"{total:>10,} rows  {total / elapsed:>10,.0f} rows/s", file=log)
+    finally:
+        sink.close()
+    return total, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch-score a CSV with a Baymax model.")
+    parser.add_argument("--model", required=True, choices=sorted(SPECS))
+    parser.add_argument("--in", dest="in_path", required=True, help="input CSV")
+    parser.add_argument("--out", dest="out_path", required=True, help="output .parquet or .csv")
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    args = parser.parse_args(argv)
+    if (args.out_path.lower().endswith(PARQUET_EXTENSIONS)
+            and importlib.util.find_spec("pyarrow") is None):
+        parser.error("writing .parquet needs pyarrow – install pyarrow or use --out *.csv")
+
+    total, seconds = score_file(args.model, args.in_path, args.out_path, args.chunksize)
+    print(f"✅ Scored {total:,} rows in {seconds:.2f}s → {args.out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# scoring.py
+# ------------------------------------------------------------
+# One-row scoring shared by the four tabular prediction pages.
+#
+# A page hands over its form values as {feature: code}; the scorer writes
+# them into a preallocated (1, k) float64 row in the bundle's column order
+# (one per thread – the pages score on the task pool), runs the model once
+# through tree_compiler (probabilities only) and derives the class from
+# those probabilities:
+#
+#   binary models   class 1 when P(class 1) >= the model's threshold,
+#                   BAYMAX_<NAME>_THRESHOLD (default 0.5), e.g.
+#                   BAYMAX_HEART_THRESHOLD=0.35 to flag more patients
+#   multi-class     argmax
+#
+# score.py and inference_service.py apply the same decide(), so the
+# pages, batch scoring and the HTTP service agree on every row.  Repeated
+# inputs are answered from prediction_cache without running the model.
+
+import os
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+import prediction_cache
+import tree_compiler
+from model_specs import get_spec
+
+DEFAULT_THRESHOLD = 0.5
+
+Prediction = namedtuple("Prediction", "code label confidence proba classes")
+Prediction.__doc__ = """code / label of the decided class, its probability, and the full
+probability row aligned with classes."""
+
+
+def threshold(name):
+    """Decision threshold on P(positive class) for binary model *name*."""
+    value = os.environ.get(f"BAYMAX_{name.upper()}_THRESHOLD")
+    return float(value) if value else DEFAULT_THRESHOLD
+
+
+def decide(proba, thresh=DEFAULT_THRESHOLD):
+    """Column of the decided class per row (threshold for binary, argmax otherwise)."""
+    if proba.shape[1] == 2:
+        return (proba[:, 1] >= thresh).astype(np.intp)
+    return proba.argmax(axis=1)
+
+
+class TabularScorer:
+    def __init__(self, name):
+        self.spec = get_spec(name)
+        self.version = self.spec.version()
+        self.model, self.features = self.spec.load()
+        self.threshold = threshold(name)
+        self.classes_ = np.asarray(self.model.classes_)
+        self._columns = list(enumerate(self.features))
+        self._scorer  = tree_compiler.for_model(self.model)
+        self._local   = threading.local()
+
+    def row(self, values):
+        """*values* ({feature: code}) written into this thread's preallocated row."""
+        row = getattr(self._local, "row", None)
+        if row is None:
+            row = self._local.row = np.empty((1, len(self.features)), dtype=np.float64)
+        for j, feature in self._columns:
+            row[0, j] = values[feature]                    # KeyError → missing form field
+        return row
+
+    def predict_proba(self, X):
+        if isinstance(self._scorer, tree_compiler.SklearnScorer):
+            X = self.spec.model_input(self.model, X, self.features)   # named-feature models
+        return self._scorer.predict_proba(X)
+
+    def score(self, values) -> Prediction:
+        proba = prediction_cache.get_cache().predict_proba(
+            self.spec.name, self.version, self.row(values), self.predict_proba)
+        j     = decide(proba, self.threshold)[0]
+        code  = self.classes_[j]
+        return Prediction(int(code), self.spec.label(code), float(proba[0, j]), proba[0], self.classes_)
+
+
+# ───────────────────────────────────────────────────────────
+# Process-wide scorers, rebuilt when the artifact changes
+# ───────────────────────────────────────────────────────────
+_lock    = threading.Lock()
+_scorers = {}
+
+
+def get_scorer(name) -> TabularScorer:
+    version = get_spec(name).version()
+    with _lock:
+        scorer = _scorers.get(name)
+        if scorer is None or scorer.version != version:
+            scorer = _scorers[name] = TabularScorer(name)
+            prediction_cache.get_cache().invalidate(name, keep_version=scorer.version)
+        return scorer
@@ -0,0 +1,100 @@
+# startup_benchmark.py
+# ------------------------------------------------------------
+# Startup budget check for the login window.
+#
+#   1. `python -X importtime -c "import login"` – prints the slowest imports
+#      (cumulative) and fails if any heavy ML package got pulled in
+#   2. a fresh interpreter imports login, builds LoginWindow and shows it
+#      (offscreen); the wall time from interpreter start to show() must stay
+#      under --budget seconds
+#
+#   python startup_benchmark.py [--budget 1.5] [--top 15]
+#
+# Exit status is non-zero when a check fails.
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ("tensorflow", "keras", "sklearn", "nltk", "torch", "PIL")
+
+_SHOW_LOGIN = """
+import time, sys
+from PyQt5.QtWidgets import QApplication
+app = QApplication(sys.argv)
+import login
+w = login.LoginWindow()
+w.show()
+app.processEvents()
+print(repr(time.time()))
+print(" ".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return env
+
+
+def import_profile(module="login"):
+    """[(cumulative µs, self µs, module)] from -X importtime, slowest first."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=BASE_DIR, env=_env(), capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cum_us), int(self_us), name.strip()))
+    rows.sort(reverse=True)
+    return rows
+
+
+def time_login_window():
+    """(seconds to a shown LoginWindow, heavy modules loaded) in a fresh interpreter."""
+    code = _SHOW_LOGIN.format(heavy=HEAVY_MODULES)
+    start = time.time()                   # wall clock: spans the process boundary
+    proc = subprocess.run([sys.executable, "-c", code],
+                          cwd=BASE_DIR, env=_env(), capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(f"showing LoginWindow failed:\n{proc.stderr[-2000:]}")
+    shown_at, heavy = proc.stdout.splitlines()[-2:]
+    return float(shown_at) - start, heavy.split()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Check that the login window opens within a startup budget.")
+    ap.add_argument("--budget", type=float, default=1.5,
+                    help="max seconds from interpreter start to LoginWindow.show()")
+    ap.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    args = ap.parse_args(argv)
+
+    failed = False
+    rows = import_profile()
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cum, own, name in rows[: args.top]:
+        print(f"{cum / 1000:>14.1f} {own / 1000:>9.1f}  {name}")
+
+    top_level = {name.strip().split(".")[0] for _, _, name in rows}
+    heavy = sorted(top_level.intersection(HEAVY_MODULES))
+    if heavy:
+        failed = True
+        print(f"\nFAIL: `import login` loads {', '.join(heavy)}")
+
+    seconds, heavy_at_show = time_login_window()
+    verdict = "ok" if seconds <= args.budget else "FAIL"
+    print(f"\nLoginWindow shown after {seconds:.3f} s (budget {args.budget:.2f} s): {verdict}")
+    if heavy_at_show:
+        print(f"FAIL: loaded before the window was shown: {', '.join(heavy_at_show)}")
+    failed = failed or seconds > args.budget or bool(heavy_at_show)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
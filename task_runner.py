@@ -0,0 +1,175 @@
+# task_runner.py
+# ------------------------------------------------------------
+# Runs inference and DB writes off the GUI thread.
+#
+#   runner = task_runner.get_runner()
+#   runner.submit(fn, *args, on_result=..., on_error=..., owner=self)
+#
+# fn runs on a QThreadPool worker.  It must not touch widgets: read inputs in
+# the slot, pass them in, and update the UI in on_result / on_error, which are
+# delivered through Qt signals on the GUI thread.
+#
+# Tasks submitted with owner=<window> are cancelled by cancel_owner(window)
+# (call it from closeEvent): queued tasks are dropped, running ones finish
+# but their callbacks are not called.
+#
+# Long tasks can report progress: with on_progress=..., fn is called with a
+# `progress` keyword – progress(value) emits the value to the GUI thread and
+# raises Cancelled once the task has been cancelled, so loops stop early.
+#
+# Every task records how long it waited in the queue and how long it ran;
+# runner.stats() aggregates both per task name.  BAYMAX_TASK_TIMING=1 prints
+# one line per task.  BAYMAX_TASK_THREADS sets the pool size.
+
+import os
+import threading
+import time
+import traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class Cancelled(Exception):
+    pass
+
+
+class TaskSignals(QObject):
+    progress = pyqtSignal(object)
+    result   = pyqtSignal(object)
+    error    = pyqtSignal(object)           # the exception
+    done     = pyqtSignal(object)           # the Task, after result/error
+
+
+class Task(QRunnable):
+    def __init__(self, fn, args, kwargs, name, owner):
+        super().__init__()
+        self.setAutoDelete(False)           # the runner keeps the Python object alive
+        self.fn, self.args, self.kwargs = fn, args, kwargs
+        self.name      = name
+        self.owner     = owner
+        self.signals   = TaskSignals()
+        self.cancelled = threading.Event()
+        self.submitted = time.perf_counter()
+        self.queue_wait = None              # seconds
+        self.exec_time  = None              # seconds
+        self.status     = "queued"          # queued/running/ok/failed/cancelled
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def report(self, value):
+        if self.cancelled.is_set():
+            raise Cancelled()
+        self.signals.progress.emit(value)
+
+    def run(self):
+        started = time.perf_counter()
+        self.queue_wait = started - self.submitted
+        if self.cancelled.is_set():
+            self.status = "cancelled"
+            self.signals.done.emit(self)
+            return
+
+        self.status = "running"
+        try:
+            value, failed = self.fn(*self.args, **self.kwargs), False
+        except Cancelled:
+            value, failed = None, False
+        except Exception as e:
+            value, failed = e, True
+            traceback.print_exc()
+        self.exec_time = time.perf_counter() - started
+
+        if self.cancelled.is_set():         # window closed meanwhile: drop the result
+            self.status = "cancelled"
+        elif failed:
+            self.status = "failed"
+            self.signals.error.emit(value)
+        else:
+            self.status = "ok"
+            self.signals.result.emit(value)
+        self.signals.done.emit(self)
+
+
+class TaskRunner(QObject):
+    def __init__(self, max_threads=None, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        max_threads = max_threads or int(os.environ.get("BAYMAX_TASK_THREADS", 0))
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self.verbose = os.environ.get("BAYMAX_TASK_TIMING") == "1"
+        self._active = set()
+        self._stats  = {}
+
+    # ── public API ─────────────────────────────────────────
+    def submit(self, fn, *args, on_result=None, on_error=None, on_progress=None,
+               owner=None, name=None, **kwargs) -> Task:
+        task = Task(fn, args, kwargs, name or getattr(fn, "__qualname__", repr(fn)), owner)
+        if on_progress is not None:
+            task.signals.progress.connect(on_progress)
+            kwargs["progress"] = task.report
+        if on_result is not None:
+            task.signals.result.connect(on_result)
+        if on_error is not None:
+            task.signals.error.connect(on_error)
+        task.signals.done.connect(self._finished)
+        self._active.add(task)
+        self.pool.start(task)
+        return task
+
+    def cancel_owner(self, owner):
+        """Cancel every unfinished task submitted with *owner*."""
+        for task in list(self._active):
+            if task.owner is owner:
+                task.cancel()
+                if self.pool.tryTake(task):      # still queued: never runs
+                    task.status = "cancelled"
+                    self._finished(task)
+
+    def stats(self) -> dict:
+        """Per task name: counts and queue-wait / execution seconds (mean, max)."""
+        out = {}
+        for name, s in self._stats.items():
+            ran = max(s["ran"], 1)
+            out[name] = {
+                "count": s["count"], "failed": s["failed"], "cancelled": s["cancelled"],
+                "queue_wait_mean": s["wait_sum"] / max(s["count"], 1),
+                "queue_wait_max":  s["wait_max"],
+                "exec_mean":       s["exec_sum"] / ran,
+                "exec_max":        s["exec_max"],
+            }
+        return out
+
+    # ── bookkeeping (GUI thread) ───────────────────────────
+    def _finished(self, task):
+        self._active.discard(task)
+        s = self._stats.setdefault(task.name, {
+            "count": 0, "ran": 0, "failed": 0, "cancelled": 0,
+            "wait_sum": 0.0, "wait_max": 0.0, "exec_sum": 0.0, "exec_max": 0.0})
+        s["count"] += 1
+        s["failed"]    += task.status == "failed"
+        s["cancelled"] += task.status == "cancelled"
+        wait = task.queue_wait if task.queue_wait is not None else (
+            time.perf_counter() - task.submitted)
+        s["wait_sum"] += wait
+        s["wait_max"]  = max(s["wait_max"], wait)
+        if task.exec_time is not None:
+            s["ran"] += 1
+            s["exec_sum"] += task.exec_time
+            s["exec_max"]  = max(s["exec_max"], task.exec_time)
+        if self.verbose:
+            exec_ms = f"{task.exec_time * 1000:.1f} ms" if task.exec_time is not None else "-"
+            print(f"[task] {task.name}: {task.status}, queued {wait * 1000:.1f} ms, "
+                  f"ran {exec_ms}")
+
+
+_runner = None
+
+
+def get_runner() -> TaskRunner:
+    """Process-wide runner (create it on the GUI thread)."""
+    global _runner
+    if _runner is None:
+        _runner = TaskRunner()
+    return _runner
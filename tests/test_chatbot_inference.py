@@ -0,0 +1,165 @@
+import logging
+
+import numpy as np
+import pytest
+
+import chatbot_inference
+from chatbot_inference import (KerasBackend, NumpyDenseBackend, TFFunctionBackend, TFLiteBackend,
+                               UnsupportedBackend, make_backend)
+
+TOLERANCE = 1e-5
+TFLITE_TOLERANCE = 1e-2                              # float16 weights
+N_IN, N_HIDDEN, N_OUT = 24, 16, 5
+
+
+def _bag_of_words(n=64, seed=0):
+    X = (np.random.default_rng(seed).random((n, N_IN)) < 0.2).astype(np.float32)
+    X[0] = 0                                          # empty sentence
+    return X
+
+
+# ───────────────────────────────────────────────────────────
+# Against Keras (needs TensorFlow)
+# ───────────────────────────────────────────────────────────
+def _keras_model():
+    keras = pytest.importorskip("tensorflow").keras
+    keras.utils.set_random_seed(0)
+    model = keras.Sequential([
+        keras.Input((N_IN,)),
+        keras.layers.Dense(N_HIDDEN),
+        keras.layers.BatchNormalization(),
+        keras.layers.Activation("relu"),
+        keras.layers.Dropout(0.5),
+        keras.layers.Dense(N_HIDDEN, activation="relu"),
+        keras.layers.Dense(N_OUT, activation="softmax"),
+    ])
+    bn = model.layers[1]                              # non-trivial moving statistics
+    rng = np.random.default_rng(1)
+    bn.set_weights([rng.uniform(0.5, 2.0, N_HIDDEN), rng.normal(0, 0.5, N_HIDDEN),
+                    rng.normal(0, 0.5, N_HIDDEN), rng.uniform(0.5, 2.0, N_HIDDEN)])
+    return model
+
+
+def _assert_matches_keras(model, backend, tolerance=TOLERANCE):
+    X = _bag_of_words()
+    expected = model.predict(X, verbose=0)
+    got = np.asarray(backend.predict(X))
+    assert np.abs(got - expected).max() < tolerance
+    assert (got.argmax(axis=1) == expected.argmax(axis=1)).all()
+
+
+def test_numpy_backend_matches_keras():
+    model = _keras_model()
+    _assert_matches_keras(model, NumpyDenseBackend(model))
+
+
+def test_tf_function_backend_matches_keras():
+    model = _keras_model()
+    _assert_matches_keras(model, TFFunctionBackend(model))
+
+
+def test_tflite_backend_matches_keras(tmp_path, monkeypatch):
+    from tflite_export import convert
+    from tflite_model import variant_path
+    model = _keras_model()
+    model_path = str(tmp_path / "chatbot_model.h5")
+    with open(variant_path(model_path, "float16"), "wb") as f:
+        f.write(convert(model, "float16"))
+    monkeypatch.setenv("BAYMAX_TFLITE_VARIANT", "float16")
+    _assert_matches_keras(model, TFLiteBackend(model_path=model_path), TFLITE_TOLERANCE)
+
+
+def test_make_backend_verifies_against_keras(monkeypatch):
+    monkeypatch.setenv("BAYMAX_CHATBOT_VERIFY", "1")
+    assert make_backend(_keras_model(), "numpy").name == "numpy"
+
+
+# ───────────────────────────────────────────────────────────
+# Without TensorFlow: stand-in layers exposing the Keras API the backend reads
+# ───────────────────────────────────────────────────────────
+def _layer(kind, weights=(), activation="linear", config=None):
+    def act(x):
+        return x
+    act.__name__ = activation
+    cls = type(kind, (), {"get_weights": lambda self: [np.array(w) for w in weights],
+                          "get_config": lambda self: dict(config or {})})
+    layer = cls()
+    layer.activation = act
+    return layer
+
+
+def _fake_model(*layers):
+    return type("Model", (), {"layers": list(layers)})()
+
+
+def test_batchnorm_is_folded_into_the_dense_layer():
+    rng = np.random.default_rng(2)
+    W, b = rng.normal(size=(N_IN, N_HIDDEN)), rng.normal(size=N_HIDDEN)
+    gamma, beta = rng.uniform(0.5, 2.0, N_HIDDEN), rng.normal(size=N_HIDDEN)
+    mean, var = rng.normal(size=N_HIDDEN), rng.uniform(0.5, 2.0, N_HIDDEN)
+    W2, b2 = rng.normal(size=(N_HIDDEN, N_OUT)), rng.normal(size=N_OUT)
+    model = _fake_model(
+        _layer("Dense", (W, b)),
+        _layer("BatchNormalization", (gamma, beta, mean, var), config={"epsilon": 1e-3}),
+        _layer("Activation", activation="relu"),
+        _layer("Dropout"),
+        _layer("Dense", (W2, b2), activation="softmax"),
+    )
+    X = _bag_of_words()
+    h = np.maximum(gamma * (X @ W + b - mean) / np.sqrt(var + 1e-3) + beta, 0)
+    expected = chatbot_inference._softmax(h @ W2 + b2)
+    assert np.abs(NumpyDenseBackend(model).predict(X) - expected).max() < TOLERANCE
+
+
+def test_predict_leaves_the_input_untouched():
+    model = _fake_model(_layer("Activation", activation="relu"),
+                        _layer("Dense", (np.eye(3), np.zeros(3)), activation="softmax"))
+    X = np.array([[-1.0, 0.5, 2.0]], dtype=np.float32)
+    NumpyDenseBackend(model).predict(X)
+    assert X.tolist() == [[-1.0, 0.5, 2.0]]
+
+
+def test_unsupported_layer_raises():
+    with pytest.raises(UnsupportedBackend, match="LSTM"):
+        NumpyDenseBackend(_fake_model(_layer("LSTM")))
+
+
+def test_unsupported_model_falls_back_to_keras_with_warning(caplog):
+    model = _fake_model(_layer("Dense", (np.eye(3), np.zeros(3)), activation="gelu"))
+    with caplog.at_level(logging.WARNING, logger="chatbot_inference"):
+        backend = make_backend(model, "numpy")
+    assert isinstance(backend, KerasBackend)
+    assert "gelu" in caplog.text
+
+
+# ───────────────────────────────────────────────────────────
+# load_backend: tflite needs only the interpreter
+# ───────────────────────────────────────────────────────────
+@pytest.fixture
+def exported_tflite(monkeypatch):
+    import tflite_model
+    found = {"path": "chatbot_model.int8.tflite"}
+    monkeypatch.setattr(tflite_model, "find_tflite", lambda model_path, variant=None: found["path"])
+    monkeypatch.setattr(tflite_model, "TFLiteModel", lambda path: ("interpreter", path))
+    monkeypatch.delenv("BAYMAX_CHATBOT_VERIFY", raising=False)
+    return found
+
+
+def test_tflite_backend_does_not_load_keras(exported_tflite, monkeypatch):
+    def no_keras(model_path):
+        raise AssertionError("Keras model loaded for the tflite backend")
+    monkeypatch.setattr(chatbot_inference, "load_keras_model", no_keras)
+    model, backend = chatbot_inference.load_backend(kind="tflite")
+    assert model is None
+    assert backend.tflite == ("interpreter", "chatbot_model.int8.tflite")
+
+
+def test_missing_tflite_falls_back_to_keras(exported_tflite, monkeypatch, caplog):
+    exported_tflite["path"] = None
+    keras_model = object()
+    monkeypatch.setattr(chatbot_inference, "load_keras_model", lambda model_path: keras_model)
+    with caplog.at_level(logging.WARNING, logger="chatbot_inference"):
+        model, backend = chatbot_inference.load_backend(kind="tflite")
+    assert model is keras_model
+    assert isinstance(backend, KerasBackend)
+    assert "tflite" in caplog.text
@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.ensemble import (
+    ExtraTreesClassifier,
+    GradientBoostingClassifier,
+    HistGradientBoostingClassifier,
+    RandomForestClassifier,
+)
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+import tree_compiler
+
+TOLERANCE = 1e-12
+
+
+def _data(n_classes=2, nan_fraction=0.0, seed=0):
+    X, y = make_classification(n_samples=600, n_features=8, n_informative=5,
+                               n_classes=n_classes, random_state=seed)
+    X[:, 0] *= 1000.0                                # scales differ, like the real forms
+    if nan_fraction:
+        rng = np.random.default_rng(seed)
+        X[rng.random(X.shape) < nan_fraction] = np.nan
+    return X[:450], y[:450], X[450:], y[450:]
+
+
+MODELS = {
+    "random_forest": (lambda: RandomForestClassifier(n_estimators=30, random_state=0), 2, 0.0),
+    "random_forest_multiclass": (lambda: RandomForestClassifier(n_estimators=30, random_state=0), 3, 0.0),
+    "extra_trees": (lambda: ExtraTreesClassifier(n_estimators=30, random_state=0), 2, 0.0),
+    "decision_tree": (lambda: DecisionTreeClassifier(max_depth=8, random_state=0), 3, 0.0),
+    "gb_binary": (lambda: GradientBoostingClassifier(n_estimators=40, random_state=0), 2, 0.0),
+    "gb_multiclass": (lambda: GradientBoostingClassifier(n_estimators=40, random_state=0), 3, 0.0),
+    "gb_exponential": (lambda: GradientBoostingClassifier(loss="exponential", n_estimators=40,
+                                                          random_state=0), 2, 0.0),
+    "hgb_nan": (lambda: HistGradientBoostingClassifier(max_iter=40, random_state=0), 2, 0.1),
+    "hgb_multiclass_nan": (lambda: HistGradientBoostingClassifier(max_iter=40, random_state=0), 3, 0.1),
+    "scaler_pipeline_gb": (lambda: Pipeline([("scaler", StandardScaler()),
+                                             ("clf", GradientBoostingClassifier(
+                                                 n_estimators=40, random_state=0))]), 2, 0.0),
+    "scaler_pipeline_rf": (lambda: Pipeline([("scaler", StandardScaler()),
+                                             ("clf", RandomForestClassifier(
+                                                 n_estimators=30, random_state=0))]), 2, 0.0),
+}
+
+
+@pytest.mark.parametrize("name", sorted(MODELS))
+def test_parity_with_sklearn(name):
+    factory, n_classes, nan_fraction = MODELS[name]
+    X_train, y_train, X_test, _ = _data(n_classes, nan_fraction)
+    model = factory().fit(X_train, y_train)
+
+    compiled = tree_compiler.compile_model(model)
+    proba = compiled.evaluate(X_test)
+
+    assert (compiled.classes_[proba.argmax(axis=1)] == model.predict(X_test)).all()
+    assert np.abs(proba - model.predict_proba(X_test)).max() < TOLERANCE
+
+
+def test_single_row_uses_compiled_path():
+    X_train, y_train, X_test, _ = _data()
+    model = RandomForestClassifier(n_estimators=20, random_state=0).fit(X_train, y_train)
+    scorer = tree_compiler.for_model(model)
+
+    assert isinstance(scorer, tree_compiler.CompiledEnsemble)
+    codes, proba = scorer.predict_with_proba(X_test[:1])
+    assert codes[0] == model.predict(X_test[:1])[0]
+    assert np.abs(proba - model.predict_proba(X_test[:1])).max() < TOLERANCE
+    assert tree_compiler.for_model(model) is scorer          # compiled once
+
+
+@pytest.mark.parametrize("model", [
+    LogisticRegression(max_iter=500),
+    Pipeline([("scaler", MinMaxScaler()), ("clf", DecisionTreeClassifier(random_state=0))]),
+], ids=["logistic_regression", "unsupported_pipeline_step"])
+def test_unsupported_model_falls_back_to_sklearn(model):
+    X_train, y_train, X_test, _ = _data()
+    model.fit(X_train, y_train)
+
+    with pytest.raises(tree_compiler.UnsupportedModel):
+        tree_compiler.compile_model(model)
+    scorer = tree_compiler.for_model(model)
+    assert isinstance(scorer, tree_compiler.SklearnScorer)
+    codes, proba = scorer.predict_with_proba(X_test)
+    assert (codes == model.predict(X_test)).all()
+    assert np.array_equal(proba, model.predict_proba(X_test))
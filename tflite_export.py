@@ -0,0 +1,242 @@
+"""
+TFLite export of the prescription CNN and the chatbot model for CPU-only
+machines, plus an accuracy / latency / memory comparison with the originals.
+
+USAGE
+=====
+python tflite_export.py prescription --mode int8 --images-dir training_images/
+python tflite_export.py prescription --mode float16
+python tflite_export.py chatbot --mode int8
+python tflite_export.py report --images-dir training_images/ [--limit 500]
+
+Modes
+-----
+  int8      full-integer weights and activations; needs a calibration set:
+            prescription – images listed in training_labels.csv (IMAGE column,
+            looked up in --images-dir), chatbot – the intents.json patterns
+            encoded with the words.pkl vocabulary
+  float16   float16 weights, float32 compute
+  dynamic   int8 weights, float activations (no calibration set needed)
+
+Outputs go next to the source model as <name>.<mode>.tflite, where
+robust_load_model(..., loader="tflite") / BAYMAX_PRESCRIPTION_LOADER=tflite
+and BAYMAX_CHATBOT_BACKEND=tflite pick them up.  Inputs and outputs stay
+float32, so the files are drop-in replacements.
+"""
+
+import argparse
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from tflite_model import VARIANTS, TFLiteModel, variant_path
+
+PRESCRIPTION_MODEL = "prescription_model.keras"
+CHATBOT_MODEL      = "chatbot_model.h5"
+TRAIN_CSV_PATH     = "training_labels.csv"
+
+
+# ───────────────────────────────────────────────────────────
+# Calibration / evaluation data
+# ───────────────────────────────────────────────────────────
+def labelled_images(images_dir, csv_path=TRAIN_CSV_PATH, limit=None, seed=0):
+    """[(path, MEDICINE_NAME)] for rows of the CSV whose image exists, shuffled."""
+    import pandas as pd
+    df = pd.read_csv(csv_path).dropna()
+    df = df.sample(frac=1.0, random_state=seed)
+    rows = [(os.path.join(images_dir, name), med)
+            for name, med in zip(df["IMAGE"], df["MEDICINE_NAME"])
+            if os.path.exists(os.path.join(images_dir, name))]
+    return rows[:limit] if limit else rows
+
+
+def image_batch(paths, img_size):
+    from prescription_batch import decode
+    X = np.empty((len(paths), img_size, img_size, 3), dtype=np.float32)
+    for i, p in enumerate(paths):
+        np.multiply(decode(p, img_size), 1.0 / 255.0, out=X[i])
+    return X
+
+
+def chatbot_samples():
+    """(bag-of-words matrix, intent tags) for every pattern in intents.json."""
+    from bow_encoder import BowEncoder
+    from first_aid_chatbot import clean_up_sentence
+    words   = pickle.load(open("words.pkl", "rb"))
+    intents = json.load(open("intents.json", encoding="utf-8"))
+    pairs   = [(p, i["tag"]) for i in intents["intents"] for p in i.get("patterns", [])]
+    X = BowEncoder(words, tokenize=clean_up_sentence).encode_batch([p for p, _ in pairs])
+    return X, [t for _, t in pairs]
+
+
+# ───────────────────────────────────────────────────────────
+# Export
+# ───────────────────────────────────────────────────────────
+def _converter(model):
+    import tensorflow as tf
+    try:
+        return tf.lite.TFLiteConverter.from_keras_model(model)
+    except Exception:                          # Keras 3 models: go through a SavedModel
+        saved = tempfile.mkdtemp(prefix="baymax_savedmodel_")
+        model.export(saved)
+        return tf.lite.TFLiteConverter.from_saved_model(saved)
+
+
+def convert(model, mode, calibration=None):
+    """Keras model → TFLite flatbuffer bytes."""
+    import tensorflow as tf
+    converter = _converter(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if mode == "float16":
+        converter.target_spec.supported_types = [tf.float16]
+    elif mode == "int8":
+        if calibration is None or not len(calibration):
+            raise ValueError("int8 export needs a calibration set")
+        converter.representative_dataset = lambda: ([calibration[i:i + 1]]
+                                                    for i in range(len(calibration)))
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    elif mode != "dynamic":
+        raise ValueError(f"Unknown mode {mode!r}; choose from {VARIANTS}")
+    return converter.convert()
+
+
+def export_prescription(mode, images_dir=None, n_calibration=200):
+    from prescription import IMG_SIZE, robust_load_model
+    model = robust_load_model(PRESCRIPTION_MODEL, loader="keras")
+    calibration = None
+    if mode == "int8":
+        if not images_dir:
+            raise SystemExit("--images-dir is required for an int8 prescription export")
+        rows = labelled_images(images_dir, limit=n_calibration)
+        if not rows:
+            raise SystemExit(f"No images from {TRAIN_CSV_PATH} found in {images_dir}")
+        calibration = image_batch([p for p, _ in rows], IMG_SIZE)
+    return _write(PRESCRIPTION_MODEL, mode, convert(model, mode, calibration))
+
+
+def export_chatbot(mode):
+    from tensorflow.keras.models import load_model
+    model = load_model(CHATBOT_MODEL)
+    calibration = chatbot_samples()[0] if mode == "int8" else None
+    return _write(CHATBOT_MODEL, mode, convert(model, mode, calibration))
+
+
+def _write(model_path, mode, flatbuffer):
+    out = variant_path(model_path, mode)
+    with open(out, "wb") as f:
+        f.write(flatbuffer)
+    print(f"{out}: {len(flatbuffer) / 1e6:.2f} MB")
+    return out
+
+
+# ───────────────────────────────────────────────────────────
+# Comparison report
+# ───────────────────────────────────────────────────────────
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource                        # peak, not current – best effort
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _measure(name, load, X, y_true, reference=None, repeats=50):
+    before = _rss_bytes()
+    t0 = time.perf_counter()
+    model = load()                             # Keras model or TFLiteModel – same predict()
+    load_s = time.perf_counter() - t0
+
+    top1   = np.asarray(model.predict(X, verbose=0)).argmax(axis=1)
+    memory = _rss_bytes() - before
+
+    one = X[:1]
+    model.predict(one, verbose=0)              # warm-up
+    t0 = time.perf_counter()
+    for _ in range(repeats):
+        model.predict(one, verbose=0)
+    latency = (time.perf_counter() - t0) / repeats * 1000
+
+    row = {"model": name, "load_s": load_s, "ms_per_sample": latency,
+           "memory_mb": memory / 1e6,
+           "accuracy": float((top1 == y_true).mean()) if y_true is not None else None,
+           "agreement": float((top1 == reference).mean()) if reference is not None else None}
+    return row, top1
+
+
+def _print_report(title, rows):
+    print(f"\n{title}")
+    print(f"{'model':<34} {'MB file':>8} {'load s':>7} {'ms/sample':>10} "
+          f"{'RSS MB':>7} {'accuracy':>9} {'agree':>7}")
+    for path, r in rows:
+        size = os.path.getsize(path) / 1e6
+        acc  = f"{r['accuracy']:.3f}" if r["accuracy"] is not None else "-"
+        agr  = f"{r['agreement']:.3f}" if r["agreement"] is not None else "-"
+        print(f"{r['model']:<34} {size:>8.2f} {r['load_s']:>7.2f} {r['ms_per_sample']:>10.3f} "
+              f"{r['memory_mb']:>7.1f} {acc:>9} {agr:>7}")
+
+
+def report(images_dir=None, limit=500):
+    # chatbot: every intents.json pattern, accuracy against its own tag
+    from tensorflow.keras.models import load_model
+    X, tags = chatbot_samples()
+    classes = pickle.load(open("classes.pkl", "rb"))
+    y = np.array([classes.index(t) if t in classes else -1 for t in tags])
+    base, ref = _measure(CHATBOT_MODEL, lambda: load_model(CHATBOT_MODEL), X, y)
+    rows = [(CHATBOT_MODEL, base)]
+    for v in VARIANTS:
+        path = variant_path(CHATBOT_MODEL, v)
+        if os.path.exists(path):
+            rows.append((path, _measure(path, lambda p=path: TFLiteModel(p), X, y, ref)[0]))
+    _print_report(f"Chatbot – {len(X)} intent patterns", rows)
+
+    # prescription: labelled images from training_labels.csv
+    if not images_dir:
+        print("\nPrescription: pass --images-dir to compare on labelled images")
+        return
+    from prescription import IMG_SIZE, robust_load_model
+    from label_table import build_label_table
+    labels = build_label_table(TRAIN_CSV_PATH)
+    index  = {m: i for i, m in enumerate(labels.classes_)}
+    sample = labelled_images(images_dir, limit=limit, seed=1)
+    X = image_batch([p for p, _ in sample], IMG_SIZE)
+    y = np.array([index.get(m, -1) for _, m in sample])
+    base, ref = _measure(PRESCRIPTION_MODEL,
+                         lambda: robust_load_model(PRESCRIPTION_MODEL, loader="keras"), X, y)
+    rows = [(PRESCRIPTION_MODEL, base)]
+    for v in VARIANTS:
+        path = variant_path(PRESCRIPTION_MODEL, v)
+        if os.path.exists(path):
+            rows.append((path, _measure(path, lambda p=path: TFLiteModel(p), X, y, ref)[0]))
+    _print_report(f"Prescription – {len(X)} labelled images", rows)
+
+
+# ───────────────────────────────────────────────────────────
+# CLI
+# ───────────────────────────────────────────────────────────
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Export TFLite models and compare them.")
+    ap.add_argument("target", choices=("prescription", "chatbot", "report"))
+    ap.add_argument("--mode", choices=VARIANTS, default="int8")
+    ap.add_argument("--images-dir", help="folder holding the images named in training_labels.csv")
+    ap.add_argument("--calibration", type=int, default=200,
+                    help="images in the int8 calibration set")
+    ap.add_argument("--limit", type=int, default=500, help="images used by the report")
+    args = ap.parse_args(argv)
+
+    if args.target == "prescription":
+        export_prescription(args.mode, args.images_dir, args.calibration)
+    elif args.target == "chatbot":
+        export_chatbot(args.mode)
+    else:
+        report(args.images_dir, args.limit)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+# tflite_model.py
+# ------------------------------------------------------------
+# TFLite interpreter wrapped in the small slice of the Keras model API the
+# app uses (predict / predict_on_batch / __call__), so an exported
+# .tflite file can stand in for prescription_model.keras or
+# chatbot_model.h5.  Export them with tflite_export.py.
+#
+# The interpreter comes from, in order: tflite_runtime, ai_edge_litert,
+# tensorflow.lite – the first two avoid importing TensorFlow at all.
+# Quantized (int8/uint8) inputs and outputs are (de)quantized here, and the
+# batch dimension is resized on demand.
+
+import os
+import threading
+
+import numpy as np
+
+# exported variants, most preferred first (see tflite_export.py)
+VARIANTS = ("int8", "float16", "dynamic")
+
+
+def _interpreter_class():
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        try:
+            from ai_edge_litert.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+    return Interpreter
+
+
+def variant_path(model_path: str, variant: str) -> str:
+    return f"{os.path.splitext(model_path)[0]}.{variant}.tflite"
+
+
+def find_tflite(model_path: str, variant=None):
+    """The exported .tflite for *model_path* (a given variant, or the first found)."""
+    if model_path.endswith(".tflite"):
+        return model_path if os.path.exists(model_path) else None
+    for v in ((variant,) if variant else VARIANTS):
+        path = variant_path(model_path, v)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+class TFLiteModel:
+    def __init__(self, path, num_threads=None):
+        self.path = path
+        num_threads = num_threads or int(os.environ.get("BAYMAX_TFLITE_THREADS", 0)) or os.cpu_count()
+        self.interpreter = _interpreter_class()(model_path=path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input  = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch  = int(self._input["shape"][0])
+        self._lock   = threading.Lock()        # one interpreter, not re-entrant
+
+    @property
+    def input_shape(self):
+        return tuple(int(d) for d in self._input["shape"])
+
+    def predict(self, X, verbose=0):
+        X = np.asarray(X, dtype=np.float32)
+        with self._lock:
+            if len(X) != self._batch:
+                self.interpreter.resize_tensor_input(self._input["index"], list(X.shape))
+                self.interpreter.allocate_tensors()
+                self._input  = self.interpreter.get_input_details()[0]
+                self._output = self.interpreter.get_output_details()[0]
+                self._batch  = len(X)
+            self.interpreter.set_tensor(self._input["index"], self._quantize(X))
+            self.interpreter.invoke()
+            return self._dequantize(self.interpreter.get_tensor(self._output["index"]))
+
+    predict_on_batch = predict
+
+    def __call__(self, X, training=False):
+        return self.predict(X)
+
+    # ── quantization ───────────────────────────────────────
+    def _quantize(self, X):
+        dtype = self._input["dtype"]
+        if dtype == np.float32:
+            return X
+        scale, zero = self._input["quantization"]
+        info = np.iinfo(dtype)
+        return np.clip(np.round(X / scale + zero), info.min, info.max).astype(dtype)
+
+    def _dequantize(self, Y):
+        if self._output["dtype"] == np.float32:
+            return Y.copy()                     # the tensor buffer is reused by invoke()
+        scale, zero = self._output["quantization"]
+        return (Y.astype(np.float32) - zero) * scale
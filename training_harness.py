@@ -0,0 +1,307 @@
+"""
+Train the tabular Baymax models from their CSVs, in parallel.
+
+USAGE
+=====
+python training_harness.py                         # every model whose CSV is present
+python training_harness.py heart bmi --out-dir models/
+python training_harness.py --workers 2 --cores 8
+python training_harness.py liver diabetes --variant hgb [--variant lgbm]
+
+Each model is trained in its own process (ProcessPoolExecutor, one model per
+core, a fresh process per model so peak RSS is per model).  The cores are
+split between the workers: every search gets n_jobs = cores // workers and
+BLAS/OpenMP pools are capped to the same budget, so nested parallelism never
+oversubscribes the machine.
+
+Features are built with model_specs.py – the same column order and category
+codes the pages send – and every artifact is saved as the bundle the pages
+and score.py load:
+
+    {"model": estimator, "features": [...]}
+
+--variant trains an alternative estimator next to the default one, saved as
+<stem>.<variant>.joblib (hgb – HistGradientBoostingClassifier, lgbm –
+LightGBM, optional dependency).  The pages load it when
+BAYMAX_<MODEL>_VARIANT names it, e.g. BAYMAX_LIVER_VARIANT=hgb; compare the
+variants with boosting_benchmark.py.
+
+Models whose training CSV is not in the tree (Liver_disease_data.csv is not
+shipped) are skipped with a note, not counted as failures.  A summary (best
+params, CV/test accuracy, fit seconds, peak RSS, skipped models) is written
+to <out-dir>/training_report.json.
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+BASE_DIR    = os.path.dirname(os.path.abspath(__file__))
+RANDOM_SEED = 42
+TEST_SIZE   = 0.20
+CV_FOLDS    = 5
+
+
+# ───────────────────────────────────────────────────────────
+# Model recipes
+# ───────────────────────────────────────────────────────────
+def _gradient_boosting():
+    from sklearn.ensemble import GradientBoostingClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    return Pipeline([("scaler", StandardScaler()),
+                     ("clf", GradientBoostingClassifier(random_state=RANDOM_SEED,
+                                                        n_iter_no_change=10))])
+
+
+def _liver_pipeline():
+    from liver_training import build_pipeline       # same pipeline as the liver script
+    return build_pipeline(RANDOM_SEED)
+
+
+def _hist_gradient_boosting():
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    from sklearn.pipeline import Pipeline
+    # binned features: no scaler needed, trees are evaluated in compiled code
+    return Pipeline([("clf", HistGradientBoostingClassifier(random_state=RANDOM_SEED,
+                                                            early_stopping=True,
+                                                            n_iter_no_change=10))])
+
+
+def _lightgbm():
+    from lightgbm import LGBMClassifier                  # optional dependency
+    from sklearn.pipeline import Pipeline
+    return Pipeline([("clf", LGBMClassifier(random_state=RANDOM_SEED, verbose=-1))])
+
+
+def _random_forest():
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.pipeline import Pipeline
+    return Pipeline([("clf", RandomForestClassifier(random_state=RANDOM_SEED))])
+
+
+# name → csv, target column, estimator factory, grid, and whether the page
+# passes a DataFrame (fit on named columns) or a bare array
+RECIPES = {
+    "heart": {
+        "csv": "heart_disease.csv", "target": "target", "as_frame": True,
+        "estimator": _random_forest,
+        "grid": {"clf__n_estimators": [200, 400], "clf__max_depth": [None, 6],
+                 "clf__min_samples_leaf": [1, 3]},
+    },
+    "diabetes": {
+        "csv": "diabetes_prediction_dataset.csv", "target": "diabetes", "as_frame": False,
+        "estimator": _gradient_boosting,
+        "grid": {"clf__n_estimators": [200], "clf__learning_rate": [0.1],
+                 "clf__max_depth": [3, 4]},
+    },
+    "bmi": {
+        "csv": "bmi.csv", "target": "Index", "as_frame": True,
+        "estimator": _random_forest,
+        "grid": {"clf__n_estimators": [200, 400], "clf__max_depth": [None, 8]},
+    },
+    "liver": {
+        "csv": "Liver_disease_data.csv", "target": "Diagnosis", "as_frame": False,
+        "estimator": _liver_pipeline,
+        "grid": {"clf__n_estimators": [100, 200], "clf__learning_rate": [0.05, 0.1],
+                 "clf__max_depth": [2, 3]},
+    },
+}
+
+
+# alternative estimators for --variant: name → estimator factory, grid
+VARIANTS = {
+    "hgb": {
+        "estimator": _hist_gradient_boosting,
+        "grid": {"clf__max_iter": [200, 400], "clf__learning_rate": [0.05, 0.1],
+                 "clf__max_leaf_nodes": [15, 31]},
+    },
+    "lgbm": {
+        "estimator": _lightgbm,
+        "grid": {"clf__n_estimators": [200, 400], "clf__learning_rate": [0.05, 0.1],
+                 "clf__num_leaves": [15, 31]},
+    },
+}
+
+
+def csv_path(name):
+    return os.path.join(BASE_DIR, RECIPES[name]["csv"])
+
+
+def variant_available(variant):
+    try:
+        VARIANTS[variant]["estimator"]()
+        return True
+    except ImportError:
+        return False
+
+
+# ───────────────────────────────────────────────────────────
+# Worker
+# ───────────────────────────────────────────────────────────
+def _peak_rss_mb():
+    scale = 1 if sys.platform == "darwin" else 1024          # ru_maxrss: bytes on macOS, KiB elsewhere
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    kids = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss  # joblib/loky search workers
+    return max(own, kids) * scale / 1e6
+
+
+def _limit_threads(n):
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(n)
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(n)
+    except ImportError:
+        pass
+
+
+def load_training_data(name, recipe=None):
+    """
+    (X, y, features) for *name* built from its CSV through model_specs.
+    Exact duplicate rows are dropped (first one kept): heart_disease.csv is
+    1025 rows of 302 distinct patients, and duplicates on both sides of a
+    split or CV fold make the scores meaningless.
+    """
+    import pandas as pd
+    from model_specs import get_spec
+    recipe = recipe or RECIPES[name]
+    spec   = get_spec(name)
+    df     = pd.read_csv(os.path.join(BASE_DIR, recipe["csv"]))
+    X, valid = spec.frame_to_matrix(df, spec.features)
+    y = df[recipe["target"]].to_numpy()[valid]
+    X = X[valid]
+    keep = ~pd.DataFrame(X).assign(_y=y).duplicated().to_numpy()
+    X, y = X[keep], y[keep]
+    if recipe["as_frame"]:
+        X = pd.DataFrame(X, columns=spec.features)
+    return X, y, spec.features
+
+
+def train_one(name, out_dir, n_jobs, recipe=None, estimator=None, grid=None, suffix=""):
+    """Fit one model (runs inside a pool worker) and save its bundle."""
+    _limit_threads(n_jobs)
+    import joblib
+    from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
+    from model_specs import get_spec, variant_filename
+
+    recipe = recipe or RECIPES[name]
+    t0 = time.perf_counter()
+    X, y, features = load_training_data(name, recipe)
+    load_s = time.perf_counter() - t0
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=TEST_SIZE, stratify=y, random_state=RANDOM_SEED)
+    search = GridSearchCV(
+        estimator or recipe["estimator"](), grid or recipe["grid"],
+        cv=StratifiedKFold(CV_FOLDS, shuffle=True, random_state=RANDOM_SEED),
+        scoring="accuracy", n_jobs=n_jobs)
+
+    t0 = time.perf_counter()
+    search.fit(X_train, y_train)
+    fit_s = time.perf_counter() - t0
+    model = search.best_estimator_
+
+    filename = get_spec(name).filename
+    if suffix:
+        filename = variant_filename(filename, suffix)
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, filename)
+    joblib.dump({"model": model, "features": list(features)}, path)
+
+    return {
+        "model": name, "artifact": path, "rows": int(len(y)), "n_jobs": n_jobs,
+        "best_params": search.best_params_, "cv_accuracy": float(search.best_score_),
+        "test_accuracy": float(model.score(X_test, y_test)),
+        "load_seconds": load_s, "fit_seconds": fit_s, "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+# ───────────────────────────────────────────────────────────
+# Pool
+# ───────────────────────────────────────────────────────────
+def _executor(workers):
+    kwargs = {"max_workers": workers}
+    if sys.version_info >= (3, 11):
+        kwargs["max_tasks_per_child"] = 1         # fresh process → per-model peak RSS
+    else:
+        import multiprocessing
+        kwargs["mp_context"] = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(**kwargs)
+
+
+def run(names, out_dir=BASE_DIR, workers=None, cores=None, jobs=None):
+    """
+    Train *names* in parallel.  *jobs* is a list of (name, train_one kwargs)
+    for callers that train several variants of one model.
+    """
+    jobs    = jobs or [(n, {}) for n in names]
+    skipped = {}
+    for name in dict(jobs):
+        if not os.path.exists(csv_path(name)):
+            skipped[name] = f"{RECIPES[name]['csv']} not found"
+            print(f"- {name}: skipped, {skipped[name]}")
+    jobs    = [(n, kw) for n, kw in jobs if n not in skipped]
+    cores   = cores or os.cpu_count() or 1
+    workers = max(1, min(workers or cores, len(jobs) or 1, cores))
+    n_jobs  = max(1, cores // workers)            # inner budget per search
+    os.makedirs(out_dir, exist_ok=True)           # for training_report.json
+    print(f"{len(jobs)} job(s) on {workers} worker(s) × n_jobs={n_jobs} ({cores} cores)")
+
+    results, failures = [], {}
+    with _executor(workers) as pool:
+        futures = {pool.submit(train_one, name, out_dir, n_jobs, **kw): (name, kw)
+                   for name, kw in jobs}
+        for future in as_completed(futures):
+            name, kw = futures[future]
+            label = name + (f".{kw['suffix']}" if kw.get("suffix") else "")
+            try:
+                r = future.result()
+            except Exception as e:
+                failures[label] = f"{type(e).__name__}: {e}"
+                print(f"✗ {label}: {failures[label]}")
+                continue
+            results.append(r)
+            print(f"✓ {label}: test acc {r['test_accuracy']:.4f}, fit {r['fit_seconds']:.1f} s, "
+                  f"peak RSS {r['peak_rss_mb']:.0f} MB → {r['artifact']}")
+
+    report = {"cores": cores, "workers": workers, "n_jobs_per_worker": n_jobs,
+              "results": sorted(results, key=lambda r: r["artifact"]), "failures": failures,
+              "skipped": skipped}
+    with open(os.path.join(out_dir, "training_report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=lambda o: o.item() if isinstance(o, np.generic) else str(o))
+    return report
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Train the Baymax tabular models in parallel.")
+    ap.add_argument("models", nargs="*", metavar="MODEL",
+                    help=f"any of {', '.join(RECIPES)} (default: all)")
+    ap.add_argument("--out-dir", default=BASE_DIR, help="where the .joblib bundles go")
+    ap.add_argument("--workers", type=int, help="models trained at once (default: all cores)")
+    ap.add_argument("--cores", type=int, help="CPU budget to split (default: os.cpu_count())")
+    ap.add_argument("--variant", action="append", choices=list(VARIANTS),
+                    help="train this alternative estimator instead (repeatable)")
+    args = ap.parse_args(argv)
+    unknown = sorted(set(args.models) - set(RECIPES))
+    if unknown:
+        ap.error(f"unknown model(s) {unknown}; choose from {list(RECIPES)}")
+    for v in args.variant or []:
+        if not variant_available(v):
+            ap.error(f"variant {v!r} needs an optional package that is not installed")
+
+    names = args.models or list(RECIPES)
+    jobs = [(n, {"estimator": VARIANTS[v]["estimator"](), "grid": VARIANTS[v]["grid"], "suffix": v})
+            for n in names for v in args.variant] if args.variant else None
+    report = run(names, args.out_dir, args.workers, args.cores, jobs)
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
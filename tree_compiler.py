@@ -0,0 +1,377 @@
+"""
+Tree ensembles flattened into contiguous NumPy arrays, for fast scoring of
+single form rows.
+
+USAGE
+=====
+python tree_compiler.py                         # parity + benchmark, all models
+python tree_compiler.py heart bmi --rows 20000 --repeats 500
+
+sklearn's predict / predict_proba go through input validation, per-tree
+Python loops and (for forests) a joblib dispatch on every call – fine for
+big batches, a few milliseconds of overhead for the one row a page sends.
+compile_model() copies every tree of a fitted ensemble into one set of
+node arrays (feature, threshold, left, right, NaN direction, leaf value)
+and CompiledEnsemble walks all trees for all rows at once: one gather per
+tree level, then the leaf values are combined into class probabilities –
+class and probability come out of the same pass.
+
+That wins for the handful of rows a page or a re-submitted form sends; for
+big batches sklearn's multi-threaded Cython traversal is faster, so inputs
+above BAYMAX_COMPILED_MAX_ROWS rows (default 64) go to the original model.
+
+Supported (optionally behind StandardScaler steps of a Pipeline):
+RandomForest/ExtraTrees/DecisionTree classifiers, GradientBoosting and
+HistGradientBoosting classifiers (numeric features).  for_model() returns
+the compiled form, cached per estimator, or a plain sklearn wrapper with the
+same interface for anything else.  BAYMAX_COMPILED_TREES=0 turns it off.
+
+The CLI checks parity against sklearn on the training CSVs (class
+agreement, max probability difference) and times both paths;
+tests/test_tree_compiler.py checks it on small synthetic models of every
+supported kind.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+import weakref
+
+import numpy as np
+
+MAX_ROWS = int(os.environ.get("BAYMAX_COMPILED_MAX_ROWS", 64))
+
+
+class UnsupportedModel(TypeError):
+    pass
+
+
+# ───────────────────────────────────────────────────────────
+# Compiled form
+# ───────────────────────────────────────────────────────────
+class CompiledEnsemble:
+    """
+    kind "mean"   – forest: leaf values are class distributions, averaged
+    kind "boost"  – boosting: scalar leaf values summed per class column
+                    (class_matrix, learning rate folded in) onto *init*,
+                    then sigmoid / softmax
+    """
+
+    def __init__(self, kind, classes, roots, feature, threshold, left, right,
+                 nan_left, value, depth, dtype, pre=(), class_matrix=None,
+                 init=None, raw_scale=1.0):
+        self.kind         = kind
+        self.classes_     = np.asarray(classes)
+        self.roots        = roots
+        self.feature      = feature
+        self.threshold    = threshold
+        self.left         = left
+        self.right        = right
+        self.nan_left     = nan_left
+        self.value        = value
+        self.depth        = depth
+        self.dtype        = dtype               # what sklearn casts X to before the trees
+        self.pre          = list(pre)           # (mean, scale) pairs of StandardScaler steps
+        self.class_matrix = class_matrix
+        self.init         = init
+        self.raw_scale    = raw_scale
+        self.fallback     = None                # original estimator, for big batches
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def _leaves(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        for mean, scale in self.pre:
+            if mean is not None:
+                X = X - mean
+            if scale is not None:
+                X = X / scale
+        X = np.ascontiguousarray(X, dtype=self.dtype)
+
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), self.n_trees)).copy()
+        for _ in range(self.depth):                         # leaves point to themselves
+            x = X[rows, self.feature[node]]
+            go_left = (x <= self.threshold[node]) | (np.isnan(x) & self.nan_left[node])
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def predict_proba(self, X):
+        if self.fallback is not None and len(X) > MAX_ROWS:
+            return self.fallback.predict_proba(X)
+        return self.evaluate(X)
+
+    def evaluate(self, X):
+        """Class probabilities from the node arrays, whatever the batch size."""
+        leaves = self.value[self._leaves(X)]
+        if self.kind == "mean":
+            return leaves.mean(axis=1)
+        raw = leaves @ self.class_matrix + self.init
+        raw *= self.raw_scale
+        if raw.shape[1] == 1:
+            p = 1.0 / (1.0 + np.exp(-raw[:, 0]))
+            return np.column_stack([1.0 - p, p])
+        raw -= raw.max(axis=1, keepdims=True)
+        np.exp(raw, out=raw)
+        raw /= raw.sum(axis=1, keepdims=True)
+        return raw
+
+    def predict_with_proba(self, X):
+        """(class codes, probability matrix) from a single pass over the trees."""
+        proba = self.predict_proba(X)
+        return self.classes_[proba.argmax(axis=1)], proba
+
+    def predict(self, X):
+        return self.predict_with_proba(X)[0]
+
+
+class SklearnScorer:
+    """Same interface for models that are not compiled: one predict_proba call."""
+
+    def __init__(self, model):
+        self.model    = model
+        self.classes_ = np.asarray(getattr(model, "classes_", []))
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(X)
+
+    def predict_with_proba(self, X):
+        if not hasattr(self.model, "predict_proba"):
+            return np.asarray(self.model.predict(X)), None
+        proba = self.model.predict_proba(X)
+        return self.classes_[proba.argmax(axis=1)], proba
+
+    def predict(self, X):
+        return self.predict_with_proba(X)[0]
+
+
+# ───────────────────────────────────────────────────────────
+# Compilation
+# ───────────────────────────────────────────────────────────
+class _Builder:
+    """Concatenates trees into shared node arrays; node ids become global."""
+
+    def __init__(self):
+        self.roots, self.parts, self.offset, self.depth = [], [], 0, 0
+
+    def add(self, feature, threshold, left, right, nan_left, value, is_leaf, depth):
+        n = len(feature)
+        ids = np.arange(n) + self.offset
+        left  = np.where(is_leaf, ids, left + self.offset)
+        right = np.where(is_leaf, ids, right + self.offset)
+        feature = np.where(is_leaf, 0, feature)
+        self.parts.append((feature, threshold, left, right, nan_left & ~is_leaf, value))
+        self.roots.append(self.offset)
+        self.offset += n
+        self.depth = max(self.depth, int(depth))
+
+    def arrays(self):
+        cols = list(zip(*self.parts))
+        return dict(
+            roots=np.asarray(self.roots, dtype=np.intp),
+            feature=np.concatenate(cols[0]).astype(np.intp),
+            threshold=np.concatenate(cols[1]).astype(np.float64),
+            left=np.concatenate(cols[2]).astype(np.intp),
+            right=np.concatenate(cols[3]).astype(np.intp),
+            nan_left=np.concatenate(cols[4]).astype(bool),
+            value=np.ascontiguousarray(np.concatenate(cols[5]), dtype=np.float64),
+            depth=self.depth,
+        )
+
+
+def _add_sklearn_tree(builder, tree, value):
+    is_leaf = tree.children_left == -1
+    nan_left = getattr(tree, "missing_go_to_left", np.zeros(tree.node_count, dtype=np.uint8))
+    builder.add(tree.feature, tree.threshold, tree.children_left, tree.children_right,
+                np.asarray(nan_left, dtype=bool), value, is_leaf, tree.max_depth)
+
+
+def _compile_forest(clf, pre):
+    if getattr(clf, "n_outputs_", 1) != 1:
+        raise UnsupportedModel("multi-output forests are not supported")
+    builder = _Builder()
+    for est in getattr(clf, "estimators_", [clf]):
+        v = est.tree_.value[:, 0, :]
+        v = v / np.maximum(v.sum(axis=1, keepdims=True), 1e-300)   # counts or fractions → probabilities
+        _add_sklearn_tree(builder, est.tree_, v)
+    return CompiledEnsemble("mean", clf.classes_, dtype=np.float32, pre=pre, **builder.arrays())
+
+
+def _compile_gradient_boosting(clf, pre):
+    if clf.loss not in ("log_loss", "deviance", "exponential"):
+        raise UnsupportedModel(f"loss {clf.loss!r} is not supported")
+    n_iter, K = clf.estimators_.shape
+    builder = _Builder()
+    for i in range(n_iter):
+        for k in range(K):
+            tree = clf.estimators_[i, k].tree_
+            _add_sklearn_tree(builder, tree, tree.value[:, 0, 0])
+    class_matrix = np.tile(np.eye(K), (n_iter, 1)) * clf.learning_rate
+    init = clf._raw_predict_init(np.zeros((1, clf.n_features_in_), dtype=np.float32))[0]
+    return CompiledEnsemble("boost", clf.classes_, dtype=np.float32, pre=pre,
+                            class_matrix=class_matrix, init=np.asarray(init, dtype=np.float64),
+                            raw_scale=2.0 if clf.loss == "exponential" else 1.0,
+                            **builder.arrays())
+
+
+def _compile_hist_gradient_boosting(clf, pre):
+    K = clf.n_trees_per_iteration_
+    builder = _Builder()
+    for predictors in clf._predictors:
+        for k, predictor in enumerate(predictors):
+            nodes = predictor.nodes
+            if nodes["is_categorical"].any():
+                raise UnsupportedModel("categorical splits are not supported")
+            builder.add(nodes["feature_idx"], nodes["num_threshold"],
+                        nodes["left"].astype(np.int64), nodes["right"].astype(np.int64),
+                        nodes["missing_go_to_left"].astype(bool), nodes["value"],
+                        nodes["is_leaf"].astype(bool), nodes["depth"].max())
+    class_matrix = np.tile(np.eye(K), (len(clf._predictors), 1))   # learning rate already in leaves
+    init = np.asarray(clf._baseline_prediction, dtype=np.float64).reshape(-1)
+    return CompiledEnsemble("boost", clf.classes_, dtype=np.float64, pre=pre,
+                            class_matrix=class_matrix, init=init, **builder.arrays())
+
+
+def compile_model(model):
+    """Fitted classifier (or Pipeline ending in one) → CompiledEnsemble."""
+    from sklearn.ensemble import (
+        ExtraTreesClassifier,
+        GradientBoostingClassifier,
+        HistGradientBoostingClassifier,
+        RandomForestClassifier,
+    )
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.tree import DecisionTreeClassifier
+
+    pre, clf = [], model
+    if isinstance(model, Pipeline):
+        for _, step in model.steps[:-1]:
+            if step is None or step == "passthrough":
+                continue
+            if not isinstance(step, StandardScaler):
+                raise UnsupportedModel(f"pipeline step {type(step).__name__} is not supported")
+            pre.append((getattr(step, "mean_", None) if step.with_mean else None,
+                        getattr(step, "scale_", None) if step.with_std else None))
+        clf = model.steps[-1][1]
+
+    if isinstance(clf, (RandomForestClassifier, ExtraTreesClassifier, DecisionTreeClassifier)):
+        compiled = _compile_forest(clf, pre)
+    elif isinstance(clf, GradientBoostingClassifier):
+        compiled = _compile_gradient_boosting(clf, pre)
+    elif isinstance(clf, HistGradientBoostingClassifier):
+        compiled = _compile_hist_gradient_boosting(clf, pre)
+    else:
+        raise UnsupportedModel(f"{type(clf).__name__} cannot be compiled")
+    compiled.fallback = model
+    return compiled
+
+
+# ───────────────────────────────────────────────────────────
+# Per-estimator cache
+# ───────────────────────────────────────────────────────────
+_lock  = threading.Lock()
+_cache = weakref.WeakKeyDictionary()       # estimator → compiled form; dies with the estimator
+
+
+def for_model(model):
+    """Compiled scorer for *model* (compiled once), or an SklearnScorer fallback."""
+    if os.environ.get("BAYMAX_COMPILED_TREES", "1") == "0":
+        return SklearnScorer(model)
+    with _lock:
+        scorer = _cache.get(model)
+        if scorer is None:
+            try:
+                scorer = compile_model(model)
+            except UnsupportedModel:
+                scorer = SklearnScorer(model)
+            _cache[model] = scorer
+        return scorer
+
+
+# ───────────────────────────────────────────────────────────
+# Parity + benchmark
+# ───────────────────────────────────────────────────────────
+def check_parity(model, X, compiled=None):
+    """Agreement of the compiled form with sklearn on X."""
+    compiled = compiled or compile_model(model)
+    ref_proba = model.predict_proba(X)
+    ref_codes = model.predict(X)
+    proba = compiled.evaluate(np.asarray(X))
+    codes = compiled.classes_[proba.argmax(axis=1)]
+    return {"rows": len(ref_codes),
+            "class_agreement": float((codes == ref_codes).mean()),
+            "max_proba_diff": float(np.abs(proba - ref_proba).max())}
+
+
+def _time(fn, repeats):
+    fn()
+    t = np.empty(repeats)
+    for i in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        t[i] = time.perf_counter() - t0
+    return float(np.median(t))
+
+
+def benchmark(model, X, rows=10_000, repeats=200):
+    compiled = compile_model(model)
+    one, one_arr = X[:1], np.asarray(X[:1])
+    idx = np.arange(rows) % len(X)
+    big = X.iloc[idx] if hasattr(X, "iloc") else X[idx]
+    big_arr = np.asarray(big)
+
+    single_sk  = _time(lambda: (model.predict(one), model.predict_proba(one)), repeats)
+    single_cmp = _time(lambda: compiled.predict_with_proba(one_arr), repeats)
+    batch_sk   = _time(lambda: model.predict_proba(big), 3)
+    batch_cmp  = _time(lambda: compiled.evaluate(big_arr), 3)
+    return {"trees": compiled.n_trees, "depth": compiled.depth,
+            "single_row_ms": {"sklearn": single_sk * 1000, "compiled": single_cmp * 1000,
+                              "speedup": single_sk / single_cmp},
+            "batch": {"rows": rows, "sklearn_s": batch_sk, "compiled_s": batch_cmp,
+                      "speedup": batch_sk / batch_cmp}}
+
+
+def main(argv=None):
+    from model_specs import SPECS, get_spec
+    from training_harness import load_training_data
+
+    ap = argparse.ArgumentParser(description="Check and time the compiled tree ensembles.")
+    ap.add_argument("models", nargs="*", metavar="MODEL", help=f"any of {', '.join(SPECS)}")
+    ap.add_argument("--rows", type=int, default=10_000, help="rows in the batch timing")
+    ap.add_argument("--repeats", type=int, default=200, help="single-row calls to time")
+    args = ap.parse_args(argv)
+
+    failed = False
+    for name in args.models or list(SPECS):
+        try:
+            model, _ = get_spec(name).load()
+            X, _, _ = load_training_data(name)
+            compiled = compile_model(model)
+        except Exception as e:                              # missing / unreadable artifact or CSV
+            print(f"{name}: skipped – {type(e).__name__}: {e}")
+            continue
+        p = check_parity(model, X, compiled)
+        b = benchmark(model, X, args.rows, args.repeats)
+        ok = p["class_agreement"] == 1.0 and p["max_proba_diff"] < 1e-9
+        failed |= not ok
+        print(f"{name}: {b['trees']} trees, depth {b['depth']} – parity {'OK' if ok else 'FAILED'} "
+              f"(agreement {p['class_agreement']:.6f}, max |Δp| {p['max_proba_diff']:.2e}, "
+              f"{p['rows']} rows)")
+        s, bt = b["single_row_ms"], b["batch"]
+        print(f"  1 row: sklearn predict+predict_proba {s['sklearn']:.3f} ms, "
+              f"compiled {s['compiled']:.3f} ms ({s['speedup']:.1f}×)")
+        print(f"  {bt['rows']} rows: sklearn {bt['sklearn_s']:.3f} s, "
+              f"node arrays {bt['compiled_s']:.3f} s ({bt['speedup']:.2f}×; "
+              f"batches over {MAX_ROWS} rows use sklearn)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
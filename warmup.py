@@ -0,0 +1,195 @@
+# warmup.py
+# ------------------------------------------------------------
+# Background model warm-up, started by the dashboard after login.
+#
+# One daemon thread preloads the models one after another, most used first
+# (open counts are kept in <BAYMAX_USAGE_FILE>, default .cache/usage.json).
+# Every model goes through its module's own once-loader
+# (first_aid_chatbot.load_resources, prescription.load_model_and_labels,
+# model_registry.load), so a window opened while its model is still loading
+# shares that load instead of starting a second one.
+#
+# Tiles follow progress through `state_changed(name, state)` with state one of
+# pending / loading / ready / failed.  when_ready(names, callback) moves the
+# models to the front of the queue and calls back on the GUI thread once they
+# have finished loading, without blocking the event loop in the meantime.
+#
+# BAYMAX_WARMUP=0 turns preloading off; when_ready() then loads on demand.
+
+import json
+import os
+import threading
+import time
+import traceback
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PENDING, LOADING, READY, FAILED = "pending", "loading", "ready", "failed"
+
+
+def _load_chatbot():
+    from first_aid_chatbot import load_resources
+    load_resources()
+
+
+def _load_prescription():
+    from prescription import load_model_and_labels
+    load_model_and_labels()
+
+
+def _joblib_loader(spec_name):
+    def load():
+        import model_registry
+        from model_specs import get_spec
+        model_registry.load(get_spec(spec_name).artifact())
+    return load
+
+
+# name → loader, in the default order used before there is any usage history
+MODELS = {
+    "chatbot":      _load_chatbot,
+    "prescription": _load_prescription,
+    "diabetes":     _joblib_loader("diabetes"),
+    "heart":        _joblib_loader("heart"),
+    "liver":        _joblib_loader("liver"),
+    "bmi":          _joblib_loader("bmi"),
+}
+
+
+# ───────────────────────────────────────────────────────────
+# Usage counts
+# ───────────────────────────────────────────────────────────
+class UsageStats:
+    def __init__(self, path=None):
+        self.path = path or os.environ.get(
+            "BAYMAX_USAGE_FILE", os.path.join(BASE_DIR, ".cache", "usage.json"))
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.counts = {k: int(v) for k, v in json.load(f).items()}
+        except (OSError, ValueError, AttributeError):
+            self.counts = {}
+
+    def record(self, name):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, "w", encoding="utf-8") as f:
+                    json.dump(self.counts, f)
+            except OSError:
+                pass                                  # counts are only a hint
+
+    def ranked(self, names):
+        default = {n: i for i, n in enumerate(names)}
+        return sorted(names, key=lambda n: (-self.counts.get(n, 0), default[n]))
+
+
+# ───────────────────────────────────────────────────────────
+# Scheduler
+# ───────────────────────────────────────────────────────────
+class WarmupScheduler(QObject):
+    state_changed = pyqtSignal(str, str)              # model name, state
+
+    def __init__(self, models=None, usage=None, parent=None):
+        super().__init__(parent)
+        self.models  = dict(models or MODELS)
+        self.usage   = usage or UsageStats()
+        self.states  = {n: PENDING for n in self.models}
+        self.errors  = {}
+        self.timings = {}                             # name → load seconds
+        self.preload = os.environ.get("BAYMAX_WARMUP", "1") != "0"
+
+        self._cond    = threading.Condition()
+        self._queue   = self.usage.ranked(list(self.models)) if self.preload else []
+        self._waiters = []                            # [(names, callback)]
+        self._thread  = None
+        self.state_changed.connect(self._run_waiters)  # queued onto the GUI thread
+
+    # ── public API ─────────────────────────────────────────
+    def start(self):
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="baymax-warmup",
+                                                daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def state(self, name):
+        return self.states[name]
+
+    def is_ready(self, names):
+        return all(self.states[n] in (READY, FAILED) for n in _as_list(names))
+
+    def when_ready(self, names, callback):
+        """
+        Call *callback* on the GUI thread once every model in *names* has
+        finished loading (failed loads count as finished – the window reports
+        the error itself).  Runs immediately if they already have.
+        """
+        names = _as_list(names)
+        for n in names:
+            self.usage.record(n)
+        if self.is_ready(names):
+            callback()
+            return
+        with self._cond:
+            if (names, callback) not in self._waiters:  # repeated clicks open one window
+                self._waiters.append((names, callback))
+            for n in reversed(names):                 # jump the queue
+                if n in self._queue:
+                    self._queue.remove(n)
+                if self.states[n] == PENDING:
+                    self._queue.insert(0, n)
+        self.start()
+
+    # ── worker thread ──────────────────────────────────────
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                name = self._queue.pop(0)
+                if self.states[name] != PENDING:
+                    continue
+                self.states[name] = LOADING
+            self.state_changed.emit(name, LOADING)
+
+            start = time.perf_counter()
+            try:
+                self.models[name]()
+                state = READY
+            except Exception:
+                self.errors[name] = traceback.format_exc()
+                state = FAILED
+            self.timings[name] = time.perf_counter() - start
+            with self._cond:
+                self.states[name] = state
+            self.state_changed.emit(name, state)
+
+    # ── GUI thread ─────────────────────────────────────────
+    def _run_waiters(self, name, state):
+        if state not in (READY, FAILED):
+            return
+        with self._cond:
+            due = [w for w in self._waiters if self.is_ready(w[0])]
+            self._waiters = [w for w in self._waiters if w not in due]
+        for _, callback in due:
+            callback()
+
+
+def _as_list(names):
+    return [names] if isinstance(names, str) else list(names)
+
+
+_scheduler = None
+
+
+def get_scheduler() -> WarmupScheduler:
+    """Process-wide scheduler (created on first use, on the GUI thread)."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = WarmupScheduler()
+    return _scheduler